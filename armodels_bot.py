@@ -1,11 +1,17 @@
+import asyncio
 import logging
+import os
+import signal
+from typing import Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
-from parsers.models_parser import ModelsParser
-from parsers.teachers_parser import TeachersParser
-from parsers.partners_parser import PartnersParser
-from parsers.magazines_parser import MagazinesParser
-from parsers.projects_parser import ProjectsParser
+from services.broadcast import Broadcaster
+from services.callbacks import CallbackCodec
+from services.keyboards import PagedKeyboards
+from services.navigation import MessageNavigator
+from services.persistence import SQLitePersistence
+from services.shared import SharedResources
+from services.update_processor import ChatOrderedUpdateProcessor
 
 # Настройка логирования
 logging.basicConfig(
@@ -15,22 +21,77 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class ModelsTelegramBot:
-    def __init__(self, token):
-        self.application = Application.builder().token(token).build()
-
-        # Инициализация парсеров
-        self.models_parser = ModelsParser()
-        self.teachers_parser = TeachersParser()
-        self.partners_parser = PartnersParser()
-        self.magazines_parser = MagazinesParser()
-        self.projects_parser = ProjectsParser()
-
-        # Кэши для данных
-        self.models_cache = []
-        self.teachers_cache = []
-        self.partners_cache = []
-        self.magazines_cache = []
-        self.projects_cache = {}
+    # Максимальное количество фото в одном альбоме Telegram
+    MEDIA_GROUP_SIZE = 10
+    # Ответ на кнопку, построенную по снимку данных, срок хранения которого истек
+    SNAPSHOT_EXPIRED_TEXT = 'Список обновился. Откройте раздел заново.'
+    # Темы уведомлений, на которые можно подписаться командой /subscribe
+    SUBSCRIPTION_TOPICS = {
+        'magazines': '📖 Новые выпуски журнала',
+        'models': '👤 Новые модели',
+    }
+
+    # Закрепленные номера значений, которые передаются в кнопках полем 'token' (фильтры, категории проектов,
+    # разделы, темы подписок). Номера попадают в callback_data отправленных сообщений: существующие не меняются,
+    # новые значения добавляются со следующим свободным номером
+    CALLBACK_TOKENS = {
+        'all': 1,
+        'male': 2,
+        'female': 3,
+        'first_course': 4,
+        'second_course': 5,
+        'third_course': 6,
+        'fourth_course': 7,
+        'photo-projects': 8,
+        'konkursi-krasoti': 9,
+        'fashion-shows': 10,
+        'advertising-shoots': 11,
+        'interview': 12,
+        'teachers': 13,
+        'partners': 14,
+        'magazines': 15,
+        'models': 16,
+    }
+
+    def __init__(self, token, store=None, persistence=None, base_url=None, shared=None):
+        # Идентификатор бота - числовая часть токена; file_id Telegram действительны только в пределах бота
+        self.bot_id = token.split(':')[0]
+
+        # Состояние пользователей (страница, фильтр, ID сообщений) сохраняется между перезапусками
+        if persistence is None:
+            persistence = SQLitePersistence(os.getenv('STATE_DB_PATH', 'cache/bot_state.sqlite'))
+
+        builder = (
+            Application.builder()
+            .token(token)
+            .persistence(persistence)
+            # Обновления разных чатов обрабатываются параллельно, одного чата - по очереди
+            .concurrent_updates(ChatOrderedUpdateProcessor(int(os.getenv(
+                'MAX_CONCURRENT_UPDATES', str(ChatOrderedUpdateProcessor.DEFAULT_MAX_CONCURRENT_UPDATES)))))
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+        )
+
+        # Собственный сервер Bot API (или тестовая заглушка) вместо api.telegram.org
+        base_url = base_url or os.getenv('TELEGRAM_API_URL')
+        if base_url:
+            builder = builder.base_url(base_url)
+
+        self.application = builder.build()
+
+        # Парсеры, наборы данных и кэши общие для всех ботов процесса
+        self.shared = shared or SharedResources(store)
+        self.store = self.shared.store
+        self.datasets = self.shared.datasets
+        self.refresher = self.shared.refresher
+        self.pdf_cache = self.shared.pdf_cache
+        self.pdf_locks = self.shared.pdf_locks
+        self.media = self.shared.media
+        self.broadcasts = self.shared.broadcasts
+        self.collages = self.shared.collages
+
+        # Переходы между экранами редактируют сообщение с нажатой кнопкой вместо удаления и новой отправки
+        self.navigator = MessageNavigator()
 
         # Регистрация обработчиков команд
         self.application.add_handler(CommandHandler("start", self.start))
@@ -39,21 +100,161 @@ class ModelsTelegramBot:
         self.application.add_handler(CommandHandler("partners", self.partners_command))
         self.application.add_handler(CommandHandler("magazines", self.magazines_command))
         self.application.add_handler(CommandHandler("projects", self.projects_command))
-        self.application.add_handler(CallbackQueryHandler(self.model_detail, pattern='^model_'))
-        self.application.add_handler(CallbackQueryHandler(self.teacher_detail, pattern='^teacher_'))
-        self.application.add_handler(CallbackQueryHandler(self.partner_detail, pattern='^partner_'))
-        self.application.add_handler(CallbackQueryHandler(self.project_detail, pattern='^project_'))
-        self.application.add_handler(CallbackQueryHandler(self.project_category, pattern='^category_'))
-        self.application.add_handler(CallbackQueryHandler(self.magazine_detail, pattern='^magazine_'))
-        self.application.add_handler(CallbackQueryHandler(self.photo_navigation, pattern='^photo_(prev|next)_'))
-        self.application.add_handler(CallbackQueryHandler(self.back_to_models, pattern='^back_to_models$'))
-        self.application.add_handler(CallbackQueryHandler(self.back_to_teachers, pattern='^back_to_teachers$'))
-        self.application.add_handler(CallbackQueryHandler(self.back_to_partners, pattern='^back_to_partners$'))
-        self.application.add_handler(CallbackQueryHandler(self.back_to_magazines, pattern='^back_to_magazines$'))
-        self.application.add_handler(CallbackQueryHandler(self.back_to_main, pattern='^back_to_main$'))
-        self.application.add_handler(CallbackQueryHandler(self.back_to_projects, pattern='^back_to_projects$'))
-        self.application.add_handler(CallbackQueryHandler(self.handle_pagination, pattern='^page_'))
-        self.application.add_handler(CallbackQueryHandler(self.handle_filter, pattern='^filter_'))
+        self.application.add_handler(CommandHandler("subscribe", self.subscriptions_command))
+
+        # Все кнопки кодируются одним кодеком и обрабатываются через одну таблицу действий.
+        # Код действия попадает в callback_data уже отправленных сообщений и не должен меняться
+        self.codec = CallbackCodec(self.store, self.CALLBACK_TOKENS)
+        self.callback_handlers = {}
+        callback_actions = (
+            (1, 'back_to_main', self.back_to_main, ()),
+            (2, 'back_to_models', self.back_to_models, ()),
+            (3, 'back_to_teachers', self.back_to_teachers, ()),
+            (4, 'back_to_partners', self.back_to_partners, ()),
+            (5, 'back_to_magazines', self.back_to_magazines, ()),
+            (6, 'back_to_projects', self.back_to_projects, ()),
+            (7, 'noop', self.noop, ()),
+            (8, 'models_page', self.handle_models_page, (('page', 'H'), ('filter_type', 'token'))),
+            (9, 'model', self.model_detail, (('idx', 'H'), ('version', 'version'))),
+            (10, 'photo', self.photo_navigation, (('idx', 'H'),)),
+            (11, 'photo_album', self.photo_album, ()),
+            (12, 'teacher', self.teacher_detail, (('idx', 'H'), ('version', 'version'))),
+            (13, 'partner', self.partner_detail, (('idx', 'H'), ('version', 'version'))),
+            (14, 'magazine', self.magazine_detail, (('idx', 'H'), ('version', 'version'))),
+            (15, 'magazine_pdf', self.magazine_pdf, (('idx', 'H'), ('version', 'version'))),
+            (16, 'category', self.project_category, (('category', 'token'),)),
+            (17, 'project', self.project_detail, (('category', 'token'), ('idx', 'H'), ('version', 'version'))),
+            (18, 'list_page', self.list_page, (('section', 'token'), ('page', 'H'))),
+            (19, 'category_page', self.project_category, (('category', 'token'), ('page', 'H'))),
+            (20, 'subscriptions', self.subscriptions_command, ()),
+            (21, 'subscription', self.toggle_subscription, (('topic', 'token'),)),
+            (22, 'broadcast_item', self.open_broadcast_item, (('job', 'I'), ('item', 'B'))),
+        )
+        for code, name, handler, fields in callback_actions:
+            self.codec.register(name, code, fields)
+            self.callback_handlers[name] = handler
+        self.application.add_handler(CallbackQueryHandler(self.dispatch_callback))
+
+        # Длинные списки показываются постранично; страницы строятся один раз на версию данных
+        self.keyboards = PagedKeyboards(self.codec)
+        self.list_views = {
+            'teachers': self.teachers_command,
+            'partners': self.partners_command,
+            'magazines': self.magazines_command,
+        }
+
+        # Рассылки о новых выпусках журнала и новых моделях подписчикам этого бота
+        self.broadcaster = Broadcaster(
+            self.broadcasts,
+            self.application.bot,
+            self.bot_id,
+            self.shared.node_id,
+            self.render_broadcast,
+            rate=float(os.getenv('BROADCAST_RATE', str(Broadcaster.DEFAULT_RATE))),
+            update_processor=self.application.update_processor,
+            get_file_id=self.get_photo_file_id,
+            remember_file_id=self.remember_photo_file_id
+        )
+
+    async def _post_init(self, application: Application):
+        """Запускает фоновое обновление данных и доставку рассылок после инициализации приложения"""
+        self.shared.start()
+        self.broadcaster.start()
+
+    async def _post_shutdown(self, application: Application):
+        """Останавливает доставку рассылок и фоновое обновление данных"""
+        await self.broadcaster.stop()
+        await self.shared.stop()
+
+    # Парсеры создаются общими ресурсами при первом обращении
+    @property
+    def models_parser(self):
+        return self.shared.models_parser
+
+    @property
+    def teachers_parser(self):
+        return self.shared.teachers_parser
+
+    @property
+    def partners_parser(self):
+        return self.shared.partners_parser
+
+    @property
+    def magazines_parser(self):
+        return self.shared.magazines_parser
+
+    @property
+    def projects_parser(self):
+        return self.shared.projects_parser
+
+    @property
+    def models_cache(self):
+        return self.datasets.get('models')
+
+    @property
+    def teachers_cache(self):
+        return self.datasets.get('teachers')
+
+    @property
+    def partners_cache(self):
+        return self.datasets.get('partners')
+
+    @property
+    def magazines_cache(self):
+        return self.datasets.get('magazines')
+
+    @property
+    def projects_cache(self):
+        return self.datasets.get('projects')
+
+    async def resolve_snapshot(self, name, version):
+        """
+        Возвращает снимок набора данных, по которому была построена нажатая кнопка
+
+        Индексы в кнопках относятся к снимку, из которого строилась клавиатура,
+        поэтому после обновления данных старые кнопки открывают те же записи, что и раньше.
+
+        Args:
+            name: Имя набора данных
+            version: Версия снимка из кнопки (None - текущая версия)
+
+        Returns:
+            Данные снимка или None, если срок его хранения истек
+        """
+        if version is None:
+            return await self.datasets.get_or_load(name)
+        return await self.datasets.get_version_async(name, version)
+
+    async def dispatch_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Декодирует callback_data нажатой кнопки и вызывает обработчик действия из таблицы"""
+        query = update.callback_query
+        decoded = self.codec.decode(query.data or '')
+        if decoded is None:
+            logger.warning(f"Неизвестные данные кнопки: {query.data}")
+            await query.answer()
+            return
+
+        action, fields = decoded
+        await self.callback_handlers[action](update, context, **fields)
+
+    async def list_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE, section: str = '', page: int = 0):
+        """Обрабатывает переход на другую страницу списка учителей, партнеров или выпусков журнала"""
+        await update.callback_query.answer()
+        view = self.list_views.get(section)
+        if view is not None:
+            await view(update, context, page=page)
+
+    def saved_list_page(self, context: ContextTypes.DEFAULT_TYPE, key: str) -> int:
+        """Возвращает страницу списка, которую пользователь смотрел последней"""
+        return context.user_data.get('list_pages', {}).get(key, 0)
+
+    def save_list_page(self, context: ContextTypes.DEFAULT_TYPE, key: str, page: int):
+        """Запоминает страницу списка для возврата к ней из карточки записи"""
+        context.user_data.setdefault('list_pages', {})[key] = page
+
+    async def noop(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обрабатывает нажатие на информационную кнопку (счетчик страниц или фото)"""
+        await update.callback_query.answer()
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обрабатывает команду /start"""
@@ -64,7 +265,8 @@ class ModelsTelegramBot:
             "• /teachers — Список преподавателей\n"
             "• /partners — Список партнеров агентства\n"
             "• /projects — Проекты и мероприятия агентства\n"
-            "• /magazines — Архив выпусков глянцевого журнала\n\n"
+            "• /magazines — Архив выпусков глянцевого журнала\n"
+            "• /subscribe — Уведомления о новых выпусках и моделях\n\n"
             "Выберите нужный раздел для просмотра информации.\n"
             "Все данные парсятся с официального сайта armodels.ru"
         )
@@ -87,41 +289,41 @@ class ModelsTelegramBot:
         # Показываем список моделей
         await self.list_models(update, context, page=0, filter_type="all")
 
-    async def teachers_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def teachers_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
         """Обрабатывает команду /teachers"""
-        # Определяем chat_id в зависимости от типа update
-        if hasattr(update, 'message') and update.message:
-            chat_id = update.message.chat_id
+        # Сохраняем ID команды пользователя для последующего удаления
+        if update.message:
             context.user_data['command_message_id'] = update.message.message_id
-        elif hasattr(update, 'callback_query') and update.callback_query:
-            chat_id = update.callback_query.message.chat_id
-        else:
-            return
 
         # Загружаем учителей, если они еще не загружены
-        if not self.teachers_cache:
-            teachers = self.teachers_parser.parse_list()
-            self.teachers_cache = teachers
-        else:
-            teachers = self.teachers_cache
+        teachers = await self.datasets.get_or_load('teachers')
 
         if not teachers:
-            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]]
+            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text="👨‍🏫 <b>Раздел учителей</b>\n\nНе удалось загрузить список учителей. Попробуйте позже.",
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+            await self.show_screen(update, context, "👨‍🏫 <b>Раздел учителей</b>\n\nНе удалось загрузить список учителей. Попробуйте позже.", reply_markup)
             return
 
         # Создаем сообщение со списком учителей
         message = "👨‍🏫 <b>Наши преподаватели</b>\n\n"
         message += f"Найдено {len(teachers)} преподавателей:\n\n"
 
-        # Создаем клавиатуру
+        # Клавиатура строится один раз на версию данных и показывается постранично
+        version = self.datasets.loaded_version('teachers')
+        reply_markup, page, _ = self.keyboards.page(
+            'teachers',
+            version,
+            lambda: self._teacher_rows(teachers, version),
+            page,
+            lambda target: self.codec.encode('list_page', section='teachers', page=target),
+            footer=[[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]]
+        )
+        self.save_list_page(context, 'teachers', page)
+        await self.show_screen(update, context, message, reply_markup)
+
+    def _teacher_rows(self, teachers, version):
+        """Кнопки всех учителей для постраничной клавиатуры"""
         keyboard = []
 
         for idx, teacher in enumerate(teachers):
@@ -132,55 +334,46 @@ class ModelsTelegramBot:
 
             keyboard.append([InlineKeyboardButton(
                 button_text,
-                callback_data=f"teacher_{idx}"
+                callback_data=self.codec.encode('teacher', idx=idx, version=version)
             )])
 
-        # Добавляем кнопку "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
+        return keyboard
 
-    async def partners_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def partners_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
         """Обрабатывает команду /partners"""
-        # Определяем chat_id в зависимости от типа update
-        if hasattr(update, 'message') and update.message:
-            chat_id = update.message.chat_id
+        # Сохраняем ID команды пользователя для последующего удаления
+        if update.message:
             context.user_data['command_message_id'] = update.message.message_id
-        elif hasattr(update, 'callback_query') and update.callback_query:
-            chat_id = update.callback_query.message.chat_id
-        else:
-            return
 
         # Загружаем партнеров, если они еще не загружены
-        if not self.partners_cache:
-            partners = self.partners_parser.parse_list()
-            self.partners_cache = partners
-        else:
-            partners = self.partners_cache
+        partners = await self.datasets.get_or_load('partners')
 
         if not partners:
-            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]]
+            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text="🤝 <b>Раздел партнеров</b>\n\nНе удалось загрузить список партнеров. Попробуйте позже.",
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+            await self.show_screen(update, context, "🤝 <b>Раздел партнеров</b>\n\nНе удалось загрузить список партнеров. Попробуйте позже.", reply_markup)
             return
 
         # Создаем сообщение со списком партнеров
         message = "🤝 <b>Наши партнеры</b>\n\n"
         message += f"Найдено {len(partners)} партнеров:\n\n"
 
-        # Создаем клавиатуру
+        # Клавиатура строится один раз на версию данных и показывается постранично
+        version = self.datasets.loaded_version('partners')
+        reply_markup, page, _ = self.keyboards.page(
+            'partners',
+            version,
+            lambda: self._partner_rows(partners, version),
+            page,
+            lambda target: self.codec.encode('list_page', section='partners', page=target),
+            footer=[[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]]
+        )
+        self.save_list_page(context, 'partners', page)
+        await self.show_screen(update, context, message, reply_markup)
+
+    def _partner_rows(self, partners, version):
+        """Кнопки всех партнеров для постраничной клавиатуры"""
         keyboard = []
 
         for idx, partner in enumerate(partners):
@@ -189,19 +382,10 @@ class ModelsTelegramBot:
 
             keyboard.append([InlineKeyboardButton(
                 button_text,
-                callback_data=f"partner_{idx}"
+                callback_data=self.codec.encode('partner', idx=idx, version=version)
             )])
 
-        # Добавляем кнопку "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
+        return keyboard
 
     async def list_models(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0, filter_type: str = "all"):
         """Обрабатывает команду /models, парсит список моделей и выводит его с пагинацией и фильтрами."""
@@ -210,23 +394,25 @@ class ModelsTelegramBot:
             context.user_data['current_page'] = page
             context.user_data['current_filter'] = filter_type
 
-            # Загружаем модели, если они еще не загружены
-            if not self.models_cache:
-                models = self.models_parser.parse_list()
-                self.models_cache = models
-            else:
-                models = self.models_cache
+            # Настройки пагинации
+            models_per_page = 6
+
+            # Загружаем модели, если они еще не загружены. Для списка без фильтра
+            # достаточно дождаться моделей текущей страницы, остальные догружаются в фоне
+            needed = (page + 1) * models_per_page if filter_type == "all" else None
+            models, complete = await self.datasets.get_streaming('models', needed)
+            # Версия снимка читается вместе со списком: пока собирается коллаж, может выйти новая версия,
+            # а кнопки должны открывать модели из того же снимка, что показан на странице
+            version = self.datasets.loaded_version('models')
 
             if not models:
                 message = 'Не удалось загрузить список моделей. Попробуйте позже.'
-                await self.send_message(update, message)
+                await self.show_screen(update, context, message)
                 return
 
             # Применяем фильтр
             filtered_models = self.apply_filter(models, filter_type)
 
-            # Настройки пагинации
-            models_per_page = 6
             total_pages = (len(filtered_models) + models_per_page - 1) // models_per_page
             start_idx = page * models_per_page
             end_idx = min(start_idx + models_per_page, len(filtered_models))
@@ -235,7 +421,15 @@ class ModelsTelegramBot:
             # Создаем сообщение
             filter_name = self.get_filter_name(filter_type)
             message = f"📋 <b>Модели {filter_name}</b>\n\n"
-            message += f"Показаны модели {start_idx + 1}-{end_idx} из {len(filtered_models)}\n\n"
+            if complete:
+                message += f"Показаны модели {start_idx + 1}-{end_idx} из {len(filtered_models)}\n\n"
+            else:
+                message += f"Показаны модели {start_idx + 1}-{end_idx} (список еще загружается)\n\n"
+
+            # Полностью загруженная страница показывается коллажем фото карточек с номерами кнопок
+            collage_key, photo = None, None
+            if complete:
+                collage_key, photo = await self.models_collage(version, filter_type, page, current_models)
 
             # Создаем клавиатуру
             keyboard = []
@@ -244,20 +438,23 @@ class ModelsTelegramBot:
             for idx, model in enumerate(current_models):
                 actual_idx = models.index(model)  # Получаем реальный индекс в основном списке
                 keyboard.append([InlineKeyboardButton(
-                    f"👤 {model['name']}",
-                    callback_data=f"model_{actual_idx}"
+                    f"👤 {idx + 1}. {model['name']}" if photo else f"👤 {model['name']}",
+                    callback_data=self.codec.encode('model', idx=actual_idx, version=version)
                 )])
 
             # Добавляем кнопки навигации и фильтров
             nav_row = []
 
             if page > 0:
-                nav_row.append(InlineKeyboardButton("⬅️ Назад", callback_data=f"page_{page-1}_filter_{filter_type}"))
+                nav_row.append(InlineKeyboardButton("⬅️ Назад", callback_data=self.codec.encode('models_page', page=page - 1, filter_type=filter_type)))
 
-            nav_row.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data="page_counter"))
+            nav_row.append(InlineKeyboardButton(
+                f"{page + 1}/{total_pages}" if complete else f"{page + 1}/…",
+                callback_data=self.codec.encode('noop')
+            ))
 
-            if page < total_pages - 1:
-                nav_row.append(InlineKeyboardButton("Вперед ➡️", callback_data=f"page_{page+1}_filter_{filter_type}"))
+            if page < total_pages - 1 or not complete:
+                nav_row.append(InlineKeyboardButton("Вперед ➡️", callback_data=self.codec.encode('models_page', page=page + 1, filter_type=filter_type)))
 
             if nav_row:
                 keyboard.append(nav_row)
@@ -278,7 +475,7 @@ class ModelsTelegramBot:
                 if filter_key != filter_type:
                     filter_row.append(InlineKeyboardButton(
                         filter_label,
-                        callback_data=f"filter_{filter_key}_page_0"
+                        callback_data=self.codec.encode('models_page', page=0, filter_type=filter_key)
                     ))
 
             if filter_row:
@@ -287,14 +484,40 @@ class ModelsTelegramBot:
                     keyboard.append(filter_row[i:i+3])
 
             # Добавляем кнопку "Вернуться в главное меню" в конце
-            keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+            keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))])
 
             reply_markup = InlineKeyboardMarkup(keyboard)
-            await self.send_message(update, message, reply_markup)
+            sent = await self.show_screen(update, context, message, reply_markup, photo=photo)
+            if collage_key:
+                await self.store.run(self.collages.remember_file_id, self.bot_id, collage_key, sent)
 
         except Exception as e:
             logger.error(f"Ошибка при получении списка моделей: {e}")
-            await self.send_message(update, 'Произошла ошибка при загрузке списка моделей. Попробуйте позже.')
+            await self.show_screen(update, context, 'Произошла ошибка при загрузке списка моделей. Попробуйте позже.')
+
+    async def models_collage(self, version, filter_type, page, models):
+        """
+        Возвращает коллаж страницы списка моделей
+
+        Args:
+            version: Версия снимка списка моделей, из которого взята страница
+            filter_type: Фильтр списка
+            page: Номер страницы
+            models: Модели страницы в порядке кнопок
+
+        Returns:
+            Кортеж (ключ коллажа, file_id или JPEG); (None, None), если коллаж не показывается
+        """
+        if not self.collages.enabled or version is None:
+            return None, None
+
+        key = self.collages.key(version, filter_type, page)
+        file_id = await self.store.run(self.collages.get_file_id, self.bot_id, key)
+        if file_id:
+            return key, file_id
+
+        image = await self.collages.get(key, [model.get('photo') for model in models])
+        return (key, image) if image else (None, None)
 
     def apply_filter(self, models, filter_type):
         """Применяет фильтр к списку моделей"""
@@ -321,25 +544,26 @@ class ModelsTelegramBot:
         }
         return filter_names.get(filter_type, "")
 
-    async def send_message(self, update, text, reply_markup=None):
-        """Универсальный метод отправки сообщений"""
-        if hasattr(update, 'message') and update.message:
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='HTML')
-        elif hasattr(update, 'callback_query') and update.callback_query:
-            await update.callback_query.message.reply_text(text, reply_markup=reply_markup, parse_mode='HTML')
-        else:
-            # Если update не содержит message или callback_query, получаем chat_id из контекста
-            chat_id = None
-            if hasattr(update, 'effective_chat'):
-                chat_id = update.effective_chat.id
-            elif hasattr(update, 'callback_query') and update.callback_query:
-                chat_id = update.callback_query.message.chat_id
+    async def show_screen(self, update, context, text, reply_markup=None, photo=None):
+        """
+        Показывает экран бота
+
+        По нажатию кнопки экран показывается на месте сообщения с кнопкой, по команде - новым сообщением.
+
+        Args:
+            update: Обновление от Telegram
+            context: Контекст обработчика
+            text: Текст экрана (для экрана с фото - подпись)
+            reply_markup: Клавиатура экрана
+            photo: URL, file_id или содержимое файла фото (None - текстовый экран)
 
-            if chat_id:
-                from telegram.ext import ContextTypes
-                # Получаем context из параметров (нужно будет передавать context в вызовы)
-                # Пока что оставим как есть для обратной совместимости
-                pass
+        Returns:
+            Сообщение с экраном
+        """
+        query = update.callback_query
+        current = query.message if query else None
+        chat_id = current.chat_id if current else update.effective_chat.id
+        return await self.navigator.show(context.bot, chat_id, current, text, reply_markup, photo)
 
     async def delete_previous_message(self, context):
         """Удаляет предыдущее сообщение, если оно есть"""
@@ -357,57 +581,64 @@ class ModelsTelegramBot:
                 # Очищаем ID в любом случае
                 context.user_data.pop('last_message_id', None)
 
-    async def model_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def model_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE, idx: int = 0, version=None):
         """Обрабатывает нажатие на кнопку модели, парсит и показывает детали."""
         query = update.callback_query
         await query.answer()
 
-        model_idx = int(query.data.replace('model_', ''))
+        models = await self.resolve_snapshot('models', version)
+        if models is None:
+            await self.show_screen(update, context, self.SNAPSHOT_EXPIRED_TEXT)
+            return
+
+        model_idx = idx
 
-        if model_idx < 0 or model_idx >= len(self.models_cache):
-            await query.edit_message_text(text='Ошибка: модель не найдена.')
+        if model_idx < 0 or model_idx >= len(models):
+            await self.show_screen(update, context, 'Ошибка: модель не найдена.')
             return
 
-        model_url = self.models_cache[model_idx]['url']
+        model_url = models[model_idx]['url']
 
         try:
-            model_info = self.models_parser.parse_detail(model_url)
+            model_info = await self.get_model_detail(model_url)
 
             if not model_info:
-                await query.edit_message_text(text='Не удалось загрузить информацию о модели.')
+                await self.show_screen(update, context, 'Не удалось загрузить информацию о модели.')
                 return
 
-            # Удаляем сообщение со списком моделей
-            await query.delete_message()
-
             # Сохраняем информацию о модели в контексте для навигации по фото
             # (предыдущие параметры страницы и фильтра остаются сохраненными)
             context.user_data['current_model'] = model_info
             context.user_data['current_photo_idx'] = 0
-            context.user_data['message_id'] = None  # Сбрасываем ID сообщения
 
-            # Показываем первое фото с кнопками навигации
+            # Показываем первое фото с кнопками навигации на месте списка моделей
             await self.show_photo_with_navigation(query, context, model_info, 0)
 
         except Exception as e:
             logger.error(f"Ошибка при загрузке деталей модели: {e}")
-            await query.edit_message_text(text='Не удалось загрузить информацию о модели.')
+            await self.show_screen(update, context, 'Не удалось загрузить информацию о модели.')
+
+    async def get_model_detail(self, url):
+        """Возвращает детали модели из общего кэша, загружая их с сайта при промахе"""
+        return await self.shared.get_model_detail(url)
 
-    async def teacher_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def teacher_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE, idx: int = 0, version=None):
         """Обрабатывает нажатие на кнопку учителя"""
         query = update.callback_query
         await query.answer()
 
-        teacher_idx = int(query.data.replace('teacher_', ''))
-
-        if teacher_idx < 0 or teacher_idx >= len(self.teachers_cache):
-            await query.edit_message_text(text='Ошибка: учитель не найден.')
+        teachers = await self.resolve_snapshot('teachers', version)
+        if teachers is None:
+            await self.show_screen(update, context, self.SNAPSHOT_EXPIRED_TEXT)
             return
 
-        teacher = self.teachers_cache[teacher_idx]
+        teacher_idx = idx
 
-        # Удаляем сообщение со списком учителей
-        await query.delete_message()
+        if teacher_idx < 0 or teacher_idx >= len(teachers):
+            await self.show_screen(update, context, 'Ошибка: учитель не найден.')
+            return
+
+        teacher = teachers[teacher_idx]
 
         # Форматируем информацию об учителе
         message_text = f"👨‍🏫 <b>{teacher['name']}</b>\n\n"
@@ -415,51 +646,32 @@ class ModelsTelegramBot:
         if teacher.get('specialty'):
             message_text += f"🎓 <b>Специальность:</b> {teacher['specialty']}\n\n"
 
-        if teacher.get('photo'):
-            # Если есть фото, отправляем его с подписью
-            keyboard = [
-                [InlineKeyboardButton("⬅️ Назад к списку учителей", callback_data="back_to_teachers")],
-                [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await context.bot.send_photo(
-                chat_id=query.message.chat_id,
-                photo=teacher['photo'],
-                caption=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
-        else:
-            # Если нет фото, отправляем только текст
-            keyboard = [
-                [InlineKeyboardButton("⬅️ Назад к списку учителей", callback_data="back_to_teachers")],
-                [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+        keyboard = [
+            [InlineKeyboardButton("⬅️ Назад к списку учителей", callback_data=self.codec.encode('back_to_teachers'))],
+            [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+        # Если есть фото, показываем его с подписью, иначе только текст
+        await self.show_screen(update, context, message_text, reply_markup, photo=teacher.get('photo'))
 
-    async def partner_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def partner_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE, idx: int = 0, version=None):
         """Обрабатывает нажатие на кнопку партнера"""
         query = update.callback_query
         await query.answer()
 
-        partner_idx = int(query.data.replace('partner_', ''))
-
-        if partner_idx < 0 or partner_idx >= len(self.partners_cache):
-            await query.edit_message_text(text='Ошибка: партнер не найден.')
+        partners = await self.resolve_snapshot('partners', version)
+        if partners is None:
+            await self.show_screen(update, context, self.SNAPSHOT_EXPIRED_TEXT)
             return
 
-        partner = self.partners_cache[partner_idx]
+        partner_idx = idx
 
-        # Удаляем сообщение со списком партнеров
-        await query.delete_message()
+        if partner_idx < 0 or partner_idx >= len(partners):
+            await self.show_screen(update, context, 'Ошибка: партнер не найден.')
+            return
+
+        partner = partners[partner_idx]
 
         # Форматируем информацию о партнере
         message_text = f"🤝 <b>{partner['name']}</b>\n\n"
@@ -467,48 +679,19 @@ class ModelsTelegramBot:
         if partner.get('website'):
             message_text += f"🌐 <b>Сайт:</b> {partner['website']}\n\n"
 
-        if partner.get('logo'):
-            # Если есть логотип, отправляем его с подписью
-            keyboard = [
-                [InlineKeyboardButton("⬅️ Назад к списку партнеров", callback_data="back_to_partners")],
-                [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await context.bot.send_photo(
-                chat_id=query.message.chat_id,
-                photo=partner['logo'],
-                caption=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
-        else:
-            # Если нет логотипа, отправляем только текст
-            keyboard = [
-                [InlineKeyboardButton("⬅️ Назад к списку партнеров", callback_data="back_to_partners")],
-                [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+        keyboard = [
+            [InlineKeyboardButton("⬅️ Назад к списку партнеров", callback_data=self.codec.encode('back_to_partners'))],
+            [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+        # Если есть логотип, показываем его с подписью, иначе только текст
+        await self.show_screen(update, context, message_text, reply_markup, photo=partner.get('logo'))
 
     async def show_photo_with_navigation(self, query, context: ContextTypes.DEFAULT_TYPE, model_info, photo_idx):
         """Показывает фото с кнопками навигации"""
-        from telegram import InputMediaPhoto
-
         photos = model_info['photos']
 
-        if not photos:
-            # Если нет фото, показываем только текст
-            message_text = self.format_model_text(model_info)
-            await query.edit_message_text(text=message_text, parse_mode='HTML')
-            return
-
         # Форматируем текст сообщения
         message_text = self.format_model_text(model_info)
 
@@ -516,65 +699,123 @@ class ModelsTelegramBot:
         keyboard = []
 
         # Кнопка "Назад к списку моделей"
-        keyboard.append([InlineKeyboardButton("⬅️ Назад к списку моделей", callback_data="back_to_models")])
+        keyboard.append([InlineKeyboardButton("⬅️ Назад к списку моделей", callback_data=self.codec.encode('back_to_models'))])
 
         if len(photos) > 1:
             row = []
             if photo_idx > 0:
-                row.append(InlineKeyboardButton("⬅️ Предыдущая", callback_data=f"photo_prev_{photo_idx}"))
-            row.append(InlineKeyboardButton(f"{photo_idx + 1}/{len(photos)}", callback_data="photo_counter"))
+                row.append(InlineKeyboardButton("⬅️ Предыдущая", callback_data=self.codec.encode('photo', idx=photo_idx - 1)))
+            row.append(InlineKeyboardButton(f"{photo_idx + 1}/{len(photos)}", callback_data=self.codec.encode('noop')))
             if photo_idx < len(photos) - 1:
-                row.append(InlineKeyboardButton("Следующая ➡️", callback_data=f"photo_next_{photo_idx}"))
+                row.append(InlineKeyboardButton("Следующая ➡️", callback_data=self.codec.encode('photo', idx=photo_idx + 1)))
             keyboard.append(row)
+            keyboard.append([InlineKeyboardButton("🖼 Все фото альбомом", callback_data=self.codec.encode('photo_album'))])
 
         # Кнопка "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))])
 
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        # Для первого показа отправляем новое фото
-        if not context.user_data.get('message_id'):
-            message = await context.bot.send_photo(
-                chat_id=query.message.chat_id,
-                photo=photos[photo_idx],
-                caption=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+        if not photos:
+            # Если нет фото, показываем только текст
+            message = await self.navigator.show(context.bot, query.message.chat_id, query.message, message_text, reply_markup)
             context.user_data['message_id'] = message.message_id
-        else:
-            # Для последующих - редактируем существующее фото
-            media = InputMediaPhoto(media=photos[photo_idx], caption=message_text, parse_mode='HTML')
-            await context.bot.edit_message_media(
-                chat_id=query.message.chat_id,
-                message_id=context.user_data['message_id'],
-                media=media,
-                reply_markup=reply_markup
-            )
+            return
+
+        # Уже загруженные в Telegram фото отправляем по file_id
+        photo_url = photos[photo_idx]
+        photo = await self.store.run(self.get_photo_file_id, photo_url) or photo_url
+
+        # Первый показ заменяет список моделей новым сообщением с фото, дальше фото меняется в том же сообщении
+        message = await self.navigator.show(
+            context.bot, query.message.chat_id, query.message, message_text, reply_markup, photo=photo
+        )
+        context.user_data['message_id'] = message.message_id
+
+        await self.store.run(self.remember_photo_file_id, photo_url, message)
+
+    def get_photo_file_id(self, url):
+        """Возвращает file_id ранее отправленного фото"""
+        return self.store.hget(f'file_ids:photo:{self.bot_id}', url)
+
+    def remember_photo_file_id(self, url, message):
+        """Запоминает file_id отправленного фото, чтобы не загружать его повторно"""
+        if hasattr(message, 'photo') and message.photo:
+            self.store.hset(f'file_ids:photo:{self.bot_id}', url, message.photo[-1].file_id)
+
+    async def photo_album(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Показывает все фото модели альбомами по 10 штук с отдельным сообщением с параметрами"""
+        from telegram import InputMediaPhoto
+
+        query = update.callback_query
+        await query.answer()
+
+        model_info = context.user_data.get('current_model')
+        if not model_info or not model_info['photos']:
+            await self.show_screen(update, context, 'Информация о модели не найдена. Попробуйте выбрать модель заново.')
+            return
+
+        chat_id = query.message.chat_id
+        photos = model_info['photos']
+
+        # Удаляем сообщение с одиночным фото
+        await query.delete_message()
+        context.user_data['message_id'] = None
+
+        album_message_ids = []
+        try:
+            for start in range(0, len(photos), self.MEDIA_GROUP_SIZE):
+                batch = photos[start:start + self.MEDIA_GROUP_SIZE]
+                file_ids = await self.store.run(lambda: [self.get_photo_file_id(url) for url in batch])
+                media = [InputMediaPhoto(media=file_id or url) for url, file_id in zip(batch, file_ids)]
+                messages = await context.bot.send_media_group(chat_id=chat_id, media=media)
+                await self.store.run(lambda: [self.remember_photo_file_id(url, message)
+                                              for url, message in zip(batch, messages)])
+                album_message_ids.extend(message.message_id for message in messages)
+        except Exception as e:
+            logger.error(f"Ошибка при отправке альбома модели {model_info['url']}: {e}")
+
+        context.user_data['album_message_ids'] = album_message_ids
+
+        # Параметры модели и навигация - отдельным сообщением под альбомом
+        keyboard = [
+            [InlineKeyboardButton("⬅️ Назад к списку моделей", callback_data=self.codec.encode('back_to_models'))],
+            [InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]
+        ]
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text=self.format_model_text(model_info),
+            parse_mode='HTML',
+            reply_markup=InlineKeyboardMarkup(keyboard)
+        )
+
+    async def delete_album(self, context: ContextTypes.DEFAULT_TYPE, chat_id):
+        """Удаляет сообщения альбома с фото модели, если он был показан"""
+        album_message_ids = context.user_data.pop('album_message_ids', None)
+        if not album_message_ids:
+            return
+        try:
+            await context.bot.delete_messages(chat_id=chat_id, message_ids=album_message_ids)
+        except Exception as e:
+            logger.debug(f"Не удалось удалить альбом: {e}")
 
-    async def photo_navigation(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def photo_navigation(self, update: Update, context: ContextTypes.DEFAULT_TYPE, idx: int = 0):
         """Обрабатывает навигацию по фото"""
         query = update.callback_query
         await query.answer()
 
         model_info = context.user_data.get('current_model')
         if not model_info:
-            await query.edit_message_text(text='Информация о модели не найдена. Попробуйте выбрать модель заново.')
+            await self.show_screen(update, context, 'Информация о модели не найдена. Попробуйте выбрать модель заново.')
             return
 
-        current_idx = context.user_data.get('current_photo_idx', 0)
+        # Кнопка несет номер нужного фото, текущее состояние для этого не требуется
         photos = model_info['photos']
-
-        if query.data.startswith('photo_prev_'):
-            new_idx = max(0, current_idx - 1)
-        elif query.data.startswith('photo_next_'):
-            new_idx = min(len(photos) - 1, current_idx + 1)
-        else:
-            return  # Неизвестная команда
+        new_idx = max(0, min(len(photos) - 1, idx))
 
         context.user_data['current_photo_idx'] = new_idx
 
-        # Обновляем фото без удаления сообщения
+        # Обновляем фото в том же сообщении
         await self.show_photo_with_navigation(query, context, model_info, new_idx)
 
     async def back_to_models(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -582,8 +823,8 @@ class ModelsTelegramBot:
         query = update.callback_query
         await query.answer()
 
-        # Удаляем текущее сообщение с моделью
-        await query.delete_message()
+        # Удаляем альбом с фото, если он был показан; список показывается на месте сообщения с моделью
+        await self.delete_album(context, query.message.chat_id)
 
         # Восстанавливаем сохраненные параметры страницы и фильтра
         current_page = context.user_data.get('current_page', 0)
@@ -599,113 +840,17 @@ class ModelsTelegramBot:
 
     async def back_to_teachers(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обрабатывает возврат к списку учителей"""
-        query = update.callback_query
-        await query.answer()
-
-        # Удаляем текущее сообщение с деталями учителя
-        await query.delete_message()
-
-        # Загружаем учителей, если они еще не загружены
-        if not self.teachers_cache:
-            teachers = self.teachers_parser.parse_list()
-            self.teachers_cache = teachers
-        else:
-            teachers = self.teachers_cache
-
-        if not teachers:
-            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text="👨‍🏫 <b>Раздел учителей</b>\n\nНе удалось загрузить список учителей. Попробуйте позже.",
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
-            return
-
-        # Создаем сообщение со списком учителей
-        message = "👨‍🏫 <b>Наши преподаватели</b>\n\n"
-        message += f"Найдено {len(teachers)} преподавателей:\n\n"
-
-        # Создаем клавиатуру
-        keyboard = []
-
-        for idx, teacher in enumerate(teachers):
-            # Создаем кнопку с именем и специальностью
-            button_text = f"👨‍🏫 {teacher['name']}"
-            if teacher.get('specialty'):
-                button_text += f" ({teacher['specialty']})"
-
-            keyboard.append([InlineKeyboardButton(
-                button_text,
-                callback_data=f"teacher_{idx}"
-            )])
-
-        # Добавляем кнопку "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+        await update.callback_query.answer()
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await context.bot.send_message(
-            chat_id=query.message.chat_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
+        # Список показывается на месте сообщения с деталями, на той странице, откуда была открыта запись
+        await self.teachers_command(update, context, page=self.saved_list_page(context, 'teachers'))
 
     async def back_to_partners(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обрабатывает возврат к списку партнеров"""
-        query = update.callback_query
-        await query.answer()
-
-        # Удаляем текущее сообщение с деталями партнера
-        await query.delete_message()
-
-        # Загружаем партнеров, если они еще не загружены
-        if not self.partners_cache:
-            partners = self.partners_parser.parse_list()
-            self.partners_cache = partners
-        else:
-            partners = self.partners_cache
+        await update.callback_query.answer()
 
-        if not partners:
-            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text="🤝 <b>Раздел партнеров</b>\n\nНе удалось загрузить список партнеров. Попробуйте позже.",
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
-            return
-
-        # Создаем сообщение со списком партнеров
-        message = "🤝 <b>Наши партнеры</b>\n\n"
-        message += f"Найдено {len(partners)} партнеров:\n\n"
-
-        # Создаем клавиатуру
-        keyboard = []
-
-        for idx, partner in enumerate(partners):
-            # Создаем кнопку с названием партнера
-            button_text = f"🤝 {partner['name']}"
-
-            keyboard.append([InlineKeyboardButton(
-                button_text,
-                callback_data=f"partner_{idx}"
-            )])
-
-        # Добавляем кнопку "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
-
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await context.bot.send_message(
-            chat_id=query.message.chat_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
+        # Список показывается на месте сообщения с деталями, на той странице, откуда была открыта запись
+        await self.partners_command(update, context, page=self.saved_list_page(context, 'partners'))
 
     async def back_to_main(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обрабатывает возврат в главное меню"""
@@ -714,6 +859,7 @@ class ModelsTelegramBot:
 
         # Удаляем текущее сообщение (раздел моделей/учителей/партнеров)
         await query.delete_message()
+        await self.delete_album(context, query.message.chat_id)
 
         # Удаляем команду пользователя, если она сохранена
         command_message_id = context.user_data.get('command_message_id')
@@ -741,59 +887,14 @@ class ModelsTelegramBot:
         context.user_data.pop('chat_id', None)
         context.user_data.pop('projects_list_message_id', None)
 
-    async def handle_pagination(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Обрабатывает пагинацию списка моделей"""
-        query = update.callback_query
-        await query.answer()
-
-        # Парсим callback_data: page_{page_num}_filter_{filter_type}
-        data = query.data
-
-        if data.startswith('page_') and '_filter_' in data:
-            # Находим позицию "_filter_"
-            filter_pos = data.find('_filter_')
-            page_str = data[5:filter_pos]  # Берем часть между "page_" и "_filter_"
-            filter_type = data[filter_pos + 8:]  # Берем все после "_filter_"
-
-            try:
-                page = int(page_str)
-
-                # Удаляем старое сообщение
-                await query.delete_message()
-
-                # Показываем новую страницу
-                await self.list_models(update, context, page=page, filter_type=filter_type)
-            except ValueError:
-                await query.edit_message_text(text='Ошибка обработки запроса пагинации.')
-        else:
-            await query.edit_message_text(text='Ошибка: неизвестный формат запроса пагинации.')
-
-    async def handle_filter(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Обрабатывает применение фильтров"""
+    async def handle_models_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                 page: int = 0, filter_type: str = 'all'):
+        """Обрабатывает пагинацию и смену фильтра списка моделей"""
         query = update.callback_query
         await query.answer()
 
-        # Парсим callback_data: filter_{filter_type}_page_{page}
-        data = query.data
-
-        if data.startswith('filter_') and '_page_' in data:
-            # Находим позицию "_page_"
-            page_pos = data.find('_page_')
-            filter_type = data[7:page_pos]  # Убираем "filter_" в начале
-            page_str = data[page_pos + 6:]  # Берем все после "_page_"
-
-            try:
-                page = int(page_str)
-
-                # Удаляем старое сообщение
-                await query.delete_message()
-
-                # Показываем отфильтрованный список
-                await self.list_models(update, context, page=page, filter_type=filter_type)
-            except ValueError:
-                await query.edit_message_text(text='Ошибка обработки запроса фильтрации.')
-        else:
-            await query.edit_message_text(text='Ошибка: неизвестный формат запроса фильтрации.')
+        # Показываем нужную страницу отфильтрованного списка на месте текущей
+        await self.list_models(update, context, page=page, filter_type=filter_type)
 
     def format_model_text(self, model_info):
         """Форматирует текст информации о модели"""
@@ -815,41 +916,41 @@ class ModelsTelegramBot:
         message_text += f'\n<a href="{model_info["url"]}">Ссылка на портфолио</a>'
         return message_text
 
-    async def magazines_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def magazines_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE, page: int = 0):
         """Обрабатывает команду /magazines"""
-        # Определяем chat_id в зависимости от типа update
-        if hasattr(update, 'message') and update.message:
-            chat_id = update.message.chat_id
+        # Сохраняем ID команды пользователя для последующего удаления
+        if update.message:
             context.user_data['command_message_id'] = update.message.message_id
-        elif hasattr(update, 'callback_query') and update.callback_query:
-            chat_id = update.callback_query.message.chat_id
-        else:
-            return
 
         # Загружаем журналы, если они еще не загружены
-        if not self.magazines_cache:
-            magazines = self.magazines_parser.parse_list()
-            self.magazines_cache = magazines
-        else:
-            magazines = self.magazines_cache
+        magazines = await self.datasets.get_or_load('magazines')
 
         if not magazines:
-            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]]
+            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await context.bot.send_message(
-                chat_id=chat_id,
-                text="📖 <b>Архив журнала</b>\n\nНе удалось загрузить список выпусков журнала. Попробуйте позже.",
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+            await self.show_screen(update, context, "📖 <b>Архив журнала</b>\n\nНе удалось загрузить список выпусков журнала. Попробуйте позже.", reply_markup)
             return
 
         # Создаем сообщение со списком журналов
         message = "📖 <b>Глянцевый журнал ARMODELS</b>\n\n"
         message += f"Найдено {len(magazines)} выпусков:\n\n"
 
-        # Создаем клавиатуру
+        # Клавиатура строится один раз на версию данных и показывается постранично
+        version = self.datasets.loaded_version('magazines')
+        reply_markup, page, _ = self.keyboards.page(
+            'magazines',
+            version,
+            lambda: self._magazine_rows(magazines, version),
+            page,
+            lambda target: self.codec.encode('list_page', section='magazines', page=target),
+            footer=[[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))]]
+        )
+        self.save_list_page(context, 'magazines', page)
+        await self.show_screen(update, context, message, reply_markup)
+
+    def _magazine_rows(self, magazines, version):
+        """Кнопки всех выпусков журнала для постраничной клавиатуры"""
         keyboard = []
 
         for idx, magazine in enumerate(magazines):
@@ -858,35 +959,28 @@ class ModelsTelegramBot:
 
             keyboard.append([InlineKeyboardButton(
                 button_text,
-                callback_data=f"magazine_{idx}"
+                callback_data=self.codec.encode('magazine', idx=idx, version=version)
             )])
 
-        # Добавляем кнопку "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+        return keyboard
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await context.bot.send_message(
-            chat_id=chat_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
-
-    async def magazine_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def magazine_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE, idx: int = 0, version=None):
         """Обрабатывает нажатие на кнопку выпуска журнала"""
         query = update.callback_query
         await query.answer()
 
-        magazine_idx = int(query.data.replace('magazine_', ''))
-
-        if magazine_idx < 0 or magazine_idx >= len(self.magazines_cache):
-            await query.edit_message_text(text='Ошибка: выпуск журнала не найден.')
+        magazines = await self.resolve_snapshot('magazines', version)
+        if magazines is None:
+            await self.show_screen(update, context, self.SNAPSHOT_EXPIRED_TEXT)
             return
 
-        magazine = self.magazines_cache[magazine_idx]
+        magazine_idx = idx
 
-        # Удаляем сообщение со списком журналов
-        await query.delete_message()
+        if magazine_idx < 0 or magazine_idx >= len(magazines):
+            await self.show_screen(update, context, 'Ошибка: выпуск журнала не найден.')
+            return
+
+        magazine = magazines[magazine_idx]
 
         # Форматируем информацию о выпуске журнала
         message_text = f"📖 <b>{magazine['issue_number']}</b>\n\n"
@@ -899,87 +993,85 @@ class ModelsTelegramBot:
         # Создаем клавиатуру
         keyboard = []
 
-        # Кнопка скачивания PDF, если есть ссылка
+        # Кнопка скачивания PDF, если есть ссылка (файл отправляется документом из зеркала)
         if magazine.get('pdf_url'):
-            keyboard.append([InlineKeyboardButton("⬇️ Скачать PDF", url=magazine['pdf_url'])])
+            keyboard.append([InlineKeyboardButton("⬇️ Скачать PDF", callback_data=self.codec.encode('magazine_pdf', idx=magazine_idx, version=version))])
 
         # Кнопки навигации
-        keyboard.append([InlineKeyboardButton("⬅️ Назад к списку журналов", callback_data="back_to_magazines")])
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+        keyboard.append([InlineKeyboardButton("⬅️ Назад к списку журналов", callback_data=self.codec.encode('back_to_magazines'))])
+        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))])
 
         reply_markup = InlineKeyboardMarkup(keyboard)
 
-        # Если есть изображение обложки, отправляем его с подписью
-        if magazine.get('cover_image'):
-            await context.bot.send_photo(
-                chat_id=query.message.chat_id,
-                photo=magazine['cover_image'],
-                caption=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
-        else:
-            # Если нет изображения, отправляем только текст
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+        # Если есть изображение обложки, показываем его с подписью, иначе только текст
+        await self.show_screen(update, context, message_text, reply_markup, photo=magazine.get('cover_image'))
 
-    async def back_to_magazines(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Обрабатывает возврат к списку журналов"""
+    async def magazine_pdf(self, update: Update, context: ContextTypes.DEFAULT_TYPE, idx: int = 0, version=None):
+        """Отправляет PDF выпуска журнала документом, используя file_id или локальное зеркало"""
         query = update.callback_query
         await query.answer()
 
-        # Удаляем текущее сообщение с деталями журнала
-        await query.delete_message()
+        magazines = await self.resolve_snapshot('magazines', version)
+        if magazines is None:
+            await context.bot.send_message(chat_id=query.message.chat_id, text=self.SNAPSHOT_EXPIRED_TEXT)
+            return
 
-        # Загружаем журналы, если они еще не загружены
-        if not self.magazines_cache:
-            magazines = self.magazines_parser.parse_list()
-            self.magazines_cache = magazines
-        else:
-            magazines = self.magazines_cache
+        magazine_idx = idx
 
-        if not magazines:
-            keyboard = [[InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+        if magazine_idx < 0 or magazine_idx >= len(magazines):
+            await context.bot.send_message(chat_id=query.message.chat_id, text='Ошибка: выпуск журнала не найден.')
+            return
 
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text="📖 <b>Архив журнала</b>\n\nНе удалось загрузить список выпусков журнала. Попробуйте позже.",
-                parse_mode='HTML',
-                reply_markup=reply_markup
-            )
+        magazine = magazines[magazine_idx]
+        pdf_url = magazine.get('pdf_url')
+        if not pdf_url:
             return
 
-        # Создаем сообщение со списком журналов
-        message = "📖 <b>Глянцевый журнал ARMODELS</b>\n\n"
-        message += f"Найдено {len(magazines)} выпусков:\n\n"
+        chat_id = query.message.chat_id
 
-        # Создаем клавиатуру
-        keyboard = []
+        try:
+            # Файл уже загружен в Telegram - отправляем по file_id без обращения к сайту
+            file_id = await self.store.run(self.pdf_cache.get_file_id, pdf_url, self.bot_id)
+            if file_id:
+                await context.bot.send_document(chat_id=chat_id, document=file_id)
+                return
 
-        for idx, magazine in enumerate(magazines):
-            # Создаем кнопку только с номером выпуска
-            button_text = f"📖 {magazine['issue_number']}"
+            await context.bot.send_chat_action(chat_id=chat_id, action='upload_document')
+
+            # Один и тот же выпуск скачиваем и загружаем только один раз, даже при одновременных запросах
+            lock = self.pdf_locks.setdefault(pdf_url, asyncio.Lock())
+            async with lock:
+                file_id = await self.store.run(self.pdf_cache.get_file_id, pdf_url, self.bot_id)
+                if file_id:
+                    await context.bot.send_document(chat_id=chat_id, document=file_id)
+                    return
+
+                path = await asyncio.to_thread(self.pdf_cache.fetch, pdf_url)
+                with open(path, 'rb') as f:
+                    message = await context.bot.send_document(
+                        chat_id=chat_id,
+                        document=f,
+                        filename=os.path.basename(pdf_url.split('?')[0]) or 'magazine.pdf',
+                        read_timeout=120,
+                        write_timeout=120
+                    )
+                await self.store.run(self.pdf_cache.set_file_id, pdf_url, message.document.file_id, self.bot_id)
 
-            keyboard.append([InlineKeyboardButton(
-                button_text,
-                callback_data=f"magazine_{idx}"
-            )])
+        except Exception as e:
+            logger.error(f"Ошибка при отправке PDF {pdf_url}: {e}")
+            # Если отправить файл не удалось, даем прямую ссылку на сайт
+            await context.bot.send_message(
+                chat_id=chat_id,
+                text="Не удалось отправить файл. Скачайте выпуск по ссылке:",
+                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("⬇️ Скачать PDF", url=pdf_url)]])
+            )
 
-        # Добавляем кнопку "Вернуться в главное меню" в конце
-        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+    async def back_to_magazines(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обрабатывает возврат к списку журналов"""
+        await update.callback_query.answer()
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await context.bot.send_message(
-            chat_id=query.message.chat_id,
-            text=message,
-            parse_mode='HTML',
-            reply_markup=reply_markup
-        )
+        # Список показывается на месте сообщения с деталями, на той странице, откуда была открыта запись
+        await self.magazines_command(update, context, page=self.saved_list_page(context, 'magazines'))
 
     async def projects_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обрабатывает команду /projects"""
@@ -991,15 +1083,15 @@ class ModelsTelegramBot:
             keyboard = []
 
             # Кнопка "Все проекты"
-            keyboard.append([InlineKeyboardButton("🎭 Все проекты", callback_data="category_all")])
+            keyboard.append([InlineKeyboardButton("🎭 Все проекты", callback_data=self.codec.encode('category', category='all'))])
 
             # Кнопки для каждой категории
             for category_code, category_name in categories.items():
                 emoji = self._get_category_emoji(category_code)
-                keyboard.append([InlineKeyboardButton(f"{emoji} {category_name}", callback_data=f"category_{category_code}")])
+                keyboard.append([InlineKeyboardButton(f"{emoji} {category_name}", callback_data=self.codec.encode('category', category=category_code))])
 
             # Кнопка "Вернуться в главное меню"
-            keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data="back_to_main")])
+            keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))])
 
             reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -1013,6 +1105,10 @@ class ModelsTelegramBot:
                 context.user_data['command_message_id'] = update.message.message_id
                 context.user_data['chat_id'] = chat_id
                 logger.info(f"projects_command: Сохранен command_message_id={update.message.message_id}")
+                # По команде списки категорий снова открываются с первой страницы
+                list_pages = context.user_data.get('list_pages', {})
+                for key in [key for key in list_pages if key.startswith('projects:')]:
+                    del list_pages[key]
                 await update.message.reply_text(
                     message_text,
                     parse_mode='HTML',
@@ -1024,12 +1120,7 @@ class ModelsTelegramBot:
                 context.user_data['chat_id'] = chat_id
                 existing_command_id = context.user_data.get('command_message_id')
                 logger.info(f"projects_command (callback): chat_id={chat_id}, existing command_message_id={existing_command_id}")
-                await context.bot.send_message(
-                    chat_id=chat_id,
-                    text=message_text,
-                    parse_mode='HTML',
-                    reply_markup=reply_markup
-                )
+                await self.show_screen(update, context, message_text, reply_markup)
             else:
                 return
 
@@ -1064,35 +1155,42 @@ class ModelsTelegramBot:
 
         return emoji_map.get(category_code, '🎭')
 
-    async def project_category(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Обрабатывает выбор категории проектов"""
+    async def get_projects(self):
+        """Возвращает общий список проектов, загружая страницу /projects один раз для всех категорий"""
+        dataset = await self.datasets.get_or_load('projects')
+        return dataset.get('projects', [])
+
+    def get_project_indices(self, category_code):
+        """Возвращает индексы проектов категории в общем списке ('all' - все проекты)"""
+        dataset = self.projects_cache
+        if category_code == 'all':
+            return range(len(dataset.get('projects', [])))
+        return dataset.get('categories', {}).get(category_code, [])
+
+    async def project_category(self, update: Update, context: ContextTypes.DEFAULT_TYPE, category: str = 'all',
+                               page: Optional[int] = None):
+        """Обрабатывает выбор категории проектов и переход по страницам списка (None - последняя просмотренная)"""
         query = update.callback_query
         await query.answer()
 
         # Сохраняем chat_id для удаления команды
         context.user_data['chat_id'] = query.message.chat_id
 
-        category_code = query.data.replace('category_', '')
+        category_code = category
 
         try:
-            # Определяем категорию для парсинга
-            category = None if category_code == 'all' else category_code
-
-            # Получаем проекты
-            if category not in self.projects_cache:
-                projects = self.projects_parser.parse_list(category)
-                self.projects_cache[category] = projects
-            else:
-                projects = self.projects_cache[category]
-
-            if not projects:
-                await query.delete_message()
-                await context.bot.send_message(
-                    chat_id=query.message.chat_id,
-                    text="📭 В этой категории пока нет проектов.",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("🔙 Назад к категориям", callback_data="back_to_projects"),
-                        InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")
+            # Получаем индексы проектов категории в общем списке
+            projects = await self.get_projects()
+            project_indices = self.get_project_indices(category_code)
+
+            if not project_indices:
+                await self.show_screen(
+                    update,
+                    context,
+                    "📭 В этой категории пока нет проектов.",
+                    InlineKeyboardMarkup([[
+                        InlineKeyboardButton("🔙 Назад к категориям", callback_data=self.codec.encode('back_to_projects')),
+                        InlineKeyboardButton("🏠 Главное меню", callback_data=self.codec.encode('back_to_main'))
                     ]])
                 )
                 return
@@ -1104,66 +1202,75 @@ class ModelsTelegramBot:
             category_emoji = self._get_category_emoji(category_code)
 
             message_text = f"{category_emoji} <b>{category_name}</b>\n\n"
-            message_text += f"Найдено {len(projects)} проектов:\n\n"
-
-            # Создаем клавиатуру
-            keyboard = []
-
-            for idx, project in enumerate(projects):
-                # Обрезаем название если оно слишком длинное
-                title = project['title']
-                if len(title) > 30:
-                    title = title[:27] + "..."
-
-                # Получаем иконку для проекта
-                if category_code == 'all':
-                    # Для общего списка используем иконку категории проекта
-                    project_category = project.get('category')
-                    if not project_category:
-                        logger.warning(f"Проект '{title}' не имеет категории, используем по умолчанию")
-                        project_category = ''
-                    project_emoji = self._get_category_emoji(project_category)
-                else:
-                    # Для конкретной категории используем иконку этой категории
-                    project_emoji = self._get_category_emoji(category_code)
-
-                keyboard.append([InlineKeyboardButton(
-                    f"{project_emoji} {title}",
-                    callback_data=f"project_{category_code}_{idx}"
-                )])
-
-            # Кнопки навигации
-            keyboard.append([
-                InlineKeyboardButton("🔙 К категориям", callback_data="back_to_projects"),
-                InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")
-            ])
-
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            # Удаляем старое сообщение и отправляем новое
-            await query.delete_message()
-            message = await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text=message_text,
-                parse_mode='HTML',
-                reply_markup=reply_markup
+            message_text += f"Найдено {len(project_indices)} проектов:\n\n"
+
+            # Клавиатура категории строится один раз на версию данных и показывается постранично
+            version = self.datasets.loaded_version('projects')
+            list_key = f"projects:{category_code}"
+            if page is None:
+                page = self.saved_list_page(context, list_key)
+            reply_markup, page, _ = self.keyboards.page(
+                list_key,
+                version,
+                lambda: self._project_rows(projects, project_indices, category_code, version),
+                page,
+                lambda target: self.codec.encode('category_page', category=category_code, page=target),
+                footer=[[
+                    InlineKeyboardButton("🔙 К категориям", callback_data=self.codec.encode('back_to_projects')),
+                    InlineKeyboardButton("🏠 Главное меню", callback_data=self.codec.encode('back_to_main'))
+                ]]
             )
-            # Сохраняем ID нового сообщения для возможного удаления
+            self.save_list_page(context, list_key, page)
+
+            # Показываем список на месте предыдущего экрана
+            message = await self.show_screen(update, context, message_text, reply_markup)
+            # Сохраняем ID сообщения со списком для возможного удаления
             context.user_data['projects_list_message_id'] = message.message_id
 
         except Exception as e:
             logger.error(f"Ошибка при обработке категории проектов {category_code}: {e}")
-            await query.delete_message()
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text="❌ Произошла ошибка при загрузке проектов.",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("🔙 Назад к категориям", callback_data="back_to_projects"),
-                    InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")
+            await self.show_screen(
+                update,
+                context,
+                "❌ Произошла ошибка при загрузке проектов.",
+                InlineKeyboardMarkup([[
+                    InlineKeyboardButton("🔙 Назад к категориям", callback_data=self.codec.encode('back_to_projects')),
+                    InlineKeyboardButton("🏠 Главное меню", callback_data=self.codec.encode('back_to_main'))
                 ]])
             )
 
-    async def project_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    def _project_rows(self, projects, project_indices, category_code, version):
+        """Кнопки проектов категории для постраничной клавиатуры"""
+        keyboard = []
+
+        for idx in project_indices:
+            project = projects[idx]
+            # Обрезаем название если оно слишком длинное
+            title = project['title']
+            if len(title) > 30:
+                title = title[:27] + "..."
+
+            # Получаем иконку для проекта
+            if category_code == 'all':
+                # Для общего списка используем иконку категории проекта
+                project_category = project.get('category')
+                if not project_category:
+                    logger.warning(f"Проект '{title}' не имеет категории, используем по умолчанию")
+                    project_category = ''
+                project_emoji = self._get_category_emoji(project_category)
+            else:
+                # Для конкретной категории используем иконку этой категории
+                project_emoji = self._get_category_emoji(category_code)
+
+            keyboard.append([InlineKeyboardButton(
+                f"{project_emoji} {title}",
+                callback_data=self.codec.encode('project', category=category_code, idx=idx, version=version)
+            )])
+
+        return keyboard
+
+    async def project_detail(self, update: Update, context: ContextTypes.DEFAULT_TYPE, category: str = 'all',
+                             idx: int = 0, version=None):
         """Обрабатывает просмотр деталей проекта"""
         query = update.callback_query
         await query.answer()
@@ -1171,9 +1278,9 @@ class ModelsTelegramBot:
         # Сохраняем chat_id для удаления команды
         context.user_data['chat_id'] = query.message.chat_id
 
-        # Удаляем сообщение со списком проектов, если оно есть
-        projects_list_message_id = context.user_data.get('projects_list_message_id')
-        if projects_list_message_id:
+        # Детали показываются на месте нажатого списка; другой оставшийся список проектов удаляем
+        projects_list_message_id = context.user_data.pop('projects_list_message_id', None)
+        if projects_list_message_id and projects_list_message_id != query.message.message_id:
             try:
                 await context.bot.delete_message(
                     chat_id=query.message.chat_id,
@@ -1181,39 +1288,22 @@ class ModelsTelegramBot:
                 )
             except Exception as e:
                 logger.debug(f"Не удалось удалить сообщение со списком проектов: {e}")
-            finally:
-                context.user_data.pop('projects_list_message_id', None)
-
-        # Парсим callback_data: project_{category}_{index}
-        parts = query.data.split('_')
-        if len(parts) < 3:
-            await query.delete_message()
-            await context.bot.send_message(
-                chat_id=query.message.chat_id,
-                text="❌ Ошибка в данных проекта."
-            )
-            return
 
-        category_code = parts[1]
-        project_idx = int(parts[2])
+        # idx - позиция проекта в общем списке снимка version
+        dataset = await self.resolve_snapshot('projects', version)
+        category_code = category
+        project_idx = idx
 
         try:
-            # Определяем категорию для получения данных
-            category = None if category_code == 'all' else category_code
+            if dataset is None:
+                await self.show_screen(update, context, self.SNAPSHOT_EXPIRED_TEXT)
+                return
 
-            # Получаем проекты из кэша
-            if category not in self.projects_cache:
-                projects = self.projects_parser.parse_list(category)
-                self.projects_cache[category] = projects
-            else:
-                projects = self.projects_cache[category]
+            # Проекты из того снимка, по которому построен список
+            projects = dataset.get('projects', [])
 
             if project_idx < 0 or project_idx >= len(projects):
-                await query.delete_message()
-                await context.bot.send_message(
-                    chat_id=query.message.chat_id,
-                    text="❌ Проект не найден."
-                )
+                await self.show_screen(update, context, "❌ Проект не найден.")
                 return
 
             project = projects[project_idx]
@@ -1233,39 +1323,25 @@ class ModelsTelegramBot:
                 message_text += f"🔗 <a href=\"{project['detail_url']}\">Подробнее на сайте</a>"
 
             # Кнопки навигации
-            category_callback = "category_all" if category_code == 'all' else f"category_{category_code}"
+            category_callback = self.codec.encode('category', category=category_code)
             keyboard = [
                 [InlineKeyboardButton("🔙 К списку проектов", callback_data=category_callback)],
-                [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
+                [InlineKeyboardButton("🏠 Главное меню", callback_data=self.codec.encode('back_to_main'))]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            # Если есть изображение, отправляем его с подписью
-            if project.get('image_url'):
-                await context.bot.send_photo(
-                    chat_id=query.message.chat_id,
-                    photo=project['image_url'],
-                    caption=message_text,
-                    parse_mode='HTML',
-                    reply_markup=reply_markup
-                )
-            else:
-                await context.bot.send_message(
-                    chat_id=query.message.chat_id,
-                    text=message_text,
-                    parse_mode='HTML',
-                    reply_markup=reply_markup
-                )
+            # Если есть изображение, показываем его с подписью, иначе только текст
+            await self.show_screen(update, context, message_text, reply_markup, photo=project.get('image_url'))
 
         except Exception as e:
             logger.error(f"Ошибка при загрузке деталей проекта {project_idx}: {e}")
-            category_callback = "category_all" if category_code == 'all' else f"category_{category_code}"
+            category_callback = self.codec.encode('category', category=category_code)
             await context.bot.send_message(
                 chat_id=query.message.chat_id,
                 text="❌ Произошла ошибка при загрузке информации о проекте.",
                 reply_markup=InlineKeyboardMarkup([[
                     InlineKeyboardButton("🔙 Назад", callback_data=category_callback),
-                    InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")
+                    InlineKeyboardButton("🏠 Главное меню", callback_data=self.codec.encode('back_to_main'))
                 ]])
             )
 
@@ -1274,22 +1350,182 @@ class ModelsTelegramBot:
         query = update.callback_query
         await query.answer()
 
-        # Удаляем текущее сообщение
-        await query.delete_message()
-
         # Сохраняем chat_id для удаления команды
         context.user_data['chat_id'] = query.message.chat_id
 
         existing_command_id = context.user_data.get('command_message_id')
         logger.info(f"back_to_projects: existing command_message_id={existing_command_id}")
 
-        # Показываем категории проектов
+        # Показываем категории проектов на месте текущего сообщения
         await self.projects_command(update, context)
 
+    async def subscriptions_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обрабатывает команду /subscribe: показывает подписки чата на уведомления"""
+        if update.message:
+            context.user_data['command_message_id'] = update.message.message_id
+        else:
+            await update.callback_query.answer()
+
+        text, reply_markup = await self._subscriptions_screen(update.effective_chat.id)
+        await self.show_screen(update, context, text, reply_markup)
+
+    async def _subscriptions_screen(self, chat_id):
+        """Текст и клавиатура экрана подписок"""
+        text = (
+            "🔔 <b>Уведомления</b>\n\n"
+            "Бот пришлет сообщение, когда на сайте появится новый выпуск журнала или новые модели.\n"
+            "Нажмите на тему, чтобы подписаться или отписаться."
+        )
+        subscribed = await self.store.run(
+            lambda: {topic: self.broadcasts.is_subscribed(self.bot_id, topic, chat_id) for topic in self.SUBSCRIPTION_TOPICS}
+        )
+        keyboard = []
+        for topic, title in self.SUBSCRIPTION_TOPICS.items():
+            mark = '✅' if subscribed[topic] else '➕'
+            keyboard.append([InlineKeyboardButton(f"{mark} {title}", callback_data=self.codec.encode('subscription', topic=topic))])
+        keyboard.append([InlineKeyboardButton("🏠 Вернуться в главное меню", callback_data=self.codec.encode('back_to_main'))])
+        return text, InlineKeyboardMarkup(keyboard)
+
+    async def toggle_subscription(self, update: Update, context: ContextTypes.DEFAULT_TYPE, topic: str = ''):
+        """Подписывает чат на тему уведомлений или отписывает от нее"""
+        query = update.callback_query
+        chat_id = query.message.chat_id
+        if topic not in self.SUBSCRIPTION_TOPICS:
+            await query.answer()
+            return
+
+        if await self.store.run(self.broadcasts.is_subscribed, self.bot_id, topic, chat_id):
+            await self.store.run(self.broadcasts.unsubscribe, self.bot_id, topic, chat_id)
+            await query.answer('Уведомления отключены')
+        else:
+            await self.store.run(self.broadcasts.subscribe, self.bot_id, topic, chat_id)
+            await query.answer('Вы подписаны на уведомления')
+
+        text, reply_markup = await self._subscriptions_screen(chat_id)
+        await self.show_screen(update, context, text, reply_markup)
+
+    def render_broadcast(self, job):
+        """
+        Строит сообщение рассылки о новых записях
+
+        Кнопки ссылаются на запись в рассылке, а не на индекс в снимке набора данных:
+        снимок хранится час, а сообщение рассылки могут открыть и через несколько дней.
+
+        Args:
+            job: Рассылка (см. BroadcastEngine.create_job)
+
+        Returns:
+            Словарь {'text', 'photo', 'reply_markup'} или None, если тема неизвестна
+        """
+        settings_button = [InlineKeyboardButton("🔔 Настроить уведомления", callback_data=self.codec.encode('subscriptions'))]
+        item_button = lambda text, item: [InlineKeyboardButton(text, callback_data=self.codec.encode('broadcast_item', job=job['id'], item=item))]
+
+        if job['topic'] == 'magazines':
+            magazine = job['items'][0]['record']
+            text = f"📖 <b>Вышел новый выпуск журнала: {magazine['issue_number']}</b>\n\n"
+            if magazine.get('release_date') and magazine['release_date'] != 'Не указана':
+                text += f"📅 <b>Дата выхода:</b> в {magazine['release_date']}\n\n"
+            text += "Воплощение элегантности, стиля и красоты в каждом выпуске!"
+            keyboard = [item_button("📖 Открыть выпуск", 0), settings_button]
+            return {'text': text, 'photo': magazine.get('cover_image'), 'reply_markup': InlineKeyboardMarkup(keyboard)}
+
+        if job['topic'] == 'models':
+            text = "👤 <b>Новые модели агентства</b>\n\n"
+            keyboard = []
+            for item, entry in enumerate(job['items']):
+                model = entry['record']
+                text += f"• {model['name']} — {model.get('course', '')}\n"
+                keyboard.append(item_button(f"👤 {model['name']}", item))
+            if job['total'] > len(job['items']):
+                text += f"\nИ еще {job['total'] - len(job['items'])} в полном списке моделей."
+            keyboard.append([InlineKeyboardButton("📋 Все модели", callback_data=self.codec.encode('models_page', page=0, filter_type='all'))])
+            keyboard.append(settings_button)
+            return {'text': text, 'photo': None, 'reply_markup': InlineKeyboardMarkup(keyboard)}
+
+        return None
+
+    async def open_broadcast_item(self, update: Update, context: ContextTypes.DEFAULT_TYPE, job: int = 0, item: int = 0):
+        """Открывает запись из сообщения рассылки в текущей версии набора данных"""
+        query = update.callback_query
+        job_data = await self.store.run(self.broadcasts.get_job, job)
+        if not job_data or item >= len(job_data['items']):
+            await query.answer(self.SNAPSHOT_EXPIRED_TEXT, show_alert=True)
+            return
+
+        topic = job_data['topic']
+        data = await self.datasets.get_or_load(topic)
+        idx = self.broadcasts.find_record(topic, data, job_data['items'][item]['record'])
+        if idx is None:
+            await query.answer('Эта запись больше не опубликована на сайте.', show_alert=True)
+            return
+
+        version = self.datasets.loaded_version(topic)
+        if topic == 'models':
+            await self.model_detail(update, context, idx=idx, version=version)
+        else:
+            await self.magazine_detail(update, context, idx=idx, version=version)
+
     def run(self):
         """Запускает бота"""
         self.application.run_polling()
 
+async def serve_bots(bots):
+    """
+    Запускает несколько ботов в одном цикле событий и работает до SIGINT/SIGTERM
+
+    Args:
+        bots: Список экземпляров ModelsTelegramBot
+    """
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    started = []
+    try:
+        for bot in bots:
+            application = bot.application
+            await application.initialize()
+            started.append(bot)
+            await application.post_init(application)
+            await application.updater.start_polling()
+            await application.start()
+            logger.info(f"Бот {bot.bot_id} запущен")
+        await stop_event.wait()
+    finally:
+        for bot in reversed(started):
+            application = bot.application
+            try:
+                try:
+                    if application.updater.running:
+                        await application.updater.stop()
+                    if application.running:
+                        await application.stop()
+                finally:
+                    # Порядок как в run_polling: persistence сбрасывается в shutdown после остановки обработчиков
+                    await application.shutdown()
+                    await application.post_shutdown(application)
+            except Exception as e:
+                logger.error(f"Ошибка при остановке бота {bot.bot_id}: {e}")
+
+def run_bots(tokens):
+    """
+    Запускает несколько ботов в одном процессе с общими парсерами и кэшами данных
+
+    Состояние пользователей у каждого бота свое: к имени файла STATE_DB_PATH добавляется ID бота.
+
+    Args:
+        tokens: Список токенов ботов
+    """
+    shared = SharedResources()
+    root, ext = os.path.splitext(os.getenv('STATE_DB_PATH', 'cache/bot_state.sqlite'))
+    bots = []
+    for token in tokens:
+        bot_id = token.split(':')[0]
+        persistence = SQLitePersistence(f"{root}_{bot_id}{ext}")
+        bots.append(ModelsTelegramBot(token, persistence=persistence, shared=shared))
+    asyncio.run(serve_bots(bots))
+
 if __name__ == '__main__':
     # Токен бота берется из переменной окружения TELEGRAM_BOT_TOKEN
     import os
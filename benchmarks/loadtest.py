@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нагрузочный тест обработчиков ModelsTelegramBot
+
+Бот работает против локальной заглушки Telegram Bot API и локальной копии armodels.ru,
+которая отдает сохраненные HTML-страницы из корня репозитория. Виртуальные пользователи
+отправляют синтетические Update (команды и нажатия кнопок, найденных в ответах бота)
+и для каждого сценария выводятся пропускная способность, задержки p50/p99 и прирост памяти.
+
+Пример:
+    python benchmarks/loadtest.py --users 50 --iterations 3 --scenario paging --scenario photos
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from requests.adapters import HTTPAdapter
+
+# HTML-страницы, которыми отвечает локальная копия сайта
+FIXTURES = {
+    '/': 'main_page.html',
+    '/public/models': 'page.html',
+    '/projects': 'projects_page.html',
+}
+DETAIL_FIXTURE = 'model_page.html'
+
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'LoadTest', 'username': 'loadtest_bot'}
+
+def cmd(text):
+    """Шаг сценария: пользователь отправляет команду"""
+    return ('command', text)
+
+def click(text=None, row=None):
+    """Шаг сценария: пользователь нажимает кнопку по части текста или по номеру строки клавиатуры"""
+    return ('click', (text, row))
+
+SCENARIOS = {
+    'start': [cmd('/start')],
+    'models': [cmd('/models')],
+    'paging': [cmd('/models'), click('Вперед'), click('Вперед'), click('Назад')],
+    'filters': [cmd('/models'), click('Девушки'), click('Юноши'), click('2 курс')],
+    'model_detail': [cmd('/models'), click('👤'), click('Назад к списку моделей')],
+    'photos': [cmd('/models'), click('👤'), click('Следующая'), click('Следующая'), click('Предыдущая')],
+    'album': [cmd('/models'), click('👤'), click('альбомом'), click('Назад к списку моделей')],
+    'projects': [cmd('/projects'), click('Все проекты'), click(row=0), click('К списку проектов')],
+    'project_pages': [cmd('/projects'), click('Все проекты'), click('Вперед'), click(row=0), click('К списку проектов')],
+}
+
+class FixtureServer(ThreadingHTTPServer):
+    """Локальная копия armodels.ru из сохраненных HTML-страниц"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.pages = {}
+        for path, filename in list(FIXTURES.items()) + [(None, DETAIL_FIXTURE)]:
+            with open(os.path.join(ROOT_DIR, filename), 'rb') as f:
+                self.pages[path] = f.read()
+        self.requests_count = 0
+        super().__init__(('127.0.0.1', 0), FixtureHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests_count += 1
+        path = urlparse(self.path).path.rstrip('/') or '/'
+        body = self.server.pages.get(path, self.server.pages[None])
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        # Проверка ссылок на фото: изображения из /storage считаются существующими
+        self.server.requests_count += 1
+        if urlparse(self.path).path.startswith('/storage/'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', '150000')
+        else:
+            self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+class OriginRewriteAdapter(HTTPAdapter):
+    """Транспорт requests, перенаправляющий запросы к armodels.ru на локальную копию"""
+
+    def __init__(self, origin, target):
+        super().__init__()
+        self.origin = origin
+        self.target = target
+
+    def send(self, request, **kwargs):
+        request.url = self.target + request.url[len(self.origin):]
+        return super().send(request, **kwargs)
+
+class FakeTelegramServer(ThreadingHTTPServer):
+    """Заглушка Telegram Bot API: отвечает успешно и запоминает клавиатуры отправленных сообщений"""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.next_message_id = 1
+        self.messages = {}  # chat_id -> {message_id: reply_markup}
+        self.photo_messages = set()  # (chat_id, message_id) сообщений с фото
+        self.calls = {}
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/bot"
+
+    def new_message_id(self):
+        with self.lock:
+            message_id = self.next_message_id
+            self.next_message_id += 1
+            return message_id
+
+    def find_button(self, chat_id, text=None, row=None):
+        """Ищет кнопку в самом новом сообщении чата, где она есть"""
+        with self.lock:
+            messages = sorted(self.messages.get(chat_id, {}).items(), reverse=True)
+        for message_id, markup in messages:
+            rows = (markup or {}).get('inline_keyboard', [])
+            if row is not None:
+                if len(rows) > row and rows[row][0].get('callback_data'):
+                    return message_id, rows[row][0]['callback_data']
+                continue
+            for buttons in rows:
+                for button in buttons:
+                    if text in button['text'] and button.get('callback_data'):
+                        return message_id, button['callback_data']
+        return None, None
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        server = self.server
+        method = self.path.rsplit('/', 1)[-1]
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+
+        if self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            params = {key: values[0] for key, values in parse_qs(body.decode('utf-8')).items()}
+        else:
+            params = {}
+
+        with server.lock:
+            server.calls[method] = server.calls.get(method, 0) + 1
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        result = self.build_result(method, params)
+        payload = json.dumps({'ok': True, 'result': result}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def build_result(self, method, params):
+        server = self.server
+        if method == 'getMe':
+            return BOT_USER
+        if method in ('deleteMessage', 'deleteMessages', 'answerCallbackQuery', 'sendChatAction'):
+            if method == 'deleteMessage':
+                with server.lock:
+                    server.messages.get(int(params['chat_id']), {}).pop(int(params['message_id']), None)
+            return True
+
+        chat_id = int(params.get('chat_id', 0))
+        markup = json.loads(params['reply_markup']) if params.get('reply_markup') else None
+
+        if method == 'sendMediaGroup':
+            media = json.loads(params.get('media', '[]'))
+            return [self.message(chat_id, server.new_message_id(), photo=True) for _ in media]
+
+        if method.startswith('edit'):
+            message_id = int(params.get('message_id', 0))
+        else:
+            message_id = server.new_message_id()
+
+        photo = method in ('sendPhoto', 'editMessageMedia') or (
+            method == 'editMessageCaption' and (chat_id, message_id) in server.photo_messages)
+        with server.lock:
+            server.messages.setdefault(chat_id, {})[message_id] = markup
+            if photo:
+                server.photo_messages.add((chat_id, message_id))
+            else:
+                server.photo_messages.discard((chat_id, message_id))
+
+        return self.message(chat_id, message_id, photo=photo, document=method == 'sendDocument')
+
+    @staticmethod
+    def message(chat_id, message_id, photo=False, document=False):
+        message = {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+        }
+        if photo:
+            message['photo'] = [{'file_id': f'photo-{message_id}', 'file_unique_id': f'p{message_id}',
+                                 'width': 800, 'height': 1200}]
+        if document:
+            message['document'] = {'file_id': f'doc-{message_id}', 'file_unique_id': f'd{message_id}'}
+        return message
+
+    def log_message(self, format, *args):
+        pass
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+class LoadTest:
+    """Прогон сценариев виртуальными пользователями"""
+
+    def __init__(self, bot, telegram: FakeTelegramServer):
+        self.bot = bot
+        self.telegram = telegram
+        self.update_id = 0
+        self.next_chat_id = 100000
+        self.errors = 0
+        bot.application.add_error_handler(self._on_error)
+
+    async def _on_error(self, update, context):
+        self.errors += 1
+        logging.getLogger(__name__).debug(f"Ошибка обработчика: {context.error}")
+
+    def _next_update_id(self):
+        self.update_id += 1
+        return self.update_id
+
+    def _build_update(self, chat_id, step):
+        from telegram import Update
+
+        user = {'id': chat_id, 'is_bot': False, 'first_name': f'User{chat_id}'}
+        kind, value = step
+        if kind == 'command':
+            data = {
+                'update_id': self._next_update_id(),
+                'message': {
+                    'message_id': self.telegram.new_message_id(),
+                    'date': int(time.time()),
+                    'chat': {'id': chat_id, 'type': 'private'},
+                    'from': user,
+                    'text': value,
+                    'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(value)}],
+                },
+            }
+        else:
+            text, row = value
+            message_id, callback_data = self.telegram.find_button(chat_id, text=text, row=row)
+            if callback_data is None:
+                return None
+            # Сообщение с кнопкой передается того же типа, что было отправлено: фото или текст
+            message = FakeTelegramHandler.message(
+                chat_id, message_id, photo=(chat_id, message_id) in self.telegram.photo_messages
+            )
+            if 'photo' not in message:
+                message['text'] = '.'
+            data = {
+                'update_id': self._next_update_id(),
+                'callback_query': {
+                    'id': str(self.update_id),
+                    'from': user,
+                    'chat_instance': str(chat_id),
+                    'data': callback_data,
+                    'message': message,
+                },
+            }
+        return Update.de_json(data, self.bot.application.bot)
+
+    async def _run_user(self, chat_id, steps, iterations, latencies):
+        missing = 0
+        for _ in range(iterations):
+            for step in steps:
+                update = self._build_update(chat_id, step)
+                if update is None:
+                    missing += 1
+                    continue
+                started = time.perf_counter()
+                # Как при получении обновлений от Telegram: через обработчик очереди обновлений приложения
+                application = self.bot.application
+                await application.update_processor.process_update(update, application.process_update(update))
+                latencies.append(time.perf_counter() - started)
+        return missing
+
+    async def run_scenario(self, name, users, iterations, origin):
+        steps = SCENARIOS[name]
+        latencies = []
+        errors_before = self.errors
+        origin_before = origin.requests_count
+        with self.telegram.lock:
+            api_before = sum(self.telegram.calls.values())
+
+        gc.collect()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+
+        # Каждый виртуальный пользователь - отдельный чат, чтобы сценарии не мешали друг другу
+        base_chat = self.next_chat_id
+        self.next_chat_id += users
+        missing = await asyncio.gather(*(
+            self._run_user(base_chat + i, steps, iterations, latencies) for i in range(users)
+        ))
+
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        memory_after = tracemalloc.get_traced_memory()[0]
+        with self.telegram.lock:
+            api_calls = sum(self.telegram.calls.values()) - api_before
+
+        return {
+            'scenario': name,
+            'updates': len(latencies),
+            'errors': self.errors - errors_before,
+            'missing_buttons': sum(missing),
+            'throughput': len(latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'memory_growth_kb': (memory_after - memory_before) / 1024,
+            'api_calls': api_calls,
+            'origin_requests': origin.requests_count - origin_before,
+        }
+
+def print_report(results):
+    header = f"{'сценарий':<14}{'updates':>8}{'ошибки':>8}{'upd/s':>10}{'p50 мс':>10}{'p99 мс':>10}{'память КБ':>12}{'API':>8}{'сайт':>7}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['scenario']:<14}{r['updates']:>8}{r['errors'] + r['missing_buttons']:>8}{r['throughput']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['memory_growth_kb']:>12.1f}{r['api_calls']:>8}{r['origin_requests']:>7}")
+    print(f"\nПиковый RSS процесса: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} МБ")
+
+async def main(args):
+    from armodels_bot import ModelsTelegramBot
+    from parsers.base_parser import BaseParser
+    from services.persistence import SQLitePersistence
+
+    # Логи обработчиков на каждый запрос искажают замеры
+    logging.getLogger().setLevel(logging.WARNING)
+
+    origin = FixtureServer()
+    telegram = FakeTelegramServer(latency=args.api_latency / 1000)
+    for server in (origin, telegram):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    state_dir = tempfile.mkdtemp(prefix='armodels-loadtest-')
+    os.environ.setdefault('PDF_CACHE_DIR', os.path.join(state_dir, 'pdf'))
+    os.environ.setdefault('HTTP_CACHE_DIR', os.path.join(state_dir, 'http'))
+    os.environ.setdefault('PARSE_MEMO_DIR', os.path.join(state_dir, 'parsed'))
+    bot = ModelsTelegramBot(
+        '123456:LOADTEST',
+        persistence=SQLitePersistence(os.path.join(state_dir, 'state.sqlite')),
+        base_url=telegram.url
+    )
+
+    # Все парсеры ходят на локальную копию сайта вместо armodels.ru
+    adapter = OriginRewriteAdapter(BaseParser.BASE_URL, origin.url)
+    for parser in (bot.models_parser, bot.teachers_parser, bot.partners_parser,
+                   bot.magazines_parser, bot.projects_parser):
+        parser.session.mount(BaseParser.BASE_URL, adapter)
+
+    await bot.application.initialize()
+    test = LoadTest(bot, telegram)
+
+    names = args.scenario or list(SCENARIOS)
+    if not args.cold:
+        # Прогрев кэшей одним пользователем, чтобы измерять установившийся режим
+        for name in names:
+            await test.run_scenario(name, users=1, iterations=1, origin=origin)
+
+    tracemalloc.start()
+    results = [await test.run_scenario(name, args.users, args.iterations, origin) for name in names]
+    tracemalloc.stop()
+
+    await bot.application.persistence.flush()
+    await bot.application.shutdown()
+    origin.shutdown()
+    telegram.shutdown()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Нагрузочный тест обработчиков ARModels Telegram Bot')
+    parser.add_argument('--users', type=int, default=20, help='Количество одновременных пользователей')
+    parser.add_argument('--iterations', type=int, default=3, help='Повторов сценария на пользователя')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Сценарий (можно указать несколько раз, по умолчанию все)')
+    parser.add_argument('--api-latency', type=float, default=0.0, help='Задержка ответа заглушки Bot API, мс')
+    parser.add_argument('--cold', action='store_true', help='Не прогревать кэши перед замерами')
+    parser.add_argument('--json', help='Сохранить результаты в JSON-файл')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
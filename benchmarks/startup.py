@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Замер времени запуска ARModels Telegram Bot
+
+Каждый прогон выполняется в отдельном процессе Python с -X importtime: измеряются
+время запуска интерпретатора, импорта armodels_bot и создания ModelsTelegramBot
+(без обращения к Telegram и сайту). Выводятся медианы по прогонам, самые долгие
+импорты и тяжелые модули, которые оказались загружены при старте, хотя должны
+загружаться только при первом обращении к сайту.
+
+Пример:
+    python benchmarks/startup.py --runs 10 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые не должны импортироваться до первого запроса к сайту
+LAZY_MODULES = (
+    'bs4',
+    'requests',
+    'parsers.base_parser',
+    'parsers.models_parser',
+    'parsers.teachers_parser',
+    'parsers.partners_parser',
+    'parsers.magazines_parser',
+    'parsers.projects_parser',
+)
+
+# Код, выполняемый в отдельном процессе; результаты печатаются в stdout одной строкой JSON
+CHILD_CODE = r'''
+import json, os, shutil, sys, tempfile, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import armodels_bot
+imported = time.perf_counter()
+
+from services.persistence import SQLitePersistence
+state_dir = tempfile.mkdtemp(prefix='armodels-startup-')
+os.environ.setdefault('PDF_CACHE_DIR', os.path.join(state_dir, 'pdf'))
+os.environ.setdefault('HTTP_CACHE_DIR', os.path.join(state_dir, 'http'))
+os.environ.setdefault('PARSE_MEMO_DIR', os.path.join(state_dir, 'parsed'))
+bot = armodels_bot.ModelsTelegramBot(
+    '123456:STARTUP',
+    persistence=SQLitePersistence(os.path.join(state_dir, 'state.sqlite'))
+)
+built = time.perf_counter()
+shutil.rmtree(state_dir, ignore_errors=True)
+
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'init_ms': (built - imported) * 1000,
+    'loaded': [name for name in {lazy!r} if name in sys.modules],
+}}))
+'''
+
+def parse_importtime(stderr):
+    """
+    Разбирает вывод -X importtime
+
+    Returns:
+        Словарь {модуль: (собственное время мкс, накопленное время мкс, глубина вложенности)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:       918 |     248238 |   telegram": после '|' один пробел и по два на уровень вложенности
+        head, cumulative_us, name = line.split('|', 2)
+        self_us = head.split(':', 1)[1]
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+def run_once():
+    """Запускает один замер в новом процессе"""
+    code = CHILD_CODE.format(root=ROOT_DIR, lazy=LAZY_MODULES)
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, cwd=ROOT_DIR
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Замер завершился с ошибкой:\n{result.stderr[-2000:]}")
+
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    stats['process_ms'] = total_ms
+    stats['imports'] = parse_importtime(result.stderr)
+    return stats
+
+def print_report(runs, top, depth):
+    metrics = (
+        ('импорт armodels_bot', 'import_ms'),
+        ('создание бота', 'init_ms'),
+        ('процесс целиком', 'process_ms'),
+    )
+    header = f"{'этап':<22}{'медиана мс':>12}{'мин мс':>10}{'макс мс':>10}"
+    print(header)
+    print('-' * len(header))
+    for title, key in metrics:
+        values = [run[key] for run in runs]
+        print(f"{title:<22}{statistics.median(values):>12.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+    # Медиана накопленного времени каждого модуля по всем прогонам
+    cumulative = {}
+    for run in runs:
+        for name, (_, cumulative_us, module_depth) in run['imports'].items():
+            if module_depth <= depth:
+                cumulative.setdefault(name, []).append(cumulative_us)
+    slowest = sorted(cumulative.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:top]
+
+    print(f"\nСамые долгие импорты (глубина вложенности до {depth}):")
+    for name, values in slowest:
+        print(f"  {statistics.median(values) / 1000:>8.1f} мс  {name}")
+
+    loaded = sorted({name for run in runs for name in run['loaded']})
+    print(f"\nОтложенные модули, загруженные при старте: {', '.join(loaded) if loaded else 'нет'}")
+
+def main(args):
+    runs = [run_once() for _ in range(args.runs)]
+    print_report(runs, args.top, args.depth)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([{key: value for key, value in run.items() if key != 'imports'} for run in runs],
+                      f, ensure_ascii=False, indent=2)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Замер времени запуска ARModels Telegram Bot')
+    parser.add_argument('--runs', type=int, default=5, help='Количество прогонов в отдельных процессах')
+    parser.add_argument('--top', type=int, default=10, help='Сколько самых долгих импортов показать')
+    parser.add_argument('--depth', type=int, default=1, help='Максимальная глубина вложенности импортов в отчете')
+    parser.add_argument('--json', help='Сохранить результаты прогонов в JSON-файл')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    main(parse_args())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Замер транспорта запросов к сайту за один цикл обновления данных
+
+Локальная копия armodels.ru отдает сохраненные HTML-страницы (сжатые gzip, если клиент
+его запрашивает) и считает байты, переданные по сети, и новые соединения. Цикл обновления -
+списки всех разделов и карточки нескольких моделей - выполняется в трех вариантах:
+отдельная сессия у каждого парсера (как было раньше), общая сессия без сжатия и общий
+транспорт (одна сессия, сжатие, кэш DNS). HTTP-кэш и кэш разбора отключены.
+
+Пример:
+    python benchmarks/transport.py --details 20 --connect-latency 50
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+# Каждый запрос должен дойти до сайта
+os.environ['HTTP_CACHE_MAX_MB'] = '0'
+os.environ['PARSE_MEMO_MAX_MB'] = '0'
+os.environ['ORIGIN_HEDGING'] = '0'
+
+import requests
+
+from parsers.base_parser import BaseParser
+from parsers.http_session import USER_AGENT, create_session, dns_cache, transport_stats
+from parsers.magazines_parser import MagazinesParser
+from parsers.models_parser import ModelsParser
+from parsers.partners_parser import PartnersParser
+from parsers.projects_parser import ProjectsParser
+from parsers.teachers_parser import TeachersParser
+
+FIXTURES = {
+    '/': 'main_page.html',
+    '/public/models': 'page.html',
+    '/projects': 'projects_page.html',
+}
+DETAIL_FIXTURE = 'model_page.html'
+
+PARSERS = (ModelsParser, TeachersParser, PartnersParser, MagazinesParser, ProjectsParser)
+
+class CountingOrigin(ThreadingHTTPServer):
+    """Локальная копия сайта, считающая новые соединения и байты ответов"""
+
+    daemon_threads = True
+
+    def __init__(self, connect_latency: float):
+        self.pages = {}
+        for path, filename in list(FIXTURES.items()) + [(None, DETAIL_FIXTURE)]:
+            with open(os.path.join(ROOT_DIR, filename), 'rb') as f:
+                body = f.read()
+            self.pages[path] = (body, gzip.compress(body, 6))
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.bytes_sent = 0
+        self.requests_count = 0
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), CountingHandler)
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.server_address[1]}"
+
+    def reset(self):
+        with self.lock:
+            self.connections = self.bytes_sent = self.requests_count = 0
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        # Установка соединения (TCP + TLS) с удаленным сайтом
+        time.sleep(self.server.connect_latency)
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/') or '/'
+        plain, compressed = self.server.pages.get(path, self.server.pages[None])
+        use_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        body = compressed if use_gzip else plain
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.requests_count += 1
+            # Тело ответа и приблизительный размер строки статуса и заголовков
+            self.server.bytes_sent += len(body) + 150
+
+    def log_message(self, format, *args):
+        pass
+
+def separate_sessions():
+    """Как раньше: у каждого парсера своя сессия и свой пул соединений"""
+    sessions = []
+    for _ in PARSERS:
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        sessions.append(session)
+    return sessions
+
+def shared_session(compression: bool):
+    session = create_session()
+    if not compression:
+        session.headers['Accept-Encoding'] = 'identity'
+    return [session] * len(PARSERS)
+
+def refresh_cycle(sessions, details: int) -> int:
+    """Один цикл обновления: списки всех разделов и карточки первых моделей"""
+    parsers = [cls(session=session) for cls, session in zip(PARSERS, sessions)]
+    models = parsers[0].parse_list()
+    for parser in parsers[1:]:
+        parser.parse_list()
+    for model in models[:details]:
+        # Ссылки на портфолио на странице абсолютные - ведем их на локальную копию
+        parsers[0].parse_detail(BaseParser.BASE_URL + urlparse(model['url']).path)
+    return len(models)
+
+def run(args):
+    origin = CountingOrigin(args.connect_latency / 1000)
+    threading.Thread(target=origin.serve_forever, daemon=True).start()
+    BaseParser.BASE_URL = origin.url
+
+    variants = (
+        ('отдельные сессии', separate_sessions),
+        ('общая без сжатия', lambda: shared_session(compression=False)),
+        ('общий транспорт', lambda: shared_session(compression=True)),
+    )
+    results = []
+    for name, make_sessions in variants:
+        sessions = make_sessions()
+        origin.reset()
+        # Адрес сайта хранится в кэше DNS меньше интервала обновления, поэтому каждый цикл начинается без него
+        dns_cache.clear()
+        stats_before = transport_stats.snapshot()
+        started = time.perf_counter()
+        models = refresh_cycle(sessions, args.details)
+        elapsed = time.perf_counter() - started
+        stats_after = transport_stats.snapshot()
+        for session in set(sessions):
+            session.close()
+
+        dns_lookups = stats_after['dns_lookups'] - stats_before['dns_lookups']
+        results.append({
+            'variant': name,
+            'requests': origin.requests_count,
+            'bytes': origin.bytes_sent,
+            'connections': origin.connections,
+            # Без кэша DNS адрес хоста запрашивается при каждом новом соединении
+            'dns_lookups': dns_lookups if name != 'отдельные сессии' else origin.connections,
+            'seconds': elapsed,
+            'models': models,
+        })
+    origin.shutdown()
+    return results
+
+def print_report(results):
+    header = f"{'вариант':<18} {'запросы':>8} {'КБ по сети':>11} {'соединения':>11} {'DNS':>5} {'время, с':>9}"
+    print(header)
+    print('-' * len(header))
+    for row in results:
+        print(f"{row['variant']:<18} {row['requests']:>8} {row['bytes'] / 1024:>11.0f} "
+              f"{row['connections']:>11} {row['dns_lookups']:>5} {row['seconds']:>9.2f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Замер транспорта запросов к сайту за цикл обновления')
+    parser.add_argument('--details', type=int, default=10, help='Сколько карточек моделей загружать за цикл')
+    parser.add_argument('--connect-latency', type=float, default=30.0,
+                        help='Задержка установки соединения на стороне сайта, мс')
+    parser.add_argument('--json', help='Сохранить результаты в JSON-файл')
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    results = run(args)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Выгрузка данных armodels.ru в JSONL или CSV
+
+Списки разделов и карточки моделей загружаются параллельно пулом потоков через общий
+транспорт парсеров (пул соединений, HTTP-кэш, повторы запросов). Записи пишутся по мере
+готовности, в stderr выводится ход выгрузки и итоговая статистика по наборам данных.
+С --fixtures страницы читаются из сохраненных HTML-файлов, без обращения к сайту.
+
+Примеры:
+    python export.py                                        # все списки в JSONL на stdout
+    python export.py models --details --workers 16 -o models.jsonl
+    python export.py teachers partners --format csv --output-dir export
+    python export.py all --details --fixtures               # по страницам из корня репозитория
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT_DIR)
+
+logger = logging.getLogger(__name__)
+
+DATASETS = ('models', 'teachers', 'partners', 'magazines', 'projects')
+
+# Колонки CSV; вложенные значения (параметры и фото моделей) записываются как JSON
+COLUMNS = {
+    'models': ['idx', 'name', 'url', 'course', 'gender', 'course_type', 'photo'],
+    'teachers': ['idx', 'name', 'specialty', 'photo'],
+    'partners': ['idx', 'name', 'logo', 'website'],
+    'magazines': ['idx', 'issue_number', 'release_date', 'title', 'cover_image', 'pdf_url'],
+    'projects': ['idx', 'title', 'description', 'category', 'category_name', 'image_url', 'detail_url'],
+}
+DETAIL_COLUMNS = ['parameters', 'photos']
+
+def create_parser(name: str, session=None):
+    """Парсер набора данных"""
+    if name == 'models':
+        from parsers.models_parser import ModelsParser
+        return ModelsParser(session=session)
+    if name == 'teachers':
+        from parsers.teachers_parser import TeachersParser
+        return TeachersParser(session=session)
+    if name == 'partners':
+        from parsers.partners_parser import PartnersParser
+        return PartnersParser(session=session)
+    if name == 'magazines':
+        from parsers.magazines_parser import MagazinesParser
+        return MagazinesParser(session=session)
+    from parsers.projects_parser import ProjectsParser
+    return ProjectsParser(session=session)
+
+class DatasetStats:
+    """Ход выгрузки одного набора данных"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.total = None  # Неизвестно, пока не загружен список
+        self.written = 0
+        self.errors = 0
+        self.pages = 0
+        self.seconds = None
+
+    @property
+    def finished(self) -> bool:
+        return self.seconds is not None
+
+class ExportOutput:
+    """
+    Запись выгружаемых данных
+
+    Все наборы пишутся в один поток (stdout или файл; в JSONL у записи есть поле dataset)
+    или каждый в свой файл <набор>.<формат> в каталоге output_dir.
+    """
+
+    def __init__(self, fmt: str = 'jsonl', output: str = '-', output_dir: Optional[str] = None,
+                 details: bool = False):
+        """
+        Args:
+            fmt: Формат: jsonl или csv
+            output: Файл для всех наборов ('-' - stdout), если не задан output_dir
+            output_dir: Каталог для отдельных файлов наборов
+            details: В записях моделей есть параметры и фото
+        """
+        self.fmt = fmt
+        self.output = output
+        self.output_dir = output_dir
+        self.details = details
+        self._files = {}
+        self._writers = {}
+
+    def _stream(self, dataset: str):
+        key = dataset if self.output_dir else None
+        if key not in self._files:
+            if self.output_dir:
+                os.makedirs(self.output_dir, exist_ok=True)
+                path = os.path.join(self.output_dir, f"{dataset}.{self.fmt}")
+                self._files[key] = open(path, 'w', encoding='utf-8', newline='')
+            elif self.output == '-':
+                self._files[key] = sys.stdout
+            else:
+                self._files[key] = open(self.output, 'w', encoding='utf-8', newline='')
+        return self._files[key]
+
+    def write(self, dataset: str, record: Dict):
+        stream = self._stream(dataset)
+        if self.fmt == 'jsonl':
+            if not self.output_dir:
+                record = {'dataset': dataset, **record}
+            stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            return
+
+        writer = self._writers.get(dataset)
+        if writer is None:
+            columns = COLUMNS[dataset] + (DETAIL_COLUMNS if dataset == 'models' and self.details else [])
+            writer = self._writers[dataset] = csv.DictWriter(stream, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow({key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                         for key, value in record.items()})
+
+    def flush(self):
+        for stream in self._files.values():
+            stream.flush()
+
+    def close(self):
+        for stream in self._files.values():
+            if stream is sys.stdout:
+                stream.flush()
+            else:
+                stream.close()
+        self._files.clear()
+
+class Progress:
+    """Строка хода выгрузки в stderr (обновляется не чаще interval секунд)"""
+
+    def __init__(self, enabled: bool = True, interval: float = 0.2, stream=sys.stderr):
+        self.enabled = enabled
+        self.interval = interval
+        self.stream = stream
+        self._shown_at = 0.0
+        self._interactive = stream.isatty()
+
+    def update(self, stats: Dict[str, DatasetStats], started: float, force: bool = False):
+        now = time.perf_counter()
+        if not self.enabled or (not force and now - self._shown_at < self.interval):
+            return
+        # В файл или канал строки пишутся раз в секунду, чтобы не раздувать лог
+        if not self._interactive and not force and now - self._shown_at < 1.0:
+            return
+        self._shown_at = now
+
+        parts = []
+        for item in stats.values():
+            total = '?' if item.total is None else item.total
+            mark = ' ✓' if item.finished else ''
+            parts.append(f"{item.name} {item.written}/{total}{mark}")
+        pages = sum(item.pages for item in stats.values())
+        elapsed = now - started
+        line = f"{' | '.join(parts)} | {pages} стр. за {elapsed:.1f} с"
+        if self._interactive:
+            self.stream.write(f"\r{line}\033[K")
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+    def close(self):
+        if self.enabled and self._interactive:
+            self.stream.write('\n')
+
+class Exporter:
+    """
+    Параллельная выгрузка наборов данных
+
+    Списки всех наборов запрашиваются одновременно; после загрузки списка моделей
+    (с details) в тот же пул ставятся карточки всех моделей. Записи передаются в output
+    из основного потока по мере готовности, поэтому запись не требует блокировок.
+    """
+
+    def __init__(self, output: ExportOutput, workers: int = 8, details: bool = False,
+                 session=None, progress: Optional[Progress] = None):
+        """
+        Args:
+            output: Куда писать записи
+            workers: Сколько страниц загружается и разбирается одновременно
+            details: Выгружать параметры и фото каждой модели
+            session: HTTP-сессия парсеров (по умолчанию общая)
+            progress: Вывод хода выгрузки
+        """
+        self.output = output
+        self.workers = workers
+        self.details = details
+        self.session = session
+        self.progress = progress or Progress(enabled=False)
+        self.parsers = {}
+
+    def run(self, datasets: List[str]) -> Dict[str, DatasetStats]:
+        """Выгружает наборы данных и возвращает статистику по каждому"""
+        stats = {name: DatasetStats(name) for name in datasets}
+        self.parsers = {name: create_parser(name, self.session) for name in datasets}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='export') as pool:
+            pending = {pool.submit(self._load_list, name): (name, None) for name in datasets}
+            while pending:
+                done, _ = wait(pending, timeout=self.progress.interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, model = pending.pop(future)
+                    item = stats[name]
+                    item.pages += 1
+                    if model is None:
+                        records = future.result()
+                        if records is None:
+                            item.errors += 1
+                            records = []
+                        item.total = len(records)
+                        if name == 'models' and self.details:
+                            for idx, record in enumerate(records):
+                                task = pool.submit(self.parsers['models'].parse_detail, record['url'])
+                                pending[task] = (name, {'idx': idx, **record})
+                        else:
+                            for idx, record in enumerate(records):
+                                self._write(item, {'idx': idx, **record})
+                    else:
+                        self._write_model(item, model, future.result())
+
+                    if item.total is not None and item.written + item.errors >= item.total:
+                        item.seconds = time.perf_counter() - started
+                self.progress.update(stats, started)
+                self.output.flush()
+
+        for item in stats.values():
+            if item.seconds is None:
+                item.seconds = time.perf_counter() - started
+        self.progress.update(stats, started, force=True)
+        self.progress.close()
+        return stats
+
+    def _load_list(self, name: str) -> Optional[List[Dict]]:
+        """Загружает список набора (None - при ошибке или пустом списке)"""
+        try:
+            records = self.parsers[name].parse_list()
+        except Exception as e:
+            logger.error(f"Не удалось выгрузить {name}: {e}")
+            return None
+        # Парсеры перехватывают ошибки загрузки сами и возвращают пустой список
+        if not records:
+            logger.error(f"Не удалось выгрузить {name}: список пуст")
+            return None
+        return records
+
+    def _write(self, item: DatasetStats, record: Dict):
+        self.output.write(item.name, record)
+        item.written += 1
+
+    def _write_model(self, item: DatasetStats, model: Dict, detail: Optional[Dict]):
+        """Дополняет запись модели параметрами и фото; модель без карточки пишется без них и учитывается как ошибка"""
+        if detail is None:
+            item.errors += 1
+            model.update(parameters=None, photos=None)
+        else:
+            model.update(parameters=detail.get('parameters', {}), photos=detail.get('photos', []))
+        self.output.write(item.name, model)
+        item.written += 1
+
+def print_report(stats: Dict[str, DatasetStats], elapsed: float, stream=sys.stderr):
+    header = f"{'набор':<10} {'записей':>8} {'ошибок':>7} {'страниц':>8} {'время, с':>9}"
+    print(header, file=stream)
+    print('-' * len(header), file=stream)
+    for item in stats.values():
+        print(f"{item.name:<10} {item.written:>8} {item.errors:>7} {item.pages:>8} {item.seconds:>9.2f}", file=stream)
+    records = sum(item.written for item in stats.values())
+    pages = sum(item.pages for item in stats.values())
+    rate = pages / elapsed if elapsed else 0.0
+    print(f"Всего: {records} записей, {pages} страниц за {elapsed:.2f} с ({rate:.1f} стр/с)", file=stream)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Выгрузка данных armodels.ru в JSONL или CSV')
+    parser.add_argument('datasets', nargs='*', metavar='набор',
+                        help=f"Наборы данных: {', '.join(DATASETS)} или all (по умолчанию все)")
+    parser.add_argument('--details', action='store_true', help='Загрузить параметры и фото каждой модели')
+    parser.add_argument('--workers', type=int, default=8, help='Сколько страниц загружать одновременно')
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help='Формат записей')
+    parser.add_argument('-o', '--output', default='-', help='Файл для всех наборов (по умолчанию stdout)')
+    parser.add_argument('--output-dir', help='Каталог для отдельного файла каждого набора')
+    parser.add_argument('--fixtures', nargs='?', const=ROOT_DIR, metavar='каталог',
+                        help='Читать сохраненные HTML-страницы вместо сайта (по умолчанию из корня репозитория)')
+    parser.add_argument('--no-progress', action='store_true', help='Не выводить ход выгрузки')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Подробный лог парсеров')
+    args = parser.parse_args(argv)
+
+    if not args.datasets or 'all' in args.datasets:
+        args.datasets = list(DATASETS)
+    unknown = [name for name in args.datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"неизвестные наборы данных: {', '.join(unknown)}")
+    args.datasets = list(dict.fromkeys(args.datasets))
+    if args.format == 'csv' and not args.output_dir and len(args.datasets) > 1:
+        parser.error('в CSV несколько наборов выгружаются только с --output-dir')
+    if args.workers < 1:
+        parser.error('--workers должно быть не меньше 1')
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO if args.verbose else logging.WARNING,
+        stream=sys.stderr
+    )
+
+    session = None
+    if args.fixtures:
+        # Ответы сохраненных страниц не должны попасть в HTTP-кэш вместо настоящих
+        os.environ['HTTP_CACHE_MAX_MB'] = '0'
+        os.environ['ORIGIN_HEDGING'] = '0'
+        from parsers.fixtures import create_fixture_session
+        session = create_fixture_session(args.fixtures)
+
+    output = ExportOutput(args.format, args.output, args.output_dir, details=args.details)
+    exporter = Exporter(output, workers=args.workers, details=args.details, session=session,
+                        progress=Progress(enabled=not args.no_progress))
+    started = time.perf_counter()
+    try:
+        stats = exporter.run(args.datasets)
+    finally:
+        output.close()
+    print_report(stats, time.perf_counter() - started)
+    return 1 if any(item.errors for item in stats.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
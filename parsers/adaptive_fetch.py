@@ -0,0 +1,200 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+class LatencyTracker:
+    """
+    Наблюдаемые задержки ответов сайта по адресам
+
+    Адреса группируются по первому сегменту пути (/public, /projects, /models, ...):
+    страницы одного раздела отвечают примерно одинаково. Для каждого раздела хранятся
+    последние window замеров, по которым считаются перцентили.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Args:
+            window: Сколько последних замеров хранить для раздела
+            min_samples: Минимум замеров, после которого перцентили считаются достоверными
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint(url: str) -> str:
+        """Раздел сайта, к которому относится адрес"""
+        parts = urlsplit(url)
+        segment = parts.path.strip('/').split('/', 1)[0]
+        return f"{parts.netloc}/{segment}"
+
+    def record(self, endpoint: str, seconds: float):
+        """Сохраняет время ответа"""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        """
+        Перцентиль времени ответа раздела
+
+        Args:
+            endpoint: Раздел сайта
+            q: Перцентиль от 0 до 100
+
+        Returns:
+            Время в секундах или None, если замеров пока недостаточно
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+class AdaptiveFetcher:
+    """
+    GET-запросы к сайту с адаптивным таймаутом, повторами и дублированием медленных запросов
+
+    Таймаут раздела вычисляется по наблюдаемому p99 (с запасом, в пределах MIN_TIMEOUT..DEFAULT_TIMEOUT),
+    поэтому зависшее соединение обрывается через несколько секунд, а не через фиксированные 10.
+    Обрывы соединения, таймауты и ответы 502/503/504 повторяются с экспоненциальной задержкой.
+    Если включено дублирование, а ответ не пришел за p95 раздела, отправляется второй такой же
+    запрос, и используется тот ответ, что придет первым.
+    """
+
+    DEFAULT_TIMEOUT = 10.0
+    MIN_TIMEOUT = 2.0
+    # Таймаут - p99 раздела с этим множителем
+    TIMEOUT_FACTOR = 4
+    RETRIES = 2
+    BACKOFF = 0.5
+    RETRY_STATUSES = frozenset((502, 503, 504))
+
+    _executor = None
+    _executor_lock = threading.Lock()
+
+    def __init__(self, session: requests.Session, tracker: Optional[LatencyTracker] = None,
+                 retries: Optional[int] = None, hedge: Optional[bool] = None, backoff: float = BACKOFF):
+        """
+        Args:
+            session: HTTP-сессия
+            tracker: Статистика задержек (по умолчанию общая для всех парсеров)
+            retries: Количество повторов (по умолчанию ORIGIN_RETRIES или RETRIES)
+            hedge: Дублировать медленные запросы (по умолчанию ORIGIN_HEDGING, включено)
+            backoff: Задержка перед первым повтором в секундах, удваивается с каждым повтором
+        """
+        self.session = session
+        self.tracker = tracker or get_origin_latency()
+        self.retries = int(os.getenv('ORIGIN_RETRIES', str(self.RETRIES))) if retries is None else retries
+        self.hedge = os.getenv('ORIGIN_HEDGING', '1') != '0' if hedge is None else hedge
+        self.backoff = backoff
+
+    @classmethod
+    def _pool(cls) -> ThreadPoolExecutor:
+        """Общий пул потоков для дублирующих запросов"""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='origin-hedge')
+            return cls._executor
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Таймаут запроса к разделу по наблюдаемым задержкам"""
+        p99 = self.tracker.percentile(endpoint, 99)
+        if p99 is None:
+            return self.DEFAULT_TIMEOUT
+        return max(self.MIN_TIMEOUT, min(self.DEFAULT_TIMEOUT, p99 * self.TIMEOUT_FACTOR))
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+            stream: bool = False, breaker=None) -> requests.Response:
+        """
+        Выполняет GET-запрос
+
+        Args:
+            url: Адрес
+            headers: Дополнительные заголовки (например, условного запроса)
+            timeout: Таймаут в секундах (None - по наблюдаемым задержкам раздела)
+            stream: Не читать тело ответа сразу (потоковые ответы не дублируются)
+            breaker: Предохранитель: если он разомкнулся, повторы прекращаются
+
+        Returns:
+            Ответ сайта (последний, если все попытки получили 502/503/504)
+
+        Raises:
+            requests.RequestException: Если все попытки завершились ошибкой
+        """
+        endpoint = self.tracker.endpoint(url)
+        timeout = timeout or self.timeout_for(endpoint)
+        send = lambda: self._send(endpoint, url, headers, timeout, stream)
+
+        attempt = 0
+        while True:
+            try:
+                hedge_delay = self.tracker.percentile(endpoint, 95) if self.hedge and not stream else None
+                response = self._hedged(send, hedge_delay, url) if hedge_delay else send()
+                if response.status_code not in self.RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                error = f"ответ {response.status_code}"
+                response.close()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.retries:
+                    raise
+                error = e
+
+            if breaker and breaker.is_open:
+                raise requests.ConnectionError(f"Сайт недоступен, повтор запроса {url} отменен")
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            attempt += 1
+            logger.warning(f"Запрос {url} не удался ({error}), повтор {attempt}/{self.retries} через {delay:.1f} с")
+            time.sleep(delay)
+
+    def _send(self, endpoint: str, url: str, headers: Optional[Dict[str, str]], timeout: float,
+              stream: bool) -> requests.Response:
+        """Одна попытка запроса; время успешного ответа учитывается в статистике раздела"""
+        started = time.monotonic()
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=stream)
+        if response.status_code < 500:
+            self.tracker.record(endpoint, time.monotonic() - started)
+        return response
+
+    def _hedged(self, send: Callable[[], requests.Response], delay: float, url: str) -> requests.Response:
+        """Отправляет второй запрос, если первый не ответил за delay секунд, и возвращает первый успешный ответ"""
+        pool = self._pool()
+        primary = pool.submit(send)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        logger.debug(f"Запрос {url} не ответил за {delay:.2f} с, отправлен дублирующий запрос")
+        pending = {primary, pool.submit(send)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # Ответ проигравшего запроса не нужен - закрываем его, когда он придет
+                    for other in pending:
+                        other.add_done_callback(_close_response)
+                    return future.result()
+        return primary.result()
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result().close()
+
+_origin_latency = LatencyTracker()
+
+def get_origin_latency() -> LatencyTracker:
+    """Общая для всех парсеров статистика задержек armodels.ru"""
+    return _origin_latency
@@ -1,7 +1,16 @@
+import codecs
 import logging
 import requests
 from bs4 import BeautifulSoup
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterator, Optional
+from .adaptive_fetch import AdaptiveFetcher
+from .circuit_breaker import CircuitBreaker, get_origin_breaker
+from .http_cache import HttpCache, get_default_cache
+from .http_session import get_shared_session
+from .media import normalize_url
+from .parse_memo import ParseMemo, get_default_memo
+from .sections import PageSection
 
 logger = logging.getLogger(__name__)
 
@@ -9,21 +18,48 @@ class BaseParser(ABC):
     """Базовый класс для всех парсеров сайта armodels.ru"""
 
     BASE_URL = 'https://armodels.ru'
+    # Версия правил разбора: повышается при изменении извлечения данных, чтобы не использовать
+    # результаты, сохраненные в кэше разбора прежней версией парсера
+    PARSER_VERSION = 1
 
-    def __init__(self):
-        """Инициализация базового парсера с настройками сессии"""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, http_cache: Optional[HttpCache] = None, breaker: Optional[CircuitBreaker] = None,
+                 session: Optional[requests.Session] = None, parse_memo: Optional[ParseMemo] = None):
+        """
+        Инициализация базового парсера с настройками сессии
 
-    def get_page_content(self, url: str, timeout: int = 10) -> BeautifulSoup:
+        Args:
+            http_cache: Кэш HTTP-ответов (по умолчанию общий дисковый кэш из настроек окружения)
+            breaker: Предохранитель запросов к сайту (по умолчанию общий для всех парсеров)
+            session: HTTP-сессия (по умолчанию общая для всех парсеров, с одним пулом соединений)
+            parse_memo: Кэш результатов разбора (по умолчанию общий дисковый кэш из настроек окружения)
+        """
+        self.session = session or get_shared_session()
+        # Адаптивные таймауты, повторы и дублирование медленных запросов к сайту
+        self.fetcher = AdaptiveFetcher(self.session)
+        self.http_cache = http_cache or get_default_cache()
+        self.breaker = breaker or get_origin_breaker()
+        self.parse_memo = parse_memo or get_default_memo()
+
+    def absolute_url(self, url: str) -> str:
+        """Превращает относительный URL сайта в абсолютный"""
+        if not url.startswith('http'):
+            if url.startswith('/'):
+                url = self.BASE_URL + url
+            else:
+                url = self.BASE_URL + '/' + url
+        return url
+
+    def media_url(self, src: Optional[str]) -> Optional[str]:
+        """Возвращает абсолютную каноническую ссылку на изображение или файл со страницы (None для пустой)"""
+        return normalize_url(src, self.BASE_URL)
+
+    def get_page_content(self, url: str, timeout: Optional[float] = None) -> BeautifulSoup:
         """
         Получить содержимое страницы и вернуть BeautifulSoup объект
 
         Args:
             url: URL страницы для парсинга
-            timeout: Таймаут запроса в секундах
+            timeout: Таймаут запроса в секундах (None - по наблюдаемым задержкам сайта)
 
         Returns:
             BeautifulSoup объект страницы
@@ -31,22 +67,274 @@ class BaseParser(ABC):
         Raises:
             Exception: При ошибке загрузки страницы
         """
+        return BeautifulSoup(self.fetch_text(url, timeout), 'html.parser')
+
+    def get_section(self, url: str, section: PageSection, timeout: Optional[float] = None) -> BeautifulSoup:
+        """
+        Получить только нужный участок страницы
+
+        HTML элемента вырезается до построения дерева (если его удалось выделить по маркеру),
+        а остальная разметка пропускается построителем дерева.
+
+        Args:
+            url: URL страницы для парсинга
+            section: Участок страницы, который нужен парсеру
+            timeout: Таймаут запроса в секундах (None - по наблюдаемым задержкам сайта)
+
+        Returns:
+            BeautifulSoup объект, содержащий только элементы участка
+
+        Raises:
+            Exception: При ошибке загрузки страницы
+        """
+        return self._make_soup(self.fetch_text(url, timeout), section, url)
+
+    def parse_page(self, url: str, extract: Callable[[BeautifulSoup], Any], section: Optional[PageSection] = None,
+                   name: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Загрузить страницу и извлечь из нее данные, не разбирая повторно неизмененную страницу
+
+        Если текст страницы совпадает с уже разобранным этой же версией парсера,
+        результат берется из кэша разбора без построения дерева BeautifulSoup.
+
+        Args:
+            url: URL страницы для парсинга
+            extract: Функция извлечения данных из дерева страницы (результат должен сериализоваться в JSON)
+            section: Участок страницы, который нужен парсеру (None - вся страница)
+            name: Имя разбора для кэша (по умолчанию класс парсера и имя функции извлечения)
+            timeout: Таймаут запроса в секундах (None - по наблюдаемым задержкам сайта)
+
+        Returns:
+            Результат extract
+
+        Raises:
+            Exception: При ошибке загрузки или разбора страницы
+        """
+        html = self.fetch_text(url, timeout)
+        parse = lambda: extract(self._make_soup(html, section, url))
+        if self.parse_memo is None:
+            return parse()
+        name = name or f"{type(self).__name__}.{extract.__name__}"
+        return self.parse_memo.get_or_parse(name, self.PARSER_VERSION, html, parse)
+
+    @staticmethod
+    def _make_soup(html: str, section: Optional[PageSection], url: str) -> BeautifulSoup:
+        """Строит дерево страницы или только ее участка"""
+        if section is None:
+            return BeautifulSoup(html, 'html.parser')
+        fragment = section.cut(html)
+        if fragment is None and section.marker:
+            logger.debug(f"Участок {section.marker} не выделен на странице {url}, разбирается вся страница")
+        return BeautifulSoup(fragment or html, 'html.parser', parse_only=section.strainer())
+
+    def fetch_text(self, url: str, timeout: Optional[float] = None) -> str:
+        """
+        Получить HTML страницы с учетом HTTP-кэша
+
+        Свежий ответ берется из кэша без запроса к сайту, устаревший проверяется
+        условным запросом (ETag/Last-Modified). Сбои сети повторяются, медленные ответы
+        дублируются (см. AdaptiveFetcher). При ошибке сети или разомкнутом
+        предохранителе отдается устаревшая копия.
+
+        Args:
+            url: URL страницы
+            timeout: Таймаут запроса в секундах (None - по наблюдаемым задержкам сайта)
+
+        Returns:
+            Текст страницы
+
+        Raises:
+            Exception: При ошибке загрузки страницы
+        """
+        url = self.absolute_url(url)
+        cache = self.http_cache
+        entry = cache.lookup(url) if cache else None
+
+        if entry and (entry.is_fresh() or cache.offline):
+            return cache.read_body(entry).decode(entry.encoding, errors='replace')
+        if cache and cache.offline:
+            raise Exception(f"Страница {url} отсутствует в кэше (offline режим)")
+
+        if not self.breaker.allow_request():
+            if entry:
+                logger.warning(f"Сайт недоступен, страница {url} взята из кэша")
+                return cache.read_body(entry).decode(entry.encoding, errors='replace')
+            raise Exception(f"Сайт временно недоступен, страница {url} не загружена")
+
+        settled = False
         try:
-            # Убеждаемся, что URL абсолютный
-            if not url.startswith('http'):
-                if url.startswith('/'):
-                    url = self.BASE_URL + url
-                else:
-                    url = self.BASE_URL + '/' + url
-
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()  # Проверяем статус ответа
+            response = self.fetcher.get(url, headers=HttpCache.conditional_headers(entry), timeout=timeout,
+                                        breaker=self.breaker)
+            if entry and response.status_code == 304:
+                self.breaker.record_success()
+                settled = True
+                cache.revalidated(url, entry, response)
+                return cache.read_body(entry).decode(entry.encoding, errors='replace')
 
-            return BeautifulSoup(response.text, 'html.parser')
+            response.raise_for_status()  # Проверяем статус ответа
+            self.breaker.record_success()
+            settled = True
+            if cache:
+                cache.store(url, response, response.content)
+            return response.text
 
         except requests.RequestException as e:
+            self._record_origin_error(e)
+            settled = True
+            if entry:
+                logger.warning(f"Ошибка при загрузке страницы {url}: {e}. Используется копия из кэша")
+                return cache.read_body(entry).decode(entry.encoding, errors='replace')
             logger.error(f"Ошибка при загрузке страницы {url}: {e}")
             raise Exception(f"Не удалось загрузить страницу: {e}")
+        finally:
+            if not settled:
+                # Запрос прервала другая ошибка: без исхода пробный запрос предохранителя не завершился бы никогда
+                self.breaker.record_failure()
+
+    def iter_page_chunks(self, url: str, timeout: Optional[float] = None, chunk_size: int = 16 * 1024) -> Iterator[str]:
+        """
+        Потоково читает HTML страницы кусками с учетом HTTP-кэша
+
+        Ответ сети одновременно отдается вызывающему коду и сжимается в кэш,
+        поэтому целиком в памяти не держится ни при чтении из сети, ни из кэша.
+
+        Args:
+            url: URL страницы
+            timeout: Таймаут запроса в секундах (None - по наблюдаемым задержкам сайта)
+            chunk_size: Размер куска в байтах
+
+        Yields:
+            Куски текста страницы
+
+        Raises:
+            Exception: При ошибке загрузки страницы
+        """
+        url = self.absolute_url(url)
+        cache = self.http_cache
+        entry = cache.lookup(url) if cache else None
+
+        if entry and (entry.is_fresh() or cache.offline):
+            yield from self._decode_chunks(cache.iter_body(entry, chunk_size), entry.encoding)
+            return
+        if cache and cache.offline:
+            raise Exception(f"Страница {url} отсутствует в кэше (offline режим)")
+
+        if not self.breaker.allow_request():
+            if entry:
+                logger.warning(f"Сайт недоступен, страница {url} взята из кэша")
+                yield from self._decode_chunks(cache.iter_body(entry, chunk_size), entry.encoding)
+                return
+            raise Exception(f"Сайт временно недоступен, страница {url} не загружена")
+
+        settled = False
+        try:
+            try:
+                response = self.fetcher.get(url, headers=HttpCache.conditional_headers(entry), timeout=timeout,
+                                            stream=True, breaker=self.breaker)
+            except requests.RequestException as e:
+                self._record_origin_error(e)
+                settled = True
+                if entry:
+                    logger.warning(f"Ошибка при загрузке страницы {url}: {e}. Используется копия из кэша")
+                    yield from self._decode_chunks(cache.iter_body(entry, chunk_size), entry.encoding)
+                    return
+                logger.error(f"Ошибка при загрузке страницы {url}: {e}")
+                raise Exception(f"Не удалось загрузить страницу: {e}")
+
+            with response:
+                if entry and response.status_code == 304:
+                    self.breaker.record_success()
+                    settled = True
+                    cache.revalidated(url, entry, response)
+                    yield from self._decode_chunks(cache.iter_body(entry, chunk_size), entry.encoding)
+                    return
+
+                try:
+                    response.raise_for_status()
+                except requests.RequestException as e:
+                    self._record_origin_error(e)
+                    settled = True
+                    logger.error(f"Ошибка при загрузке страницы {url}: {e}")
+                    raise Exception(f"Не удалось загрузить страницу: {e}")
+                self.breaker.record_success()
+                settled = True
+
+                writer = self._cache_writer(cache, url, response)
+                try:
+                    for text in self._decode_chunks(self._tee(response.iter_content(chunk_size), writer, url),
+                                                    response.encoding):
+                        yield text
+                    if writer and not writer.closed:
+                        self._finish_cache_write(writer, url, commit=True)
+                except BaseException as e:
+                    if isinstance(e, requests.RequestException):
+                        self._record_origin_error(e)
+                    if writer and not writer.closed:
+                        self._finish_cache_write(writer, url, commit=False)
+                    raise
+        finally:
+            if not settled:
+                # Запрос прервала другая ошибка: без исхода пробный запрос предохранителя не завершился бы никогда
+                self.breaker.record_failure()
+
+    def _record_origin_error(self, error: requests.RequestException):
+        """Учитывает ошибку запроса в предохранителе: сбоем сайта считаются таймауты, обрывы связи и ответы 5xx"""
+        response = getattr(error, 'response', None)
+        if response is not None and response.status_code < 500:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    @staticmethod
+    def _cache_writer(cache: Optional[HttpCache], url: str, response):
+        """Начинает запись ответа в кэш; None, если ответ не кэшируется или запись не удалось начать"""
+        if cache is None:
+            return None
+        try:
+            return cache.writer(url, response)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить ответ {url} в кэш: {e}")
+            return None
+
+    @staticmethod
+    def _finish_cache_write(writer, url: str, commit: bool):
+        """Сохраняет или отменяет запись ответа в кэш: ошибка диска не прерывает загрузку страницы (как в HttpCache.store)"""
+        try:
+            if commit:
+                writer.commit()
+            else:
+                writer.abort()
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить ответ {url} в кэш: {e}")
+            if commit:
+                try:
+                    writer.abort()
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _tee(chunks: Iterator[bytes], writer, url: str) -> Iterator[bytes]:
+        """Передает куски дальше, попутно записывая их в кэш (после ошибки диска - без записи)"""
+        for chunk in chunks:
+            if writer and not writer.closed:
+                try:
+                    writer.write(chunk)
+                except OSError as e:
+                    logger.warning(f"Не удалось сохранить ответ {url} в кэш: {e}")
+                    writer.abort()
+            yield chunk
+
+    @staticmethod
+    def _decode_chunks(chunks: Iterator[bytes], encoding: Optional[str]) -> Iterator[str]:
+        """Декодирует поток байтов в текст, корректно обрабатывая символы на границах кусков"""
+        decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
 
     def extract_text(self, element, default: str = 'Не указано') -> str:
         """
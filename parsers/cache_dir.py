@@ -0,0 +1,59 @@
+import logging
+import os
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+def evict_lru(directory: str, suffix: str, max_size: int, keep: Optional[str] = None,
+              related: Optional[Callable[[str], Iterable[str]]] = None) -> List[str]:
+    """
+    Удаляет самые давно использованные файлы дискового кэша, пока он не уложится в лимит
+
+    Давность использования определяется по времени изменения файла: кэши обновляют его
+    (os.utime) при каждом чтении записи.
+
+    Args:
+        directory: Каталог кэша
+        suffix: Окончание имени файлов записей; остальные файлы каталога не учитываются
+        max_size: Максимальный суммарный размер файлов записей в байтах
+        keep: Путь к файлу, который нельзя удалять (например, только что записанный)
+        related: Функция, возвращающая сопутствующие файлы записи, удаляемые вместе с ней
+
+    Returns:
+        Пути удаленных файлов записей
+    """
+    entries = []
+    total = 0
+    for name in os.listdir(directory):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    removed = []
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Запись уже удалил другой процесс
+            pass
+        except OSError as e:
+            logger.debug(f"Не удалось удалить {path}: {e}")
+            continue
+        for extra in (related(path) if related else ()):
+            try:
+                os.remove(extra)
+            except OSError:
+                pass
+        total -= size
+        removed.append(path)
+    return removed
@@ -0,0 +1,77 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """
+    Предохранитель запросов к сайту
+
+    После failure_threshold ошибок подряд цепь размыкается, и запросы к сайту не выполняются
+    reset_timeout секунд. Затем пропускается один пробный запрос: при успехе цепь замыкается,
+    при ошибке снова размыкается.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Args:
+            failure_threshold: Количество ошибок подряд, после которого цепь размыкается
+            reset_timeout: Время в секундах до пробного запроса
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True, если запросы к сайту сейчас не выполняются"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow_request(self) -> bool:
+        """Возвращает True, если запрос к сайту можно выполнить"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Отмечает успешный ответ сайта"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Сайт снова отвечает, запросы возобновлены")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Отмечает ошибку сайта (таймаут, обрыв соединения, ответ 5xx)"""
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Сайт недоступен ({self.failures} ошибок подряд), "
+                                   f"запросы приостановлены на {self.reset_timeout:.0f} с")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+_origin_breaker = CircuitBreaker()
+
+def get_origin_breaker() -> CircuitBreaker:
+    """Общий для всех парсеров предохранитель запросов к armodels.ru"""
+    return _origin_breaker
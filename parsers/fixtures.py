@@ -0,0 +1,102 @@
+import io
+import logging
+import os
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .http_session import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+class FixtureAdapter(BaseAdapter):
+    """
+    Транспорт requests, отдающий сохраненные HTML-страницы вместо запросов к сайту
+
+    Страница ищется по пути адреса (хост не учитывается): сначала в таблице pages,
+    затем как файл <путь>.html в каталоге, затем по префиксу пути в prefix_pages
+    (все карточки моделей отдаются одной сохраненной страницей). Если страницы нет, ответ - 404.
+    """
+
+    # Страницы, сохраненные в корне репозитория
+    PAGES = {
+        '/': 'main_page.html',
+        '/public/models': 'page.html',
+        '/projects': 'projects_page.html',
+    }
+    PREFIX_PAGES = {
+        '/public/models/': 'model_page.html',
+    }
+
+    def __init__(self, fixtures_dir: str, pages: Optional[Dict[str, str]] = None,
+                 prefix_pages: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            fixtures_dir: Каталог с сохраненными страницами
+            pages: Путь адреса -> имя файла (по умолчанию PAGES)
+            prefix_pages: Префикс пути -> имя файла для страниц без собственного файла (по умолчанию PREFIX_PAGES)
+        """
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+        self.pages = self.PAGES if pages is None else pages
+        self.prefix_pages = self.PREFIX_PAGES if prefix_pages is None else prefix_pages
+        self._bodies: Dict[str, bytes] = {}
+
+    def resolve(self, url: str) -> Optional[str]:
+        """Путь к файлу страницы для адреса или None"""
+        path = urlsplit(url).path.rstrip('/') or '/'
+        if path in self.pages:
+            return os.path.join(self.fixtures_dir, self.pages[path])
+
+        saved = os.path.join(self.fixtures_dir, path.lstrip('/') + '.html')
+        if os.path.isfile(saved):
+            return saved
+
+        for prefix, filename in self.prefix_pages.items():
+            if path.startswith(prefix):
+                return os.path.join(self.fixtures_dir, filename)
+        return None
+
+    def _read(self, filename: str) -> bytes:
+        # Страницы читаются с диска один раз: все карточки моделей - один и тот же файл
+        body = self._bodies.get(filename)
+        if body is None:
+            with open(filename, 'rb') as f:
+                body = self._bodies[filename] = f.read()
+        return body
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        filename = self.resolve(request.url)
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+
+        if filename is None or not os.path.isfile(filename):
+            logger.debug(f"Сохраненная страница для {request.url} не найдена")
+            response.status_code, response.reason = 404, 'Not Found'
+            response.raw = io.BytesIO(b'')
+            return response
+
+        body = self._read(filename) if request.method != 'HEAD' else b''
+        response.status_code, response.reason = 200, 'OK'
+        response.headers['Content-Length'] = str(len(body))
+        response.raw = io.BytesIO(body)
+        return response
+
+    def close(self):
+        self._bodies.clear()
+
+def create_fixture_session(fixtures_dir: str) -> requests.Session:
+    """HTTP-сессия, которая вместо сайта читает сохраненные страницы из каталога fixtures_dir"""
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    adapter = FixtureAdapter(fixtures_dir)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
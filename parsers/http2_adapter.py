@@ -0,0 +1,103 @@
+import logging
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+class _HttpxRaw:
+    """Тело ответа httpx в виде, который requests.Response читает через iter_content"""
+
+    def __init__(self, response):
+        self._response = response
+
+    def stream(self, chunk_size: Optional[int] = None, decode_content: bool = True) -> Iterator[bytes]:
+        import httpx
+
+        # httpx уже распаковывает gzip/deflate/br по Content-Encoding
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e)
+
+    def close(self):
+        self._response.close()
+
+    def release_conn(self):
+        self._response.close()
+
+class Http2Adapter(BaseAdapter):
+    """
+    Транспорт requests поверх httpx с HTTP/2
+
+    По HTTP/2 параллельные запросы парсеров, проверки фото и скачивание PDF идут одним
+    TLS-соединением с сайтом. Вызывающий код по-прежнему работает с requests.Session
+    и requests.Response, ошибки httpx превращаются в исключения requests.
+    Нужен пакет h2 (pip install "httpx[http2]"), без него используется обычный HTTP/1.1 пул.
+    """
+
+    def __init__(self, pool_size: int = 16, http2: bool = True):
+        """
+        Args:
+            pool_size: Максимум соединений (для HTTP/1.1, если сервер не поддерживает HTTP/2)
+            http2: Разрешить HTTP/2
+        """
+        super().__init__()
+        import httpx
+        self._client = httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    @staticmethod
+    def available() -> bool:
+        """True, если установлены httpx и h2"""
+        try:
+            import h2  # noqa: F401
+            import httpx  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import httpx
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = read_timeout = timeout
+        try:
+            httpx_request = self._client.build_request(
+                request.method,
+                request.url,
+                headers=list(request.headers.items()),
+                content=request.body,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+            )
+            response = self._client.send(httpx_request, stream=True)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request)
+        return self.build_response(request, response)
+
+    def build_response(self, request, httpx_response) -> requests.Response:
+        """Оборачивает ответ httpx в requests.Response (тело читается потоково через raw)"""
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.reason = httpx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(httpx_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _HttpxRaw(httpx_response)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        self._client.close()
@@ -0,0 +1,258 @@
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, Optional
+
+from .cache_dir import evict_lru
+
+logger = logging.getLogger(__name__)
+
+class CacheEntry:
+    """Закэшированный ответ: метаданные и путь к сжатому телу"""
+
+    def __init__(self, meta: Dict, body_path: str):
+        self.meta = meta
+        self.body_path = body_path
+
+    @property
+    def encoding(self) -> str:
+        return self.meta.get('encoding') or 'utf-8'
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.meta.get('expires_at', 0)
+
+class CacheWriter:
+    """Потоковая запись тела ответа в кэш со сжатием на лету"""
+
+    def __init__(self, cache: 'HttpCache', url: str, meta: Dict):
+        self.cache = cache
+        self.url = url
+        self.meta = meta
+        self.body_path = cache._body_path(url)
+        self.tmp_path = f"{self.body_path}.{threading.get_ident()}.part"
+        self._compressor = zlib.compressobj(6)
+        self._file = open(self.tmp_path, 'wb')
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self._file.write(self._compressor.compress(chunk))
+
+    def commit(self):
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        os.replace(self.tmp_path, self.body_path)
+        self.meta['size'] = self.size
+        self.cache._write_meta(self.url, self.meta)
+        self.cache._evict()
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def abort(self):
+        try:
+            self._file.close()
+        except OSError:
+            # Буфер не записался на диск - временный файл все равно удаляется
+            pass
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+class HttpCache:
+    """
+    Дисковый кэш HTTP-ответов с учетом Cache-Control, Expires, ETag и Last-Modified
+
+    Тела ответов хранятся сжатыми (zlib), общий размер кэша ограничен: при превышении
+    удаляются записи, к которым дольше всего не обращались. В режиме offline кэш
+    отдает сохраненные ответы независимо от их свежести и не ходит в сеть.
+    """
+
+    def __init__(self, cache_dir: str = 'cache/http', max_size_mb: int = 100,
+                 default_ttl: int = 300, offline: bool = False):
+        """
+        Args:
+            cache_dir: Каталог кэша
+            max_size_mb: Максимальный размер кэша на диске в мегабайтах
+            default_ttl: Время свежести в секундах, если сервер не указал его сам
+            offline: Отдавать только сохраненные ответы, не обращаясь к сайту
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 1024 * 1024
+        self.default_ttl = default_ttl
+        self.offline = offline
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> 'HttpCache':
+        """Создает кэш по переменным окружения HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB, HTTP_CACHE_TTL и ARMODELS_OFFLINE"""
+        return cls(
+            cache_dir=os.getenv('HTTP_CACHE_DIR', 'cache/http'),
+            max_size_mb=int(os.getenv('HTTP_CACHE_MAX_MB', '100')),
+            default_ttl=int(os.getenv('HTTP_CACHE_TTL', '300')),
+            offline=os.getenv('ARMODELS_OFFLINE', '').lower() in ('1', 'true', 'yes')
+        )
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._key(url)}.json")
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"{self._key(url)}.z")
+
+    def _write_meta(self, url: str, meta: Dict):
+        path = self._meta_path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Возвращает запись кэша для URL или None"""
+        body_path = self._body_path(url)
+        try:
+            with open(self._meta_path(url), encoding='utf-8') as f:
+                meta = json.load(f)
+            # Отмечаем обращение для вытеснения по давности использования
+            os.utime(body_path)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(meta, body_path)
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        """Возвращает распакованное тело ответа"""
+        with open(entry.body_path, 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def iter_body(self, entry: CacheEntry, chunk_size: int = 16 * 1024) -> Iterator[bytes]:
+        """Потоково распаковывает тело ответа"""
+        decompressor = zlib.decompressobj()
+        with open(entry.body_path, 'rb') as f:
+            while True:
+                compressed = f.read(chunk_size)
+                if not compressed:
+                    break
+                data = decompressor.decompress(compressed)
+                if data:
+                    yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Заголовки условного запроса для проверки устаревшей записи"""
+        headers = {}
+        if entry:
+            if entry.meta.get('etag'):
+                headers['If-None-Match'] = entry.meta['etag']
+            if entry.meta.get('last_modified'):
+                headers['If-Modified-Since'] = entry.meta['last_modified']
+        return headers
+
+    def _lifetime(self, headers) -> Optional[int]:
+        """Время свежести ответа в секундах или None, если ответ нельзя сохранять"""
+        directives = {}
+        for part in headers.get('Cache-Control', '').split(','):
+            name, _, value = part.strip().partition('=')
+            if name:
+                directives[name.lower()] = value.strip('"')
+
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        if 'max-age' in directives:
+            try:
+                return max(0, int(directives['max-age']))
+            except ValueError:
+                return 0
+
+        now = time.time()
+        if headers.get('Expires'):
+            expires = self._parse_date(headers['Expires'])
+            return max(0, int(expires - now)) if expires else 0
+
+        modified = self._parse_date(headers.get('Last-Modified'))
+        if modified:
+            # Эвристика RFC 7234: 10% от времени с последнего изменения
+            return max(0, int((now - modified) / 10))
+
+        return self.default_ttl
+
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[float]:
+        """Разбирает HTTP-дату в timestamp или возвращает None"""
+        if not value:
+            return None
+        try:
+            return email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    def _build_meta(self, url: str, response, lifetime: int) -> Dict:
+        return {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': response.encoding,
+            'stored_at': time.time(),
+            'expires_at': time.time() + lifetime,
+        }
+
+    def writer(self, url: str, response) -> Optional[CacheWriter]:
+        """Возвращает объект потоковой записи ответа в кэш или None, если ответ сохранять нельзя"""
+        lifetime = self._lifetime(response.headers)
+        if lifetime is None or response.status_code != 200:
+            return None
+        return CacheWriter(self, url, self._build_meta(url, response, lifetime))
+
+    def store(self, url: str, response, body: bytes):
+        """Сохраняет полностью прочитанный ответ"""
+        writer = self.writer(url, response)
+        if writer is None:
+            return
+        try:
+            writer.write(body)
+            writer.commit()
+        except OSError as e:
+            writer.abort()
+            logger.warning(f"Не удалось сохранить ответ {url} в кэш: {e}")
+
+    def revalidated(self, url: str, entry: CacheEntry, response):
+        """Обновляет метаданные записи после ответа 304 Not Modified"""
+        lifetime = self._lifetime(response.headers)
+        meta = dict(entry.meta)
+        meta['expires_at'] = time.time() + (lifetime or 0)
+        if response.headers.get('ETag'):
+            meta['etag'] = response.headers['ETag']
+        try:
+            self._write_meta(url, meta)
+        except OSError as e:
+            logger.warning(f"Не удалось обновить запись кэша {url}: {e}")
+        entry.meta = meta
+
+    def _evict(self):
+        """Удаляет давно не использованные записи, пока кэш не уложится в лимит"""
+        with self._lock:
+            # Вместе с телом ответа удаляются его метаданные
+            evict_lru(self.cache_dir, '.z', self.max_size, related=lambda path: (path[:-2] + '.json',))
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> Optional[HttpCache]:
+    """Общий для всех парсеров кэш, настроенный через переменные окружения (None, если HTTP_CACHE_MAX_MB=0)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None and os.getenv('HTTP_CACHE_MAX_MB', '100') != '0':
+            _default_cache = HttpCache.from_env()
+        return _default_cache
@@ -0,0 +1,182 @@
+import ipaddress
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# Соединений к одному хосту в пуле: запросы к сайту выполняются в потоках asyncio.to_thread (до 32),
+# параллельно идут проверки ссылок на фото (8) и дублирующие запросы (8)
+POOL_MAXSIZE = int(os.getenv('ORIGIN_POOL_SIZE', '32'))
+# Сколько секунд хранить адрес хоста, полученный из DNS
+DNS_TTL = 300
+
+class TransportStats:
+    """Счетчики транспорта: сколько соединений установлено и сколько раз выполнялся DNS-запрос"""
+
+    def __init__(self):
+        self.connections = 0
+        self.dns_lookups = 0
+        self._lock = threading.Lock()
+
+    def add(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'connections': self.connections, 'dns_lookups': self.dns_lookups}
+
+class DnsCache:
+    """
+    Кэш DNS для новых соединений с сайтом
+
+    Адреса хоста запоминаются на ttl секунд, поэтому новые соединения пула (и повторные
+    запросы после обрыва) не ждут DNS. Если по адресу подключиться не удалось, он переносится
+    в конец списка и соединение устанавливается по следующему; если не подошел ни один,
+    запись удаляется и при следующем соединении адреса запрашиваются заново.
+    """
+
+    def __init__(self, ttl: float = DNS_TTL, stats: TransportStats = None):
+        self.ttl = ttl
+        self.stats = stats
+        self._entries: Dict[str, Tuple[List[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str) -> List[str]:
+        """Возвращает IP-адреса хоста в порядке попыток подключения ([host], если это уже IP-адрес)"""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and entry[1] > time.monotonic():
+                return list(entry[0])
+
+        if self.stats:
+            self.stats.add('dns_lookups')
+        addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)))
+        with self._lock:
+            self._entries[host] = (addresses, time.monotonic() + self.ttl)
+        return list(addresses)
+
+    def failed(self, host: str, address: str):
+        """Переносит адрес, к которому не удалось подключиться, в конец списка адресов хоста"""
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry and address in entry[0]:
+                addresses = [item for item in entry[0] if item != address] + [address]
+                self._entries[host] = (addresses, entry[1])
+
+    def forget(self, host: str):
+        """Удаляет адреса хоста из кэша"""
+        with self._lock:
+            self._entries.pop(host, None)
+
+    def clear(self):
+        """Очищает кэш"""
+        with self._lock:
+            self._entries.clear()
+
+transport_stats = TransportStats()
+dns_cache = DnsCache(stats=transport_stats)
+
+class _CachedDnsConnectionMixin:
+    """Подключение по адресу из кэша DNS; имя хоста по-прежнему используется для SNI и проверки сертификата"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = dns_cache.resolve(host)
+        except OSError:
+            # Ошибку DNS сообщит стандартное подключение по имени хоста
+            addresses = [host]
+        try:
+            for number, address in enumerate(addresses, 1):
+                self._dns_host = address
+                try:
+                    conn = super()._new_conn()
+                    break
+                except Exception as e:
+                    if number == len(addresses):
+                        dns_cache.forget(host)
+                        raise
+                    logger.debug(f"Не удалось подключиться к {host} по адресу {address}: {e}")
+                    dns_cache.failed(host, address)
+        finally:
+            self._dns_host = host
+        transport_stats.add('connections')
+        return conn
+
+class _CachedDnsHTTPConnection(_CachedDnsConnectionMixin, HTTPConnection):
+    pass
+
+class _CachedDnsHTTPSConnection(_CachedDnsConnectionMixin, HTTPSConnection):
+    pass
+
+class _CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDnsHTTPConnection
+
+class _CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDnsHTTPSConnection
+
+class TransportAdapter(HTTPAdapter):
+    """Транспорт requests с пулом keep-alive соединений и кэшем DNS"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CachedDnsHTTPConnectionPool,
+            'https': _CachedDnsHTTPSConnectionPool,
+        }
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session() -> requests.Session:
+    """
+    Создает HTTP-сессию с заголовками и пулом соединений для запросов к сайту
+
+    Сжатие ответа запрашивается во всех форматах, которые умеет распаковывать urllib3
+    (gzip и deflate, br - если установлен brotli). Если установлен пакет h2 и не задано
+    ORIGIN_HTTP2=0, HTTPS-запросы выполняются по HTTP/2 (см. Http2Adapter).
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': ACCEPT_ENCODING,
+    })
+    adapter = TransportAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if os.getenv('ORIGIN_HTTP2', '1') != '0':
+        from .http2_adapter import Http2Adapter
+        if Http2Adapter.available():
+            session.mount('https://', Http2Adapter(pool_size=POOL_MAXSIZE))
+            logger.info("Запросы к сайту выполняются по HTTP/2")
+    return session
+
+def get_shared_session() -> requests.Session:
+    """Общая для всех парсеров и кэша PDF сессия: один пул keep-alive соединений с armodels.ru"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
@@ -0,0 +1,42 @@
+import re
+from typing import Iterable, List, Optional
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+
+# Символы пути, которые не нужно экранировать (в том числе уже экранированные последовательности %XX)
+_PATH_SAFE = "/%:@!$&'()*+,;=-._~"
+
+def normalize_url(url: Optional[str], base: str) -> Optional[str]:
+    """
+    Приводит ссылку со страницы сайта к абсолютному каноническому виду
+
+    Относительные ссылки ("/storage/...", "storage/...", "//host/...") достраиваются от base,
+    схема и хост приводятся к нижнему регистру, повторяющиеся '/' в пути схлопываются,
+    пробелы и кириллица в пути экранируются, фрагмент (#...) отбрасывается.
+    Одно и то же изображение, записанное на странице по-разному, дает одну и ту же ссылку.
+
+    Args:
+        url: Ссылка из атрибута src/data-src/href
+        base: Адрес сайта, от которого достраиваются относительные ссылки
+
+    Returns:
+        Абсолютная ссылка или None для пустой ссылки
+    """
+    if not url or not url.strip():
+        return None
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+
+    parts = urlsplit(urljoin(base.rstrip('/') + '/', url))
+    path = quote(re.sub(r'/{2,}', '/', parts.path), safe=_PATH_SAFE) or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ''))
+
+def unique_urls(urls: Iterable[Optional[str]]) -> List[str]:
+    """Возвращает ссылки без пустых значений и повторов, сохраняя порядок"""
+    seen = set()
+    result = []
+    for url in urls:
+        if url and url not in seen:
+            seen.add(url)
+            result.append(url)
+    return result
@@ -1,12 +1,106 @@
 import logging
-from typing import List, Dict, Optional
+import re
+from collections import deque
+from html.parser import HTMLParser
+from typing import List, Dict, Optional, Iterator
 from .base_parser import BaseParser
+from .sections import PageSection
+from .media import normalize_url, unique_urls
 
 logger = logging.getLogger(__name__)
 
+# Фото карточки задается стилем: background-image: url('/storage/images/models/card_images/...')
+_BACKGROUND_URL = re.compile(r"""background-image:\s*url\(\s*['"]?([^'")]+)""")
+
+def _background_image(style: Optional[str]) -> Optional[str]:
+    """Возвращает ссылку на фоновое изображение из атрибута style или None"""
+    match = _BACKGROUND_URL.search(style or '')
+    return match.group(1).strip() if match else None
+
+class _ModelsListScanner(HTMLParser):
+    """
+    Инкрементальный сканер страницы /public/models
+
+    Отслеживает только карточки li.grid-item и складывает найденные данные
+    (имя, ссылка, курс, классы, фото карточки) в очередь entries по закрытию карточки.
+    Правила выбора элементов повторяют ModelsParser.parse_list.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.entries = deque()
+        self._item = None
+        self._li_depth = 0
+        self._capture = None
+        self._text = []
+        self._href = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        class_str = attrs.get('class') or ''
+
+        if tag == 'li':
+            if self._item is not None:
+                self._li_depth += 1
+            elif 'grid-item' in class_str.split():
+                self._item = {'name': None, 'url': None, 'course': None, 'photo': None,
+                              'classes': class_str.split()}
+                self._li_depth = 0
+            return
+
+        if self._item is None:
+            return
+
+        if tag == 'div' and 'front' in class_str.split() and self._item['photo'] is None:
+            self._item['photo'] = _background_image(attrs.get('style'))
+        elif tag == 'span' and 'text-white' in class_str:
+            if 'text-large' in class_str and self._item['name'] is None:
+                self._start_capture('name')
+            elif 'text-medium' in class_str and self._item['course'] is None:
+                self._start_capture('course')
+        elif tag == 'a' and attrs.get('href') and self._item['url'] is None:
+            self._start_capture('link')
+            self._href = attrs['href']
+
+    def handle_endtag(self, tag):
+        if self._item is None:
+            return
+
+        if tag == 'li':
+            if self._li_depth:
+                self._li_depth -= 1
+                return
+            item, self._item = self._item, None
+            self.entries.append((item['name'], item['url'], item['course'] or 'Не указано', item['classes'],
+                                 item['photo']))
+            return
+
+        if self._capture and tag == ('a' if self._capture == 'link' else 'span'):
+            text = ''.join(self._text).strip()
+            if self._capture == 'link':
+                if text == 'Портфолио':
+                    self._item['url'] = self._href
+            elif text:
+                self._item[self._capture] = text
+            self._capture = None
+
+    def handle_data(self, data):
+        if self._capture:
+            self._text.append(data)
+
+    def _start_capture(self, field):
+        self._capture = field
+        self._text = []
+
 class ModelsParser(BaseParser):
     """Парсер для моделей с сайта armodels.ru"""
 
+    # 2 - в записи списка добавлено фото карточки
+    PARSER_VERSION = 2
+
+    # Карточки моделей на странице /public/models (сетка занимает почти всю страницу, поэтому HTML не вырезается)
+    LIST_SECTION = PageSection('li', class_='grid-item')
+
     def parse_list(self) -> List[Dict]:
         """
         Парсит список всех моделей с основной страницы
@@ -15,75 +109,123 @@ class ModelsParser(BaseParser):
             Список словарей с информацией о моделях
         """
         try:
-            soup = self.get_page_content('/public/models')
-
-            models = []
-            # Ищем все элементы с моделями
-            model_items = soup.find_all('li', class_='grid-item')
-
-            for item in model_items:
-                # Ищем ссылку на портфолио
-                portfolio_link = item.find('a', href=True, string='Портфолио')
-                if not portfolio_link:
-                    continue
-
-                # Ищем имя модели (в span с определенными классами)
-                name_span = item.find('span', class_=lambda x: x and 'text-white' in x and 'text-large' in x)
-                if not name_span:
-                    continue
-
-                name = self.extract_text(name_span)
-                profile_url = portfolio_link.get('href')
-
-                # Извлекаем курс
-                course_span = item.find('span', class_=lambda x: x and 'text-white' in x and 'text-medium' in x)
-                course = self.extract_text(course_span)
-
-                # Извлекаем пол из классов
-                classes = item.get('class', [])
-                gender = 'Не указан'
-                if 'male' in classes:
-                    gender = 'male'
-                elif 'female' in classes:
-                    gender = 'female'
-
-                # Определяем курс по классам
-                course_type = 'Не указан'
-                if 'first_course' in classes:
-                    course_type = 'first_course'
-                elif 'second_course' in classes:
-                    course_type = 'second_course'
-                elif 'third_course' in classes:
-                    course_type = 'third_course'
-                elif 'fourth_course' in classes:
-                    course_type = 'fourth_course'
-
-                if profile_url and name:
-                    if not profile_url.startswith('http'):
-                        if profile_url.startswith('/public'):
-                            # Убираем /public из ссылки для более короткого URL
-                            profile_url = profile_url.replace('/public', '', 1)
-                            profile_url = self.BASE_URL + profile_url
-                        elif profile_url.startswith('/'):
-                            profile_url = self.BASE_URL + profile_url
-                        else:
-                            profile_url = self.BASE_URL + '/' + profile_url
-
-                    models.append({
-                        'name': name,
-                        'url': profile_url,
-                        'course': course,
-                        'gender': gender,
-                        'course_type': course_type
-                    })
-
-            logger.info(f"Успешно спарсено {len(models)} моделей")
-            return models
+            return self.parse_page('/public/models', self._extract_list, section=self.LIST_SECTION)
 
         except Exception as e:
             logger.error(f"Ошибка при парсинге списка моделей: {e}")
             return []
 
+    def iter_list(self) -> Iterator[Dict]:
+        """
+        Потоково парсит список моделей, отдавая записи по мере чтения ответа
+
+        В отличие от parse_list дерево документа не строится: ответ читается кусками
+        и разбирается инкрементальным сканером, поэтому первые модели доступны до того,
+        как загрузится вся страница, а в памяти держится только текущая карточка.
+
+        Yields:
+            Словари с информацией о моделях в порядке следования на странице
+
+        Raises:
+            Exception: Если страницу не удалось дочитать или разобрать - уже отданные записи
+                       неполные, и вызывающий код не должен считать их всем списком
+        """
+        count = 0
+        try:
+            scanner = _ModelsListScanner()
+            for chunk in self.iter_page_chunks('/public/models'):
+                scanner.feed(chunk)
+                while scanner.entries:
+                    model = self._build_model(*scanner.entries.popleft())
+                    if model:
+                        count += 1
+                        yield model
+            scanner.close()
+
+            logger.info(f"Успешно спарсено {count} моделей (потоково)")
+
+        except Exception as e:
+            logger.error(f"Ошибка при потоковом парсинге списка моделей после {count} записей: {e}")
+            raise
+
+    def _build_model(self, name: str, profile_url: Optional[str], course: str, classes: List[str],
+                     photo: Optional[str] = None) -> Optional[Dict]:
+        """Собирает запись о модели из данных карточки списка (photo - фото карточки)"""
+        # Извлекаем пол из классов
+        gender = 'Не указан'
+        if 'male' in classes:
+            gender = 'male'
+        elif 'female' in classes:
+            gender = 'female'
+
+        # Определяем курс по классам
+        course_type = 'Не указан'
+        if 'first_course' in classes:
+            course_type = 'first_course'
+        elif 'second_course' in classes:
+            course_type = 'second_course'
+        elif 'third_course' in classes:
+            course_type = 'third_course'
+        elif 'fourth_course' in classes:
+            course_type = 'fourth_course'
+
+        if not (profile_url and name):
+            return None
+
+        if not profile_url.startswith('http'):
+            if profile_url.startswith('/public'):
+                # Убираем /public из ссылки для более короткого URL
+                profile_url = profile_url.replace('/public', '', 1)
+                profile_url = self.BASE_URL + profile_url
+            elif profile_url.startswith('/'):
+                profile_url = self.BASE_URL + profile_url
+            else:
+                profile_url = self.BASE_URL + '/' + profile_url
+
+        return {
+            'name': name,
+            'url': profile_url,
+            'course': course,
+            'gender': gender,
+            'course_type': course_type,
+            'photo': normalize_url(photo, self.BASE_URL)
+        }
+
+    def _extract_list(self, soup) -> List[Dict]:
+        """Извлекает модели из карточек страницы /public/models"""
+        models = []
+        # Ищем все элементы с моделями
+        model_items = soup.find_all('li', class_='grid-item')
+
+        for item in model_items:
+            # Ищем ссылку на портфолио
+            portfolio_link = item.find('a', href=True, string='Портфолио')
+            if not portfolio_link:
+                continue
+
+            # Ищем имя модели (в span с определенными классами)
+            name_span = item.find('span', class_=lambda x: x and 'text-white' in x and 'text-large' in x)
+            if not name_span:
+                continue
+
+            name = self.extract_text(name_span)
+            profile_url = portfolio_link.get('href')
+
+            # Извлекаем курс
+            course_span = item.find('span', class_=lambda x: x and 'text-white' in x and 'text-medium' in x)
+            course = self.extract_text(course_span)
+
+            # Фото карточки (фон лицевой стороны)
+            front = item.find('div', class_='front', style=True)
+            photo = _background_image(front.get('style')) if front else None
+
+            model = self._build_model(name, profile_url, course, item.get('class', []), photo)
+            if model:
+                models.append(model)
+
+        logger.info(f"Успешно спарсено {len(models)} моделей")
+        return models
+
     def parse_detail(self, url: str) -> Optional[Dict]:
         """
         Парсит детальную информацию о конкретной модели
@@ -95,98 +237,96 @@ class ModelsParser(BaseParser):
             Словарь с детальной информацией о модели или None при ошибке
         """
         try:
-            soup = self.get_page_content(url)
-
-            # Извлечение имени модели
-            name_tag = soup.find('h1', class_=lambda x: x and 'title-extra-large-light' in x)
-            name = self.extract_text(name_tag)
-
-            # Извлечение параметров модели
-            params = {}
-
-            # Курс обучения
-            course_tag = soup.find('span', class_=lambda x: x and 'text-extra-medium' in x and 'text-uppercase' in x, string=lambda s: s and ('курс' in s.lower()))
-            if course_tag:
-                course_text = self.extract_text(course_tag)
-                # Убираем слово "курс" из текста
-                course_text = course_text.replace(' курс', '').replace('Курс', '').replace('курс', '').strip()
-                params['Курс'] = course_text
-
-            # Возраст
-            age_container = soup.find('span', class_=lambda x: x and 'font-weight-500' in x and 'text-extra-dark-gray' in x, string=lambda s: s and any(char.isdigit() for char in s))
-            if age_container:
-                age_text = self.extract_text(age_container)
-                if 'лет' in age_text.lower() or any(char.isdigit() for char in age_text):
-                    params['Возраст'] = age_text
-
-            # Город
-            city_tag = soup.find('span', class_=lambda x: x and 'text-extra-medium' in x and 'text-uppercase' in x, string=lambda s: s and len(s.strip()) > 0)
-            if city_tag and self.extract_text(city_tag) not in ['Первый курс', 'Второй курс', 'Третий курс', 'Четвертый курс']:
-                params['Город'] = self.extract_text(city_tag)
-
-            # Параметры (рост, цвет волос, цвет глаз, размер обуви)
-            param_labels = ['Рост:', 'Цвет волос:', 'Цвет глаз:', 'Размер обуви:']
-            for label in param_labels:
-                label_tag = soup.find('span', class_=lambda x: x and 'font-weight-500' in x, string=label)
-                if label_tag:
-                    # Находим родительский контейнер d-flex
-                    parent = label_tag.find_parent('div', class_=lambda x: x and 'd-flex' in x)
-                    if parent:
-                        # Ищем следующий div с классом text-end, который содержит значение
-                        value_container = parent.find('div', class_=lambda x: x and 'text-end' in x)
-                        if value_container:
-                            value_tag = value_container.find('span', class_='text-uppercase')
-                            if value_tag:
-                                params[label.rstrip(':')] = self.extract_text(value_tag)
-
-            # Параметры тела (ищем в увлечениях)
-            hobbies_tag = soup.find('p', class_=lambda x: x and 'text-extra-medium-gray' in x)
-            if hobbies_tag:
-                hobbies_text = self.extract_text(hobbies_tag)
-
-                # Ищем параметры тела в формате "Параметры: 78/75/86"
-                import re
-                params_match = re.search(r'Параметры:\s*([\d/]+)', hobbies_text)
-                if params_match:
-                    params['Параметры'] = params_match.group(1)
-                    # Убираем параметры из текста увлечений
-                    hobbies_text = re.sub(r'Параметры:\s*[\d/]+\.?\s*', '', hobbies_text).strip()
-
-                # Оставляем только увлечения и хобби
-                if hobbies_text and len(hobbies_text) > 10 and 'не указаны' not in hobbies_text.lower():
-                    # Форматируем как expandable blockquote без заголовка
-                    formatted_hobbies = f"<blockquote expandable>" + '\n'.join(f"{line}" for line in hobbies_text.split('\n') if line.strip()) + "</blockquote>"
-                    params['Увлечения и хобби'] = formatted_hobbies
-
-            # Фотографии - берем только из основного слайдера, исключая миниатюры
-            photos = []
-            # Ищем основной контейнер слайдера
-            main_slider = soup.find('div', class_=lambda x: x and 'product-image-slider' in x)
-            if main_slider:
-                # Берем только изображения из основного слайдера
-                img_tags = main_slider.find_all('img', {'data-src': True})
-                for img in img_tags:
-                    src = img.get('data-src')
-                    if src and ('models' in src or 'slides' in src):
-                        if not src.startswith('http'):
-                            if src.startswith('/storage'):
-                                src = self.BASE_URL + src
-                            elif src.startswith('/'):
-                                src = self.BASE_URL + src
-                            else:
-                                src = self.BASE_URL + '/' + src
-                        photos.append(src)
-
-            result = {
-                'name': name,
-                'parameters': params,
-                'photos': photos,
-                'url': url
-            }
-
-            logger.info(f"Успешно спарсена модель: {name}")
+            result = self.parse_page(url, self._extract_detail)
+            result['url'] = url
             return result
 
         except Exception as e:
             logger.error(f"Ошибка при парсинге модели {url}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _extract_detail(self, soup) -> Dict:
+        """Извлекает имя, параметры и фотографии модели со страницы портфолио"""
+        # Извлечение имени модели
+        name_tag = soup.find('h1', class_=lambda x: x and 'title-extra-large-light' in x)
+        name = self.extract_text(name_tag)
+
+        # Извлечение параметров модели
+        params = {}
+
+        # Курс обучения
+        course_tag = soup.find('span', class_=lambda x: x and 'text-extra-medium' in x and 'text-uppercase' in x, string=lambda s: s and ('курс' in s.lower()))
+        if course_tag:
+            course_text = self.extract_text(course_tag)
+            # Убираем слово "курс" из текста
+            course_text = course_text.replace(' курс', '').replace('Курс', '').replace('курс', '').strip()
+            params['Курс'] = course_text
+
+        # Возраст
+        age_container = soup.find('span', class_=lambda x: x and 'font-weight-500' in x and 'text-extra-dark-gray' in x, string=lambda s: s and any(char.isdigit() for char in s))
+        if age_container:
+            age_text = self.extract_text(age_container)
+            if 'лет' in age_text.lower() or any(char.isdigit() for char in age_text):
+                params['Возраст'] = age_text
+
+        # Город
+        city_tag = soup.find('span', class_=lambda x: x and 'text-extra-medium' in x and 'text-uppercase' in x, string=lambda s: s and len(s.strip()) > 0)
+        if city_tag and self.extract_text(city_tag) not in ['Первый курс', 'Второй курс', 'Третий курс', 'Четвертый курс']:
+            params['Город'] = self.extract_text(city_tag)
+
+        # Параметры (рост, цвет волос, цвет глаз, размер обуви)
+        param_labels = ['Рост:', 'Цвет волос:', 'Цвет глаз:', 'Размер обуви:']
+        for label in param_labels:
+            label_tag = soup.find('span', class_=lambda x: x and 'font-weight-500' in x, string=label)
+            if label_tag:
+                # Находим родительский контейнер d-flex
+                parent = label_tag.find_parent('div', class_=lambda x: x and 'd-flex' in x)
+                if parent:
+                    # Ищем следующий div с классом text-end, который содержит значение
+                    value_container = parent.find('div', class_=lambda x: x and 'text-end' in x)
+                    if value_container:
+                        value_tag = value_container.find('span', class_='text-uppercase')
+                        if value_tag:
+                            params[label.rstrip(':')] = self.extract_text(value_tag)
+
+        # Параметры тела (ищем в увлечениях)
+        hobbies_tag = soup.find('p', class_=lambda x: x and 'text-extra-medium-gray' in x)
+        if hobbies_tag:
+            hobbies_text = self.extract_text(hobbies_tag)
+
+            # Ищем параметры тела в формате "Параметры: 78/75/86"
+            import re
+            params_match = re.search(r'Параметры:\s*([\d/]+)', hobbies_text)
+            if params_match:
+                params['Параметры'] = params_match.group(1)
+                # Убираем параметры из текста увлечений
+                hobbies_text = re.sub(r'Параметры:\s*[\d/]+\.?\s*', '', hobbies_text).strip()
+
+            # Оставляем только увлечения и хобби
+            if hobbies_text and len(hobbies_text) > 10 and 'не указаны' not in hobbies_text.lower():
+                # Форматируем как expandable blockquote без заголовка
+                formatted_hobbies = f"<blockquote expandable>" + '\n'.join(f"{line}" for line in hobbies_text.split('\n') if line.strip()) + "</blockquote>"
+                params['Увлечения и хобби'] = formatted_hobbies
+
+        # Фотографии - берем только из основного слайдера, исключая миниатюры
+        photos = []
+        # Ищем основной контейнер слайдера
+        main_slider = soup.find('div', class_=lambda x: x and 'product-image-slider' in x)
+        if main_slider:
+            # Берем только изображения из основного слайдера
+            img_tags = main_slider.find_all('img', {'data-src': True})
+            for img in img_tags:
+                src = img.get('data-src')
+                if src and ('models' in src or 'slides' in src):
+                    photos.append(self.media_url(src))
+            # Слайдер может повторять одни и те же слайды (например, для бесконечной прокрутки)
+            photos = unique_urls(photos)
+
+        result = {
+            'name': name,
+            'parameters': params,
+            'photos': photos
+        }
+
+        logger.info(f"Успешно спарсена модель: {name}")
+        return result
\ No newline at end of file
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from typing import Any, Callable, Optional
+
+from .cache_dir import evict_lru
+
+logger = logging.getLogger(__name__)
+
+class ParseMemo:
+    """
+    Дисковый кэш результатов разбора страниц по хэшу их содержимого
+
+    Ключ записи - имя парсера, версия правил разбора и SHA-256 текста страницы. Если сайт
+    вернул ту же страницу, что и раньше, записи берутся из кэша без построения дерева
+    BeautifulSoup. Кэш хранится на диске (JSON, сжатый zlib) и переживает перезапуск бота;
+    при изменении правил разбора парсер повышает PARSER_VERSION, и старые записи
+    перестают использоваться. Размер кэша ограничен, лишние записи вытесняются по давности использования.
+    """
+
+    def __init__(self, cache_dir: str = 'cache/parsed', max_size_mb: int = 20):
+        """
+        Args:
+            cache_dir: Каталог кэша
+            max_size_mb: Максимальный размер кэша на диске в мегабайтах
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> 'ParseMemo':
+        """Создает кэш по переменным окружения PARSE_MEMO_DIR и PARSE_MEMO_MAX_MB"""
+        return cls(
+            cache_dir=os.getenv('PARSE_MEMO_DIR', 'cache/parsed'),
+            max_size_mb=int(os.getenv('PARSE_MEMO_MAX_MB', '20'))
+        )
+
+    @staticmethod
+    def key(name: str, version: int, html: str) -> str:
+        """Ключ записи: имя парсера, версия правил разбора и хэш текста страницы"""
+        digest = hashlib.sha256(f"{name}:{version}:".encode('utf-8'))
+        digest.update(html.encode('utf-8', errors='replace'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json.z")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Возвращает сохраненный результат разбора или None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+            # Отмечаем обращение для вытеснения по давности использования
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            return None
+        return value
+
+    def put(self, key: str, value: Any):
+        """Сохраняет результат разбора"""
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            data = zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'), 6)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Не удалось сохранить результат разбора в кэш: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict()
+
+    def get_or_parse(self, name: str, version: int, html: str, parse: Callable[[], Any]) -> Any:
+        """
+        Возвращает результат разбора страницы из кэша или разбирает ее и сохраняет результат
+
+        Args:
+            name: Имя разбора (парсер и вид страницы)
+            version: Версия правил разбора
+            html: Текст страницы
+            parse: Функция разбора, вызывается только при промахе кэша
+
+        Returns:
+            Результат разбора (при попадании - новая копия сохраненных данных)
+        """
+        key = self.key(name, version, html)
+        value = self.get(key)
+        if value is not None:
+            logger.debug(f"Страница не изменилась, результат разбора {name} взят из кэша")
+            return value
+
+        value = parse()
+        if value is not None:
+            self.put(key, value)
+        return value
+
+    def _evict(self):
+        """Удаляет давно не использованные записи, пока кэш не уложится в лимит"""
+        with self._lock:
+            evict_lru(self.cache_dir, '.json.z', self.max_size)
+
+_default_memo = None
+_default_memo_lock = threading.Lock()
+
+def get_default_memo() -> Optional[ParseMemo]:
+    """Общий для всех парсеров кэш разбора, настроенный через переменные окружения (None, если PARSE_MEMO_MAX_MB=0)"""
+    global _default_memo
+    with _default_memo_lock:
+        if _default_memo is None and os.getenv('PARSE_MEMO_MAX_MB', '20') != '0':
+            _default_memo = ParseMemo.from_env()
+        return _default_memo
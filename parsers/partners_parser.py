@@ -1,12 +1,16 @@
 import logging
 from typing import List, Dict, Optional
 from .base_parser import BaseParser
+from .sections import PageSection
 
 logger = logging.getLogger(__name__)
 
 class PartnersParser(BaseParser):
     """Парсер для партнеров с сайта armodels.ru"""
 
+    # Слайдер с логотипами партнеров на главной странице
+    LIST_SECTION = PageSection('div', marker='id="swiper-wrapper-partners"', id='swiper-wrapper-partners')
+
     def parse_list(self) -> List[Dict]:
         """
         Парсит список всех партнеров с главной страницы
@@ -16,75 +20,60 @@ class PartnersParser(BaseParser):
         """
         try:
             # Парсим главную страницу
-            soup = self.get_page_content('/')
-
-            partners = []
-
-            # Ищем секцию с партнерами по заголовку
-            partners_section = None
-            for section in soup.find_all('section'):
-                if section.find('span', string=lambda x: x and 'партнёры' in x.lower()):
-                    partners_section = section
-                    break
-
-            if not partners_section:
-                logger.warning("Секция с партнерами не найдена")
-                return []
-
-            # Ищем swiper-wrapper с партнерами
-            swiper_wrapper = partners_section.find('div', id='swiper-wrapper-partners')
-            if not swiper_wrapper:
-                logger.warning("Swiper wrapper с партнерами не найден")
-                return []
-
-            # Ищем все слайды с партнерами
-            partner_slides = swiper_wrapper.find_all('div', class_='swiper-slide')
-
-            for slide in partner_slides:
-                try:
-                    # Ищем изображение партнера
-                    img_elem = slide.find('img')
-                    if not img_elem:
-                        continue
-
-                    # Получаем название из alt атрибута
-                    name = img_elem.get('alt', '').strip()
-
-                    # Получаем URL логотипа
-                    logo_src = img_elem.get('data-src') or img_elem.get('src')
-                    logo = None
-                    if logo_src:
-                        if not logo_src.startswith('http'):
-                            logo = f"{self.BASE_URL}{logo_src}"
-                        else:
-                            logo = logo_src
-
-                    # Ищем ссылку на партнера
-                    link_elem = slide.find('a')
-                    website = None
-                    if link_elem:
-                        href = link_elem.get('href')
-                        if href and not href.startswith('javascript'):
-                            website = href if href.startswith('http') else f"{self.BASE_URL}{href}"
-
-                    if name or logo:  # Добавляем если есть хотя бы название или логотип
-                        partners.append({
-                            'name': name or 'Без названия',
-                            'logo': logo,
-                            'website': website
-                        })
-
-                except Exception as e:
-                    logger.warning(f"Ошибка при парсинге партнера: {e}")
-                    continue
-
-            logger.info(f"Успешно спарсено {len(partners)} партнеров")
-            return partners
+            return self.parse_page('/', self._extract_list, section=self.LIST_SECTION)
 
         except Exception as e:
             logger.error(f"Ошибка при парсинге списка партнеров: {e}")
             return []
 
+    def _extract_list(self, soup) -> List[Dict]:
+        """Извлекает партнеров из слайдера главной страницы"""
+        partners = []
+
+        # Ищем swiper-wrapper с партнерами
+        swiper_wrapper = soup.find('div', id='swiper-wrapper-partners')
+        if not swiper_wrapper:
+            logger.warning("Swiper wrapper с партнерами не найден")
+            return []
+
+        # Ищем все слайды с партнерами
+        partner_slides = swiper_wrapper.find_all('div', class_='swiper-slide')
+
+        for slide in partner_slides:
+            try:
+                # Ищем изображение партнера
+                img_elem = slide.find('img')
+                if not img_elem:
+                    continue
+
+                # Получаем название из alt атрибута
+                name = img_elem.get('alt', '').strip()
+
+                # Получаем URL логотипа
+                logo = self.media_url(img_elem.get('data-src') or img_elem.get('src'))
+
+                # Ищем ссылку на партнера
+                link_elem = slide.find('a')
+                website = None
+                if link_elem:
+                    href = link_elem.get('href')
+                    if href and not href.startswith('javascript'):
+                        website = href if href.startswith('http') else f"{self.BASE_URL}{href}"
+
+                if name or logo:  # Добавляем если есть хотя бы название или логотип
+                    partners.append({
+                        'name': name or 'Без названия',
+                        'logo': logo,
+                        'website': website
+                    })
+
+            except Exception as e:
+                logger.warning(f"Ошибка при парсинге партнера: {e}")
+                continue
+
+        logger.info(f"Успешно спарсено {len(partners)} партнеров")
+        return partners
+
     def parse_detail(self, url: str) -> Optional[Dict]:
         """
         Парсит детальную информацию о партнере
@@ -1,12 +1,16 @@
 import logging
 from typing import List, Dict, Optional
 from .base_parser import BaseParser
+from .sections import PageSection
 
 logger = logging.getLogger(__name__)
 
 class ProjectsParser(BaseParser):
     """Парсер для проектов с сайта armodels.ru"""
 
+    # Сетка карточек проектов на странице /projects
+    LIST_SECTION = PageSection('ul', marker='blog-grid', class_='blog-grid')
+
     # Категории проектов
     CATEGORIES = {
         'photo-projects': 'Фотопроекты',
@@ -27,51 +31,81 @@ class ProjectsParser(BaseParser):
         Returns:
             Список словарей с информацией о проектах
         """
+        dataset = self.parse_partitioned()
+        if not category:
+            return dataset['projects']
+        return self.get_category_view(dataset, category)
+
+    def parse_partitioned(self) -> Dict:
+        """
+        Парсит страницу /projects один раз и раскладывает проекты по категориям
+
+        Returns:
+            Словарь {'projects': общий список проектов,
+                     'categories': {код_категории: [индексы в общем списке]}}
+        """
         try:
-            # Парсим главную страницу проектов
-            soup = self.get_page_content('/projects')
-
-            projects = []
-
-            # Ищем контейнер с проектами
-            projects_container = soup.find('ul', class_=lambda x: x and 'blog-grid' in x and 'grid' in x)
-            if not projects_container:
-                logger.warning("Контейнер с проектами не найден")
-                return []
-
-            # Ищем все элементы проектов
-            project_items = projects_container.find_all('li', class_=lambda x: x and 'grid-item' in x)
-            logger.info(f"Найдено {len(project_items)} элементов проектов")
-
-            for item in project_items:
-                try:
-                    # Определяем категорию проекта
-                    item_classes = item.get('class', [])
-                    project_category = None
-                    for class_name in item_classes:
-                        if class_name in self.CATEGORIES:
-                            project_category = class_name
-                            break
-
-                    # Если указана конкретная категория, пропускаем другие
-                    if category and project_category != category:
-                        continue
-
-                    # Извлекаем данные проекта
-                    project_data = self._extract_project_data(item, project_category)
-                    if project_data:
-                        projects.append(project_data)
-
-                except Exception as e:
-                    logger.warning(f"Ошибка при парсинге проекта: {e}")
-                    continue
-
-            logger.info(f"Успешно спарсено {len(projects)} проектов")
-            return projects
+            return self.parse_page('/projects', self._extract_partitioned, section=self.LIST_SECTION)
 
         except Exception as e:
             logger.error(f"Ошибка при парсинге списка проектов: {e}")
-            return []
+            return {'projects': [], 'categories': {code: [] for code in self.CATEGORIES}}
+
+    def _extract_partitioned(self, soup) -> Dict:
+        """Извлекает проекты из сетки страницы /projects и раскладывает их по категориям"""
+        dataset = {'projects': [], 'categories': {code: [] for code in self.CATEGORIES}}
+
+        # Ищем контейнер с проектами
+        projects_container = soup.find('ul', class_=lambda x: x and 'blog-grid' in x and 'grid' in x)
+        if not projects_container:
+            logger.warning("Контейнер с проектами не найден")
+            return dataset
+
+        # Ищем все элементы проектов
+        project_items = projects_container.find_all('li', class_=lambda x: x and 'grid-item' in x)
+        logger.info(f"Найдено {len(project_items)} элементов проектов")
+
+        projects = dataset['projects']
+        for item in project_items:
+            try:
+                # Определяем категорию проекта
+                item_classes = item.get('class', [])
+                project_category = None
+                for class_name in item_classes:
+                    if class_name in self.CATEGORIES:
+                        project_category = class_name
+                        break
+
+                # Извлекаем данные проекта
+                project_data = self._extract_project_data(item, project_category)
+                if project_data:
+                    if project_category:
+                        dataset['categories'][project_category].append(len(projects))
+                    projects.append(project_data)
+
+            except Exception as e:
+                logger.warning(f"Ошибка при парсинге проекта: {e}")
+                continue
+
+        logger.info(f"Успешно спарсено {len(projects)} проектов")
+        return dataset
+
+    @staticmethod
+    def get_category_view(dataset: Dict, category: Optional[str] = None) -> List[Dict]:
+        """
+        Возвращает проекты категории из разбитого по категориям набора данных
+
+        Args:
+            dataset: Результат parse_partitioned()
+            category: Код категории или None для всех проектов
+
+        Returns:
+            Список проектов (ссылки на элементы общего списка, без копирования)
+        """
+        projects = dataset['projects']
+        if not category:
+            return projects
+        return [projects[idx] for idx in dataset['categories'].get(category, [])]
 
     def _extract_project_data(self, item, category: Optional[str]) -> Optional[Dict]:
         """Извлекает данные одного проекта"""
@@ -80,11 +114,7 @@ class ProjectsParser(BaseParser):
             img_elem = item.find('img')
             image_url = None
             if img_elem:
-                image_src = img_elem.get('data-src') or img_elem.get('src')
-                if image_src and not image_src.startswith('http'):
-                    image_url = f"{self.BASE_URL}{image_src}"
-                else:
-                    image_url = image_src
+                image_url = self.media_url(img_elem.get('data-src') or img_elem.get('src'))
 
             # Извлекаем название проекта
             title_elem = item.find('a', class_=lambda x: x and 'text-extra-medium' in x and 'text-extra-dark-gray' in x)
@@ -0,0 +1,87 @@
+import logging
+import re
+from typing import Optional
+
+from bs4 import SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+# Участки, внутри которых теги не считаются (комментарии, скрипты, стили)
+_OPAQUE_END = {'<!--': '-->', '<script': '</script>', '<style': '</style>'}
+
+class PageSection:
+    """
+    Участок страницы, который нужен парсеру
+
+    Описывает элемент страницы (тег и атрибуты) и строку-маркер из его открывающего тега.
+    По маркеру из HTML заранее вырезается только этот элемент, а SoupStrainer оставляет
+    в дереве только его, поэтому время разбора и память зависят от размера участка, а не страницы.
+    """
+
+    def __init__(self, tag: str, marker: Optional[str] = None, **attrs):
+        """
+        Args:
+            tag: Тег элемента ('div', 'section', 'ul', 'li')
+            marker: Строка из открывающего тега элемента (id или уникальный класс).
+                    None - HTML не вырезается, отбираются все подходящие элементы страницы
+            **attrs: Атрибуты элемента для SoupStrainer (id=..., class_=...)
+        """
+        self.tag = tag
+        self.marker = marker
+        self.attrs = attrs
+        self._tag_re = re.compile(rf'<!--|<script\b|<style\b|<(/?){tag}\b', re.IGNORECASE)
+
+    def strainer(self) -> SoupStrainer:
+        """Фильтр построения дерева: в дерево попадают только подходящие элементы с содержимым"""
+        attrs = dict(self.attrs)
+        if isinstance(attrs.get('class_'), str):
+            # При построении дерева class сравнивается целой строкой атрибута, а не по отдельным классам
+            attrs['class_'] = re.compile(rf'(^|\s){re.escape(attrs["class_"])}(\s|$)')
+        return SoupStrainer(self.tag, **attrs)
+
+    def cut(self, html: str) -> Optional[str]:
+        """
+        Вырезает HTML элемента по маркеру
+
+        Закрывающий тег ищется подсчетом вложенных тегов того же имени без учета комментариев,
+        скриптов и стилей. Если маркер не найден или элемент не удалось однозначно выделить,
+        возвращается None и страница разбирается целиком.
+
+        Args:
+            html: Текст страницы
+
+        Returns:
+            HTML элемента или None
+        """
+        if not self.marker:
+            return None
+
+        position = html.find(self.marker)
+        if position < 0:
+            return None
+        start = html.rfind('<' + self.tag, 0, position)
+        # Маркер должен находиться внутри открывающего тега элемента
+        if start < 0 or '>' in html[start:position]:
+            return None
+
+        depth = 0
+        position = start
+        while True:
+            match = self._tag_re.search(html, position)
+            if not match:
+                return None
+            token = match.group(0).lower()
+            if token in _OPAQUE_END:
+                position = html.find(_OPAQUE_END[token], match.end())
+                if position < 0:
+                    return None
+                continue
+
+            position = match.end()
+            if match.group(1):
+                depth -= 1
+                if depth == 0:
+                    end = html.find('>', position)
+                    return html[start:end + 1] if end >= 0 else None
+            else:
+                depth += 1
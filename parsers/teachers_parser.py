@@ -1,12 +1,16 @@
 import logging
 from typing import List, Dict, Optional
 from .base_parser import BaseParser
+from .sections import PageSection
 
 logger = logging.getLogger(__name__)
 
 class TeachersParser(BaseParser):
     """Парсер для учителей с сайта armodels.ru"""
 
+    # Слайдер с учителями на главной странице
+    LIST_SECTION = PageSection('div', marker='id="swiper-wrapper-teacher"', id='swiper-wrapper-teacher')
+
     def parse_list(self) -> List[Dict]:
         """
         Парсит список всех учителей с главной страницы
@@ -16,74 +20,66 @@ class TeachersParser(BaseParser):
         """
         try:
             # Парсим главную страницу
-            soup = self.get_page_content('/')
-
-            teachers = []
-
-            # Ищем секцию с учителями
-            teacher_section = soup.find('section', class_='padding-6-rem-top')
-            if not teacher_section:
-                logger.warning("Секция с учителями не найдена")
-                return []
-
-            # Ищем swiper-wrapper с учителями
-            swiper_wrapper = teacher_section.find('div', id='swiper-wrapper-teacher')
-            if not swiper_wrapper:
-                logger.warning("Swiper wrapper с учителями не найден")
-                return []
-
-            # Ищем все слайды с учителями
-            teacher_slides = swiper_wrapper.find_all('div', class_='swiper-slide')
-
-            for slide in teacher_slides:
-                try:
-                    # Ищем имя учителя
-                    name_elem = slide.find('span', class_='team-title')
-                    if not name_elem:
-                        continue
-
-                    # Очищаем имя от лишних пробелов и переносов строк
-                    name_text = name_elem.get_text()
-                    # Убираем лишние пробелы и переносы строк
-                    import re
-                    name = re.sub(r'\s+', ' ', name_text).strip()
-
-                    # Ищем специальность
-                    specialty_elem = slide.find('span', class_='team-sub-title')
-                    if specialty_elem:
-                        specialty_text = specialty_elem.get_text()
-                        specialty = re.sub(r'\s+', ' ', specialty_text).strip()
-                    else:
-                        specialty = 'Преподаватель'
-
-                    # Ищем фото
-                    img_elem = slide.find('img')
-                    photo = None
-                    if img_elem:
-                        photo_src = img_elem.get('data-src') or img_elem.get('src')
-                        if photo_src and not photo_src.startswith('http'):
-                            photo = f"{self.BASE_URL}{photo_src}"
-                        else:
-                            photo = photo_src
-
-                    if name:  # Добавляем только если есть имя
-                        teachers.append({
-                            'name': name,
-                            'specialty': specialty,
-                            'photo': photo
-                        })
-
-                except Exception as e:
-                    logger.warning(f"Ошибка при парсинге учителя: {e}")
-                    continue
-
-            logger.info(f"Успешно спарсено {len(teachers)} учителей")
-            return teachers
+            return self.parse_page('/', self._extract_list, section=self.LIST_SECTION)
 
         except Exception as e:
             logger.error(f"Ошибка при парсинге списка учителей: {e}")
             return []
 
+    def _extract_list(self, soup) -> List[Dict]:
+        """Извлекает учителей из слайдера главной страницы"""
+        teachers = []
+
+        # Ищем swiper-wrapper с учителями
+        swiper_wrapper = soup.find('div', id='swiper-wrapper-teacher')
+        if not swiper_wrapper:
+            logger.warning("Swiper wrapper с учителями не найден")
+            return []
+
+        # Ищем все слайды с учителями
+        teacher_slides = swiper_wrapper.find_all('div', class_='swiper-slide')
+
+        for slide in teacher_slides:
+            try:
+                # Ищем имя учителя
+                name_elem = slide.find('span', class_='team-title')
+                if not name_elem:
+                    continue
+
+                # Очищаем имя от лишних пробелов и переносов строк
+                name_text = name_elem.get_text()
+                # Убираем лишние пробелы и переносы строк
+                import re
+                name = re.sub(r'\s+', ' ', name_text).strip()
+
+                # Ищем специальность
+                specialty_elem = slide.find('span', class_='team-sub-title')
+                if specialty_elem:
+                    specialty_text = specialty_elem.get_text()
+                    specialty = re.sub(r'\s+', ' ', specialty_text).strip()
+                else:
+                    specialty = 'Преподаватель'
+
+                # Ищем фото
+                img_elem = slide.find('img')
+                photo = None
+                if img_elem:
+                    photo = self.media_url(img_elem.get('data-src') or img_elem.get('src'))
+
+                if name:  # Добавляем только если есть имя
+                    teachers.append({
+                        'name': name,
+                        'specialty': specialty,
+                        'photo': photo
+                    })
+
+            except Exception as e:
+                logger.warning(f"Ошибка при парсинге учителя: {e}")
+                continue
+
+        logger.info(f"Успешно спарсено {len(teachers)} учителей")
+        return teachers
+
     def parse_detail(self, url: str) -> Optional[Dict]:
         """
         Парсит детальную информацию об учителе
@@ -11,22 +11,28 @@ from dotenv import load_dotenv
 # Загружаем переменные окружения из .env файла
 load_dotenv()
 
-# Проверяем наличие токена
-token = os.getenv('TELEGRAM_BOT_TOKEN')
-if not token:
+# Проверяем наличие токена: один бот (TELEGRAM_BOT_TOKEN) или несколько через запятую (TELEGRAM_BOT_TOKENS)
+tokens = [t.strip() for t in os.getenv('TELEGRAM_BOT_TOKENS', '').split(',') if t.strip()]
+if not tokens and os.getenv('TELEGRAM_BOT_TOKEN'):
+    tokens = [os.getenv('TELEGRAM_BOT_TOKEN')]
+if not tokens:
     print("Ошибка: TELEGRAM_BOT_TOKEN не найден в .env файле")
     print("Создайте .env файл на основе .env.example и добавьте ваш токен")
     sys.exit(1)
 
 # Импортируем и запускаем бота
 try:
-    from armodels_bot import ModelsTelegramBot
+    from armodels_bot import ModelsTelegramBot, run_bots
 
     print("Запуск ARModels Telegram Bot...")
-    print(f"Токен бота: {token[:10]}...")
-
-    bot = ModelsTelegramBot(token)
-    bot.run()
+    for token in tokens:
+        print(f"Токен бота: {token[:10]}...")
+
+    if len(tokens) == 1:
+        bot = ModelsTelegramBot(tokens[0])
+        bot.run()
+    else:
+        run_bots(tokens)
 
 except ImportError as e:
     print(f"Ошибка импорта: {e}")
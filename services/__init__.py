@@ -0,0 +1 @@
+# Services package for ARModels bot
\ No newline at end of file
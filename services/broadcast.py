@@ -0,0 +1,394 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from telegram.error import BadRequest, ChatMigrated, Forbidden, RetryAfter, TelegramError
+
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class BroadcastEngine:
+    """
+    Подписки на уведомления и рассылки о новых записях наборов данных
+
+    При публикации новой версии набора (журналы, модели) она сравнивается с предыдущей:
+    если появились новые записи, в общем хранилище создается рассылка с порядковым номером.
+    Рассылки не зависят от бота; каждый бот доставляет их своим подписчикам (см. Broadcaster).
+    Подписки хранятся в хэше subscriptions:{бот}:{тема}, поэтому видны всем экземплярам бота.
+    """
+
+    # Темы подписки: набор данных и поля, по которым запись считается той же самой
+    TOPICS = {
+        'magazines': ('pdf_url', 'issue_number'),
+        'models': ('url',),
+    }
+    # Сколько хранить рассылки и ход их доставки (секунды)
+    JOB_RETENTION = 7 * 24 * 60 * 60
+    # Если новыми оказалась большая часть набора, это скорее перестройка сайта, чем новые записи
+    MAX_NEW_SHARE = 0.5
+    # Сколько новых записей указывать в одной рассылке (о моделях)
+    MAX_ITEMS = 10
+
+    def __init__(self, store: BaseStore):
+        """
+        Args:
+            store: Общее хранилище
+        """
+        self.store = store
+
+    def _subscriptions_key(self, bot_id: str, topic: str) -> str:
+        return f"subscriptions:{bot_id}:{topic}"
+
+    def subscribe(self, bot_id: str, topic: str, chat_id: int):
+        self.store.hset(self._subscriptions_key(bot_id, topic), str(chat_id), int(time.time()))
+
+    def unsubscribe(self, bot_id: str, topic: str, chat_id: int):
+        self.store.hdel(self._subscriptions_key(bot_id, topic), str(chat_id))
+
+    def is_subscribed(self, bot_id: str, topic: str, chat_id: int) -> bool:
+        return self.store.hget(self._subscriptions_key(bot_id, topic), str(chat_id)) is not None
+
+    def subscribers(self, bot_id: str, topic: str) -> List[int]:
+        """Чаты, подписанные на тему, в постоянном порядке"""
+        return sorted(int(chat_id) for chat_id in self.store.hgetall(self._subscriptions_key(bot_id, topic)))
+
+    def unsubscribe_everywhere(self, bot_id: str, chat_id: int):
+        """Удаляет чат из всех подписок бота (бот заблокирован или чат удален)"""
+        for topic in self.TOPICS:
+            self.unsubscribe(bot_id, topic, chat_id)
+
+    def identity(self, name: str, record: Dict) -> Optional[str]:
+        """Значение, по которому запись узнается в разных версиях набора"""
+        return next((record[field] for field in self.TOPICS[name] if record.get(field)), None)
+
+    def find_record(self, name: str, data: List[Dict], record: Dict) -> Optional[int]:
+        """Индекс записи в другой версии набора или None, если ее там нет"""
+        key = self.identity(name, record)
+        return next((idx for idx, item in enumerate(data) if key is not None and self.identity(name, item) == key), None)
+
+    def new_records(self, name: str, previous: Optional[List[Dict]], current: List[Dict]) -> List[Tuple[int, Dict]]:
+        """
+        Записи новой версии набора, которых не было в предыдущей
+
+        Args:
+            name: Имя набора (тема подписки)
+            previous: Предыдущая версия (None - набор публикуется впервые, уведомлять не о чем)
+            current: Новая версия
+
+        Returns:
+            Список (индекс в новой версии, запись)
+        """
+        if not previous or name not in self.TOPICS:
+            return []
+        known = {self.identity(name, record) for record in previous}
+        added = [(idx, record) for idx, record in enumerate(current)
+                 if self.identity(name, record) is not None and self.identity(name, record) not in known]
+        if len(added) > len(current) * self.MAX_NEW_SHARE:
+            logger.warning(f"В наборе {name} новыми оказались {len(added)} из {len(current)} записей, "
+                           f"уведомления не отправляются")
+            return []
+        return added
+
+    def on_publish(self, name: str, version: int, previous: Optional[Any], data: Any):
+        """Обработчик публикации набора данных: создает рассылки о новых записях"""
+        added = self.new_records(name, previous, data)
+        if not added:
+            return
+        if name == 'magazines':
+            # О каждом выпуске - отдельное сообщение с его обложкой
+            for idx, record in added:
+                self.create_job(name, version, [(idx, record)], len(added))
+        else:
+            self.create_job(name, version, added[:self.MAX_ITEMS], len(added))
+
+    def create_job(self, topic: str, version: int, items: List[Tuple[int, Dict]], total: int) -> int:
+        """
+        Создает рассылку
+
+        Args:
+            topic: Тема подписки
+            version: Версия набора, к которой относятся индексы записей
+            items: Новые записи (индекс, запись)
+            total: Сколько всего новых записей
+
+        Returns:
+            Номер рассылки
+        """
+        job_id = self.store.incr('broadcast:seq')
+        job = {
+            'id': job_id,
+            'topic': topic,
+            'version': version,
+            'items': [{'idx': idx, 'record': record} for idx, record in items],
+            'total': total,
+            'created': time.time(),
+        }
+        self.store.set(f"broadcast:job:{job_id}", job, ttl=self.JOB_RETENTION)
+        logger.info(f"Создана рассылка {job_id} ({topic}): новых записей {total}")
+        return job_id
+
+    def last_job_id(self) -> int:
+        return self.store.get('broadcast:seq') or 0
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        return self.store.get(f"broadcast:job:{job_id}")
+
+class RateLimiter:
+    """Равномерное распределение отправок во времени: не больше rate сообщений в секунду"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def acquire(self):
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        """Откладывает следующие отправки (ответ Telegram 429 Retry-After)"""
+        self._next = max(self._next, time.monotonic() + seconds)
+
+class Broadcaster:
+    """
+    Доставка рассылок подписчикам одного бота
+
+    Рассылку доставляет один экземпляр бота - тот, что удерживает блокировку broadcast:{бот}.
+    Список получателей фиксируется при начале рассылки, а после каждой пачки сохраняется
+    позиция, поэтому после перезапуска доставка продолжается с места остановки (повторно
+    может прийти не больше одной пачки). Сообщения отправляются не быстрее rate в секунду -
+    ниже общего лимита Telegram (около 30 в секунду), чтобы оставался запас для ответов
+    пользователям; пока бот обрабатывает много обновлений, рассылка ждет. Обложка загружается
+    в Telegram один раз, остальным подписчикам она отправляется по file_id.
+    """
+
+    DEFAULT_RATE = 20.0
+    BATCH_SIZE = 100
+    # Сколько сообщений рассылки может ожидать ответа Telegram одновременно
+    MAX_IN_FLIGHT = 10
+    # Рассылка уступает очередь, пока одновременно обрабатывается столько обновлений пользователей
+    BUSY_UPDATES = 8
+    # Дольше этого рассылка не ждет перед каждым сообщением, чтобы не остановиться совсем
+    MAX_YIELD = 2.0
+    POLL_INTERVAL = 5.0
+    LOCK_TTL = 60
+    # Рассылки старше этого (например, после долгого простоя) не доставляются
+    MAX_JOB_AGE = 24 * 60 * 60
+    SEND_ATTEMPTS = 3
+
+    def __init__(self, engine: BroadcastEngine, bot, bot_id: str, node_id: str,
+                 render: Callable[[Dict], Optional[Dict]], rate: float = DEFAULT_RATE, update_processor=None,
+                 get_file_id: Optional[Callable[[str], Optional[str]]] = None,
+                 remember_file_id: Optional[Callable[[str, Any], None]] = None):
+        """
+        Args:
+            engine: Рассылки и подписки
+            bot: telegram.Bot, от имени которого отправляются сообщения
+            bot_id: Идентификатор бота
+            node_id: Идентификатор текущего узла
+            render: Функция, строящая сообщение рассылки: {'text', 'photo', 'reply_markup'} или None
+            rate: Сообщений рассылки в секунду
+            update_processor: Обработчик обновлений бота (его загрузка замедляет рассылку)
+            get_file_id: Возвращает file_id ранее отправленного фото по его URL
+            remember_file_id: Запоминает file_id фото из отправленного сообщения
+        """
+        self.engine = engine
+        self.store = engine.store
+        self.bot = bot
+        self.bot_id = bot_id
+        self.node_id = node_id
+        self.render = render
+        self.limiter = RateLimiter(rate)
+        self.update_processor = update_processor
+        self.get_file_id = get_file_id
+        self.remember_file_id = remember_file_id
+        self.lock_name = f"lock:broadcast:{bot_id}"
+        self._task = None
+
+    def start(self):
+        """Запускает доставку рассылок в фоне"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Останавливает доставку (позиция сохранена после последней отправленной пачки)"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.store.run(self.store.release_lock, self.lock_name, self.node_id)
+
+    async def run(self):
+        while True:
+            try:
+                if await self.store.run(self._acquire):
+                    await self.deliver_pending()
+            except Exception as e:
+                logger.error(f"Ошибка при доставке рассылок бота {self.bot_id}: {e}")
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    def _acquire(self) -> bool:
+        try:
+            return self.store.acquire_lock(self.lock_name, self.node_id, self.LOCK_TTL)
+        except Exception as e:
+            logger.error(f"Не удалось захватить блокировку рассылки: {e}")
+            return False
+
+    async def deliver_pending(self):
+        """Доставляет рассылки, созданные после последней доставленной"""
+        cursor_key = f"broadcast:cursor:{self.bot_id}"
+        cursor = await self.store.run(self.store.get, cursor_key)
+        last_job_id = await self.store.run(self.engine.last_job_id)
+        if cursor is None:
+            # Новому боту не отправляются рассылки, созданные до его первого запуска
+            await self.store.run(self.store.set, cursor_key, last_job_id)
+            return
+
+        for job_id in range(cursor + 1, last_job_id + 1):
+            job = await self.store.run(self.engine.get_job, job_id)
+            if job and time.time() - job['created'] <= self.MAX_JOB_AGE:
+                if not await self.deliver(job):
+                    return
+            await self.store.run(self.store.set, cursor_key, job_id)
+
+    async def deliver(self, job: Dict) -> bool:
+        """
+        Доставляет рассылку, продолжая с сохраненной позиции
+
+        Returns:
+            False, если блокировка рассылки перешла к другому узлу и доставка прервана
+        """
+        progress_key = f"broadcast:progress:{self.bot_id}:{job['id']}"
+        recipients_key = f"broadcast:recipients:{self.bot_id}:{job['id']}"
+        progress = await self.store.run(self.store.get, progress_key)
+        if progress is None:
+            recipients = await self.store.run(self.engine.subscribers, self.bot_id, job['topic'])
+            progress = {'offset': 0, 'sent': 0, 'failed': 0, 'unsubscribed': 0, 'file_id': None}
+            await self.store.run(self.store.set, recipients_key, recipients, ttl=BroadcastEngine.JOB_RETENTION)
+            await self.store.run(self.store.set, progress_key, progress, ttl=BroadcastEngine.JOB_RETENTION)
+        else:
+            recipients = await self.store.run(self.store.get, recipients_key) or []
+
+        message = self.render(job) if progress['offset'] < len(recipients) else None
+        if message is None:
+            return True
+        if message.get('photo') and not progress['file_id'] and self.get_file_id:
+            progress['file_id'] = await self.store.run(self.get_file_id, message['photo'])
+
+        started = time.monotonic()
+        while progress['offset'] < len(recipients):
+            if not await self.store.run(self._acquire):
+                logger.info(f"Рассылка {job['id']} продолжится на другом узле")
+                return False
+            batch = recipients[progress['offset']:progress['offset'] + self.BATCH_SIZE]
+
+            if message.get('photo') and not progress['file_id']:
+                # Обложка загружается в Telegram первым сообщением, остальным уходит ее file_id
+                result = await self._send(batch[0], message, None)
+                self._count(progress, result)
+                batch = batch[1:]
+                progress['offset'] += 1
+
+            semaphore = asyncio.Semaphore(self.MAX_IN_FLIGHT)
+
+            async def send(chat_id):
+                async with semaphore:
+                    return await self._send(chat_id, message, progress['file_id'])
+
+            for result in await asyncio.gather(*(send(chat_id) for chat_id in batch)):
+                self._count(progress, result)
+            progress['offset'] += len(batch)
+            await self.store.run(self.store.set, progress_key, progress, ttl=BroadcastEngine.JOB_RETENTION)
+
+        logger.info(f"Рассылка {job['id']} бота {self.bot_id} доставлена за {time.monotonic() - started:.1f} с: "
+                    f"отправлено {progress['sent']}, ошибок {progress['failed']}, отписано {progress['unsubscribed']}")
+        return True
+
+    def _count(self, progress: Dict, result: Tuple[str, Optional[str]]):
+        status, file_id = result
+        progress[status] += 1
+        if file_id and not progress['file_id']:
+            progress['file_id'] = file_id
+
+    def _migrate_subscriptions(self, chat_id: int, new_chat_id: int):
+        """Переносит подписки чата на новый ID (блокирующий вызов)"""
+        for topic in BroadcastEngine.TOPICS:
+            if self.engine.is_subscribed(self.bot_id, topic, chat_id):
+                self.engine.unsubscribe(self.bot_id, topic, chat_id)
+                self.engine.subscribe(self.bot_id, topic, new_chat_id)
+
+    async def _yield_to_users(self):
+        """Ждет, пока бот отвечает пользователям (не дольше MAX_YIELD)"""
+        if self.update_processor is None:
+            return
+        deadline = time.monotonic() + self.MAX_YIELD
+        while self.update_processor.current_concurrent_updates >= self.BUSY_UPDATES and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    async def _send(self, chat_id: int, message: Dict, file_id: Optional[str]) -> Tuple[str, Optional[str]]:
+        """
+        Отправляет сообщение рассылки одному чату
+
+        Returns:
+            (итог: sent, failed или unsubscribed; file_id загруженной обложки)
+        """
+        for attempt in range(self.SEND_ATTEMPTS):
+            await self._yield_to_users()
+            await self.limiter.acquire()
+            try:
+                if message.get('photo'):
+                    sent = await self.bot.send_photo(
+                        chat_id=chat_id,
+                        photo=file_id or message['photo'],
+                        caption=message['text'],
+                        parse_mode='HTML',
+                        reply_markup=message.get('reply_markup')
+                    )
+                    if not file_id and sent.photo:
+                        if self.remember_file_id:
+                            await self.store.run(self.remember_file_id, message['photo'], sent)
+                        return 'sent', sent.photo[-1].file_id
+                else:
+                    await self.bot.send_message(
+                        chat_id=chat_id,
+                        text=message['text'],
+                        parse_mode='HTML',
+                        reply_markup=message.get('reply_markup')
+                    )
+                return 'sent', None
+
+            except RetryAfter as e:
+                # Превышен лимит Telegram: приостанавливаем всю рассылку, а не только этот чат
+                retry_after = e.retry_after
+                seconds = retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else retry_after
+                logger.warning(f"Лимит Telegram при рассылке, пауза {seconds} с")
+                self.limiter.pause(seconds)
+            except ChatMigrated as e:
+                # Группа стала супергруппой - переносим подписки на новый ID и повторяем
+                await self.store.run(self._migrate_subscriptions, chat_id, e.new_chat_id)
+                chat_id = e.new_chat_id
+            except Forbidden:
+                # Бот заблокирован или удален из чата
+                await self.store.run(self.engine.unsubscribe_everywhere, self.bot_id, chat_id)
+                return 'unsubscribed', None
+            except BadRequest as e:
+                if 'chat not found' in str(e).lower():
+                    await self.store.run(self.engine.unsubscribe_everywhere, self.bot_id, chat_id)
+                    return 'unsubscribed', None
+                if message.get('photo') and not file_id:
+                    # Telegram не смог загрузить обложку - рассылка продолжается текстом
+                    logger.warning(f"Обложка {message['photo']} не отправлена ({e}), рассылка продолжится без нее")
+                    message.pop('photo')
+                    continue
+                logger.error(f"Не удалось отправить рассылку в чат {chat_id}: {e}")
+                return 'failed', None
+            except TelegramError as e:
+                logger.warning(f"Ошибка отправки рассылки в чат {chat_id} (попытка {attempt + 1}): {e}")
+        return 'failed', None
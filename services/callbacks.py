@@ -0,0 +1,189 @@
+import base64
+import binascii
+import logging
+import re
+import struct
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class TokenTable:
+    """
+    Таблица строк, которые передаются в кнопках номером (коды категорий, фильтры)
+
+    Постоянные значения (фильтры, категории проектов, разделы) имеют закрепленные номера из static:
+    они попадают в callback_data уже отправленных кнопок и одинаковы после любого перезапуска,
+    в том числе с хранилищем в памяти процесса. Остальным строкам номера (начиная с DYNAMIC_BASE)
+    выдаются при первом обращении и хранятся в общем хранилище, поэтому кнопку, созданную
+    одним экземпляром бота, может обработать любой другой.
+    """
+
+    # Номера ниже этого значения зарезервированы за постоянными значениями
+    DYNAMIC_BASE = 1000
+
+    def __init__(self, store: BaseStore, static: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            store: Общее хранилище для номеров прочих строк
+            static: Постоянные значения и их номера (от 1 до DYNAMIC_BASE - 1, не меняются между версиями бота)
+        """
+        self.store = store
+        self._lock = threading.Lock()
+        self._static = dict(static or {})
+        for value, token in self._static.items():
+            if not 0 < token < self.DYNAMIC_BASE:
+                raise ValueError(f"Номер {token} постоянного значения {value} вне диапазона 1-{self.DYNAMIC_BASE - 1}")
+        if len(set(self._static.values())) != len(self._static):
+            raise ValueError("Номера постоянных значений повторяются")
+        self._ids = dict(self._static)
+        self._values = {token: value for value, token in self._static.items()}
+
+    def token(self, value: str) -> int:
+        """Возвращает номер строки, добавляя ее в таблицу при первом обращении"""
+        token = self._ids.get(value)
+        if token is not None:
+            return token
+        with self._lock:
+            token = self.store.hget('callback:tokens', value)
+            if token is None:
+                token = self.DYNAMIC_BASE + self.store.incr('callback:tokens:seq')
+                self.store.hset('callback:tokens:values', str(token), value)
+                self.store.hset('callback:tokens', value, token)
+            self._ids[value] = token
+            self._values[token] = value
+        return token
+
+    def value(self, token: int) -> Optional[str]:
+        """Возвращает строку по номеру или None, если номер неизвестен"""
+        value = self._values.get(token)
+        if value is None and token >= self.DYNAMIC_BASE:
+            value = self.store.hget('callback:tokens:values', str(token))
+            if value is not None:
+                self._values[token] = value
+                self._ids.setdefault(value, token)
+        return value
+
+class CallbackCodec:
+    """
+    Компактное кодирование callback_data кнопок
+
+    Данные кнопки - base64 (urlsafe, без '=') от упакованной struct-структуры: версия схемы,
+    код действия и поля действия. Поля бывают числовыми (формат struct), версией снимка
+    набора данных ('version', 0 - без версии) и строками из таблицы токенов ('token').
+    Разбор - одна распаковка struct и поиск действия по коду, без разбора строк.
+    Кнопки старого текстового формата (model_5, page_1_filter_all) распознаются по LEGACY_PATTERNS.
+    """
+
+    SCHEMA_VERSION = 1
+    _HEADER = struct.Struct('>BB')
+    _KINDS = {'version': 'I', 'token': 'H'}
+
+    # Текстовые callback_data, которые использовались до перехода на двоичный формат:
+    # (шаблон, действие, поля[, сдвиги числовых полей])
+    LEGACY_PATTERNS = (
+        (re.compile(r'^model_(\d+)(?:@(\d+))?$'), 'model', ('idx', 'version')),
+        (re.compile(r'^teacher_(\d+)(?:@(\d+))?$'), 'teacher', ('idx', 'version')),
+        (re.compile(r'^partner_(\d+)(?:@(\d+))?$'), 'partner', ('idx', 'version')),
+        (re.compile(r'^magazine_pdf_(\d+)(?:@(\d+))?$'), 'magazine_pdf', ('idx', 'version')),
+        (re.compile(r'^magazine_(\d+)(?:@(\d+))?$'), 'magazine', ('idx', 'version')),
+        (re.compile(r'^project_([\w-]+?)_(\d+)(?:@(\d+))?$'), 'project', ('category', 'idx', 'version')),
+        (re.compile(r'^category_([\w-]+)$'), 'category', ('category',)),
+        (re.compile(r'^page_(\d+)_filter_(\w+)$'), 'models_page', ('page', 'filter_type')),
+        (re.compile(r'^filter_(\w+?)_page_(\d+)$'), 'models_page', ('filter_type', 'page')),
+        # Кнопки фото несли номер показанного фото, а не того, на которое нужно перейти
+        (re.compile(r'^photo_prev_(\d+)$'), 'photo', ('idx',), {'idx': -1}),
+        (re.compile(r'^photo_next_(\d+)$'), 'photo', ('idx',), {'idx': 1}),
+        (re.compile(r'^(?:page|photo)_counter$'), 'noop', ()),
+    )
+
+    def __init__(self, store: BaseStore, static_tokens: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            store: Общее хранилище для таблицы токенов
+            static_tokens: Постоянные значения полей 'token' и их закрепленные номера (см. TokenTable)
+        """
+        self.tokens = TokenTable(store, static_tokens)
+        self._actions = {}  # name -> (code, struct, fields)
+        self._codes = {}  # code -> (name, struct, fields)
+
+    def register(self, name: str, code: int, fields: Sequence[Tuple[str, str]] = ()):
+        """
+        Регистрирует действие
+
+        Args:
+            name: Имя действия
+            code: Код действия (0-255), не меняется между версиями бота
+            fields: Поля действия: пары (имя, вид), где вид - формат struct ('B', 'H', 'I'), 'version' или 'token'
+        """
+        if code in self._codes:
+            raise ValueError(f"Код действия {code} уже занят действием {self._codes[code][0]}")
+        layout = struct.Struct('>' + ''.join(self._KINDS.get(kind, kind) for _, kind in fields))
+        self._actions[name] = (code, layout, tuple(fields))
+        self._codes[code] = (name, layout, tuple(fields))
+
+    def encode(self, name: str, **values) -> str:
+        """Кодирует действие и его поля в callback_data"""
+        code, layout, fields = self._actions[name]
+        packed = []
+        for field, kind in fields:
+            value = values.get(field)
+            if kind == 'version':
+                value = value or 0
+            elif kind == 'token':
+                value = self.tokens.token(value)
+            packed.append(value)
+        data = self._HEADER.pack(self.SCHEMA_VERSION, code) + layout.pack(*packed)
+        return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+    def decode(self, data: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Декодирует callback_data
+
+        Returns:
+            Кортеж (имя действия, поля) или None, если данные не распознаны
+        """
+        try:
+            raw = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+            schema, code = self._HEADER.unpack_from(raw)
+        except (binascii.Error, ValueError, struct.error):
+            return self._decode_legacy(data)
+        if schema != self.SCHEMA_VERSION or code not in self._codes:
+            # Текстовые данные начинаются с буквы и никогда не дают байт версии схемы
+            return self._decode_legacy(data)
+
+        name, layout, fields = self._codes[code]
+        try:
+            unpacked = layout.unpack_from(raw, self._HEADER.size)
+        except struct.error:
+            return None
+
+        values = {}
+        for (field, kind), value in zip(fields, unpacked):
+            if kind == 'version':
+                value = value or None
+            elif kind == 'token':
+                value = self.tokens.value(value)
+                if value is None:
+                    return None
+            values[field] = value
+        return name, values
+
+    def _decode_legacy(self, data: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Распознает кнопки старого текстового формата из ранее отправленных сообщений"""
+        if data in self._actions and not self._actions[data][2]:
+            return data, {}
+        for pattern, name, fields, *shifts in self.LEGACY_PATTERNS:
+            match = pattern.match(data)
+            if match:
+                values = {}
+                for field, value in zip(fields, match.groups()):
+                    if field in ('idx', 'page', 'version'):
+                        value = int(value) if value is not None else None
+                    if shifts and field in shifts[0] and value is not None:
+                        value = max(0, value + shifts[0][field])
+                    values[field] = value
+                return name, values
+        return None
@@ -0,0 +1,221 @@
+import asyncio
+import io
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class CollageRenderer:
+    """
+    Коллажи страниц списка моделей: фото карточек моделей страницы одной картинкой
+
+    Плитки нумеруются в порядке кнопок под сообщением, поэтому пользователь видит лица
+    всей страницы сразу и открывает только нужную модель. Коллаж собирается в отдельном потоке
+    из фото карточек списка (без загрузки страниц моделей) и хранится в памяти процесса
+    по ключу (версия набора, фильтр, страница); после первой отправки бот показывает его по file_id.
+    Нужен пакет Pillow (pip install Pillow), без него список показывается текстом.
+    """
+
+    COLUMNS = 3
+    TILE_WIDTH = 300
+    TILE_HEIGHT = 400
+    GAP = 6
+    BACKGROUND = (24, 24, 24)
+    PLACEHOLDER = (64, 64, 64)
+    JPEG_QUALITY = 85
+    # Фото карточки больше этого размера не скачивается (байты)
+    MAX_IMAGE_SIZE = 5 * 1024 * 1024
+    # Сколько собранных коллажей держать в памяти процесса
+    CACHE_SIZE = 64
+    # Сколько не пытаться снова собрать коллаж, для которого не скачалось ни одного фото (секунды)
+    FAILURE_TTL = 5 * 60
+    # Время хранения file_id коллажа (секунды): ключ включает версию набора, старые коллажи больше не запрашиваются
+    FILE_ID_TTL = 7 * 24 * 60 * 60
+    FILE_ID_KEY = 'file_ids:collage:{bot_id}:{key}'
+
+    def __init__(self, store: BaseStore, session=None, breaker=None, max_workers: int = 6,
+                 timeout: float = 5, enabled: bool = True):
+        """
+        Args:
+            store: Общее хранилище для file_id отправленных коллажей
+            session: HTTP-сессия (по умолчанию общая сессия парсеров)
+            breaker: Предохранитель запросов к сайту
+            max_workers: Сколько фото страницы скачивается одновременно
+            timeout: Таймаут скачивания одного фото в секундах
+            enabled: False - коллажи не собираются (список моделей показывается текстом)
+        """
+        self.store = store
+        self._session = session
+        self.breaker = breaker
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.enabled = enabled
+        self._cache = OrderedDict()  # ключ -> JPEG
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._failed: Dict[str, float] = {}  # ключ -> время неудачной сборки
+
+    @staticmethod
+    def available() -> bool:
+        """True, если установлен Pillow"""
+        try:
+            import PIL.Image  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @property
+    def session(self):
+        if self._session is None:
+            from parsers.http_session import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+
+    @staticmethod
+    def key(version: int, filter_type: str, page: int) -> str:
+        """Ключ коллажа страницы списка моделей"""
+        return f"{version}:{filter_type}:{page}"
+
+    def get_file_id(self, bot_id: str, key: str) -> Optional[str]:
+        """Возвращает file_id коллажа, ранее отправленного ботом"""
+        return self.store.get(self.FILE_ID_KEY.format(bot_id=bot_id, key=key))
+
+    def remember_file_id(self, bot_id: str, key: str, message):
+        """Запоминает file_id отправленного коллажа, чтобы не загружать его повторно"""
+        if getattr(message, 'photo', None):
+            self.store.set(self.FILE_ID_KEY.format(bot_id=bot_id, key=key), message.photo[-1].file_id,
+                           ttl=self.FILE_ID_TTL)
+
+    async def get(self, key: str, urls: List[Optional[str]]) -> Optional[bytes]:
+        """
+        Возвращает коллаж страницы, собирая его при первом обращении
+
+        Одновременные запросы одной страницы ждут одну сборку.
+
+        Args:
+            key: Ключ коллажа (см. key)
+            urls: Ссылки на фото карточек в порядке кнопок (None - плитка без фото)
+
+        Returns:
+            JPEG коллажа или None, если не удалось скачать ни одного фото
+        """
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+            return image
+        failed_at = self._failed.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < self.FAILURE_TTL:
+            return None
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(asyncio.to_thread(self.render, urls))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda future: self._finish(key, future))
+        try:
+            return await asyncio.shield(pending)
+        except Exception as e:
+            logger.error(f"Ошибка при сборке коллажа {key}: {e}")
+            return None
+
+    def _finish(self, key: str, future: asyncio.Future):
+        self._pending.pop(key, None)
+        if future.cancelled():
+            return
+        if future.exception() is not None or future.result() is None:
+            # Фото недоступны (сайт лежит, разомкнут предохранитель) - пока показываем список текстом
+            now = time.monotonic()
+            self._failed = {k: t for k, t in self._failed.items() if now - t < self.FAILURE_TTL}
+            self._failed[key] = now
+            return
+        self._failed.pop(key, None)
+        self._cache[key] = future.result()
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def render(self, urls: List[Optional[str]]) -> Optional[bytes]:
+        """
+        Собирает коллаж из фото по ссылкам (блокирующий вызов)
+
+        Args:
+            urls: Ссылки на фото в порядке плиток (None - плитка без фото)
+
+        Returns:
+            JPEG коллажа или None, если не удалось скачать ни одного фото
+        """
+        if not urls:
+            return None
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            tiles = list(executor.map(self._load_tile, urls))
+        if all(tile is None for tile in tiles):
+            return None
+        return self._compose(tiles)
+
+    def _load_tile(self, url: Optional[str]):
+        """Скачивает фото и обрезает его до размера плитки; None, если фото недоступно"""
+        if not url or (self.breaker and self.breaker.is_open):
+            return None
+
+        from PIL import Image, ImageOps
+
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                content_type = response.headers.get('Content-Type', '')
+                if response.status_code != 200 or not content_type.startswith('image/'):
+                    logger.debug(f"Фото для коллажа недоступно ({response.status_code}, {content_type}): {url}")
+                    return None
+                data = bytearray()
+                for chunk in response.iter_content(64 * 1024):
+                    data.extend(chunk)
+                    if len(data) > self.MAX_IMAGE_SIZE:
+                        logger.debug(f"Фото для коллажа слишком большое: {url}")
+                        return None
+
+            with Image.open(io.BytesIO(bytes(data))) as image:
+                image = ImageOps.exif_transpose(image).convert('RGB')
+                # Лица на карточках обычно в верхней части кадра
+                return ImageOps.fit(image, (self.TILE_WIDTH, self.TILE_HEIGHT), centering=(0.5, 0.3))
+        except Exception as e:
+            logger.warning(f"Не удалось загрузить фото для коллажа {url}: {e}")
+            return None
+
+    def _compose(self, tiles: list) -> bytes:
+        """Раскладывает плитки по сетке, нумерует их и кодирует коллаж в JPEG"""
+        from PIL import Image, ImageDraw, ImageFont
+
+        columns = min(self.COLUMNS, len(tiles))
+        rows = (len(tiles) + columns - 1) // columns
+        width = columns * self.TILE_WIDTH + (columns + 1) * self.GAP
+        height = rows * self.TILE_HEIGHT + (rows + 1) * self.GAP
+        canvas = Image.new('RGB', (width, height), self.BACKGROUND)
+        draw = ImageDraw.Draw(canvas)
+
+        badge = self.TILE_WIDTH // 6
+        try:
+            font, anchor = ImageFont.load_default(size=badge * 2 // 3), 'mm'
+        except TypeError:
+            # Pillow до 10.1: растровый шрифт по умолчанию не масштабируется и не выравнивается по центру
+            font, anchor = ImageFont.load_default(), None
+
+        for number, tile in enumerate(tiles, 1):
+            row, column = divmod(number - 1, columns)
+            x = self.GAP + column * (self.TILE_WIDTH + self.GAP)
+            y = self.GAP + row * (self.TILE_HEIGHT + self.GAP)
+            if tile is not None:
+                canvas.paste(tile, (x, y))
+            else:
+                draw.rectangle((x, y, x + self.TILE_WIDTH - 1, y + self.TILE_HEIGHT - 1), fill=self.PLACEHOLDER)
+
+            # Номер плитки совпадает с номером кнопки модели
+            left, top = x + self.GAP * 2, y + self.GAP * 2
+            draw.ellipse((left, top, left + badge, top + badge), fill=(255, 255, 255), outline=(0, 0, 0), width=2)
+            center = (left + badge / 2, top + badge / 2) if anchor else (left + badge / 3, top + badge / 3)
+            draw.text(center, str(number), fill=(0, 0, 0), font=font, anchor=anchor)
+
+        output = io.BytesIO()
+        canvas.save(output, format='JPEG', quality=self.JPEG_QUALITY, optimize=True)
+        return output.getvalue()
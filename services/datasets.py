@@ -0,0 +1,471 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class _StreamingLoad:
+    """Список, который заполняется из фонового потока по мере потокового парсинга"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.items = []
+        self.done = False
+        self.failed = False
+        self.changed = loop.create_future()
+
+    def _notify(self):
+        if not self.changed.done():
+            self.changed.set_result(None)
+        self.changed = self.loop.create_future()
+
+    def append(self, item):
+        self.items.append(item)
+        self._notify()
+
+    def finish(self, failed: bool = False):
+        self.done = True
+        self.failed = failed
+        self._notify()
+
+class DatasetRepository:
+    """
+    Наборы данных бота (модели, учителя, партнеры, журналы, проекты) в общем хранилище
+
+    Каждая версия набора хранится под своим ключом dataset:{name}:{версия}, а ключ
+    dataset:{name}:version указывает на текущую. Опубликованная версия (снимок) больше
+    не меняется и хранится еще SNAPSHOT_RETENTION секунд после выхода следующей, поэтому
+    кнопки, построенные по старому снимку, продолжают открывать те же записи.
+    Узел держит локальную копию и перечитывает набор из хранилища только при смене версии,
+    поэтому чтение из обработчиков не гоняет весь набор по сети на каждый запрос. Узлы
+    также считают обращения к наборам, чтобы фоновое обновление в первую очередь
+    обновляло востребованные данные.
+    """
+
+    # Как часто (в секундах) сверять локальную копию с версией в хранилище
+    VERSION_CHECK_INTERVAL = 1.0
+    # Сколько ждать, пока другой узел загрузит набор данных
+    LOAD_WAIT_TIMEOUT = 30.0
+    # Сколько хранить предыдущую версию набора после публикации новой (секунды)
+    SNAPSHOT_RETENTION = 60 * 60
+    # Сколько последних версий каждого набора держать в памяти узла
+    LOCAL_SNAPSHOTS = 3
+
+    def __init__(self, store: BaseStore, node_id: str):
+        self.store = store
+        self.node_id = node_id
+        self._loaders = {}
+        self._stream_loaders = {}
+        self._streams = {}
+        self._local = {}  # name -> (version, data, checked_at)
+        self._snapshots = {}  # name -> {version: data} последних версий
+        self._demand = {}  # name -> обращения, еще не переданные в хранилище
+        self._syncing = set()  # наборы, которые сейчас сверяются с хранилищем в фоне
+        self._listeners = []
+
+    def register(self, name: str, loader: Callable[[], Any], empty: Callable[[], Any] = list,
+                 stream: Optional[Callable[[], Iterable]] = None):
+        """
+        Регистрирует набор данных
+
+        Args:
+            name: Имя набора
+            loader: Функция загрузки данных с сайта (выполняется в отдельном потоке)
+            empty: Фабрика пустого значения, когда данных еще нет
+            stream: Генератор записей для потоковой загрузки списка (необязательно)
+        """
+        self._loaders[name] = (loader, empty)
+        if stream:
+            self._stream_loaders[name] = stream
+
+    def add_listener(self, listener: Callable[[str, int, Optional[Any], Any], None]):
+        """
+        Подписывает функцию на публикацию новых версий наборов данных
+
+        Функция вызывается на узле, опубликовавшем версию (в том потоке, где вызван publish),
+        с аргументами (имя набора, новая версия, данные предыдущей версии или None, новые данные).
+        """
+        self._listeners.append(listener)
+
+    @property
+    def names(self):
+        """Имена зарегистрированных наборов данных"""
+        return list(self._loaders)
+
+    def get(self, name: str) -> Any:
+        """
+        Возвращает текущую версию набора данных
+
+        Пока набор загружается потоково, возвращаются уже полученные записи;
+        если данных еще нет, возвращается пустое значение.
+        """
+        self._demand[name] = self._demand.get(name, 0) + 1
+        return self._read(name)
+
+    async def get_async(self, name: str) -> Any:
+        """
+        Возвращает текущую версию набора данных, сверяясь с хранилищем без блокировки цикла событий
+
+        То же, что get, но для асинхронного кода: с сетевым хранилищем сверка версии
+        выполняется в отдельном потоке.
+        """
+        self._demand[name] = self._demand.get(name, 0) + 1
+        await self._sync(name)
+        return self._read(name)
+
+    def _read(self, name: str) -> Any:
+        version, data, checked_at = self._local.get(name, (None, None, 0.0))
+
+        if time.monotonic() - checked_at >= self.VERSION_CHECK_INTERVAL:
+            if self.store.blocking and self._in_event_loop():
+                # Сетевое хранилище не опрашивается из цикла событий: пока идет сверка в фоне,
+                # отдается локальная копия (она отстает не больше чем на время одного запроса)
+                self._sync_in_background(name)
+            else:
+                version, data = self._apply(name, self._local.get(name), self._fetch(name, version, data))
+
+        if data is None:
+            stream = self._streams.get(name)
+            if stream is not None:
+                return stream.items
+            return self._loaders[name][1]()
+        return data
+
+    def _fetch(self, name: str, version: Optional[int], data: Any) -> Tuple[Optional[int], Any, bool]:
+        """
+        Сверяет локальную копию с хранилищем (блокирующий вызов)
+
+        Returns:
+            Кортеж (версия, данные, изменилась ли версия)
+        """
+        self._flush_demand(name)
+        current_version = self.store.get(f"dataset:{name}:version")
+        if current_version is not None and (current_version != version or data is None):
+            new_data = self.store.get(f"dataset:{name}:{current_version}")
+            # Если версия уже удалена из хранилища, остаемся на локальной копии до следующей проверки
+            if new_data is not None:
+                return current_version, new_data, True
+        return version, data, False
+
+    def _apply(self, name: str, local: Optional[Tuple], fetched: Tuple[Optional[int], Any, bool]) -> Tuple[Optional[int], Any]:
+        """Сохраняет результат сверки, если локальная копия не изменилась за время запроса к хранилищу"""
+        version, data, changed = fetched
+        if self._local.get(name) is not local:
+            # Пока шла сверка, узел сам опубликовал или перечитал набор - его копия новее
+            version, data, _ = self._local[name]
+            return version, data
+        if changed:
+            self._remember(name, version, data)
+        self._local[name] = (version, data, time.monotonic())
+        return version, data
+
+    async def _sync(self, name: str):
+        """Сверяет устаревшую локальную копию с хранилищем, не блокируя цикл событий"""
+        local = self._local.get(name)
+        version, data, checked_at = local or (None, None, 0.0)
+        if time.monotonic() - checked_at < self.VERSION_CHECK_INTERVAL:
+            return
+        self._apply(name, local, await self.store.run(self._fetch, name, version, data))
+
+    def _sync_in_background(self, name: str):
+        if name in self._syncing:
+            return
+        self._syncing.add(name)
+        task = asyncio.get_running_loop().create_task(self._sync(name))
+        task.add_done_callback(lambda _: self._syncing.discard(name))
+
+    @staticmethod
+    def _in_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def publish(self, name: str, data: Any):
+        """
+        Публикует новую версию набора данных для всех узлов
+
+        Данные записываются под ключом новой версии, и только потом на нее переключается
+        указатель текущей версии, поэтому читатели видят либо старый, либо новый набор целиком.
+        """
+        version = self.store.incr(f"dataset:{name}:seq")
+        self.store.set(f"dataset:{name}:{version}", data)
+        previous = self.store.get(f"dataset:{name}:version")
+        self.store.set(f"dataset:{name}:version", version)
+        if previous is not None:
+            # Старый снимок нужен, пока живут построенные по нему кнопки
+            self.store.expire(f"dataset:{name}:{previous}", self.SNAPSHOT_RETENTION)
+        previous_data = None
+        if previous is not None and self._listeners:
+            previous_data = self._snapshots.get(name, {}).get(previous)
+            if previous_data is None:
+                previous_data = self.store.get(f"dataset:{name}:{previous}")
+        self._local[name] = (version, data, time.monotonic())
+        self._remember(name, version, data)
+        logger.info(f"Опубликован набор данных {name} версии {version}")
+
+        for listener in self._listeners:
+            try:
+                listener(name, version, previous_data, data)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика публикации набора данных {name}: {e}")
+
+    def _remember(self, name: str, version: int, data: Any):
+        """Сохраняет снимок в памяти узла, вытесняя самые старые версии"""
+        snapshots = self._snapshots.setdefault(name, {})
+        snapshots[version] = data
+        for old_version in sorted(snapshots)[:-self.LOCAL_SNAPSHOTS]:
+            del snapshots[old_version]
+
+    def version(self, name: str) -> Optional[int]:
+        """Возвращает номер текущей версии набора или None, если набор еще не публиковался"""
+        return self.store.get(f"dataset:{name}:version")
+
+    def loaded_version(self, name: str) -> Optional[int]:
+        """
+        Возвращает версию данных, которые последним вернул get (без обращения к хранилищу)
+
+        None, если набор еще загружается потоково или не публиковался.
+        """
+        if self._local.get(name, (None, None))[1] is None:
+            return None
+        return self._local[name][0]
+
+    async def get_version_async(self, name: str, version: int) -> Optional[Any]:
+        """То же, что get_version, но снимок читается из сетевого хранилища в отдельном потоке"""
+        snapshot = self._snapshots.get(name, {}).get(version)
+        if snapshot is None:
+            snapshot = await self.store.run(self.store.get, f"dataset:{name}:{version}")
+            if snapshot is not None:
+                self._remember(name, version, snapshot)
+        return snapshot
+
+    def get_version(self, name: str, version: int) -> Optional[Any]:
+        """
+        Возвращает снимок набора данных указанной версии
+
+        Args:
+            name: Имя набора
+            version: Номер версии
+
+        Returns:
+            Данные снимка или None, если срок хранения версии истек
+        """
+        snapshot = self._snapshots.get(name, {}).get(version)
+        if snapshot is None:
+            snapshot = self.store.get(f"dataset:{name}:{version}")
+            if snapshot is not None:
+                self._remember(name, version, snapshot)
+        return snapshot
+
+    def _flush_demand(self, name: str):
+        """Передает накопленные обращения к набору в общий счетчик"""
+        count = self._demand.pop(name, 0)
+        if count:
+            self.store.incr(f"dataset:{name}:demand", count)
+
+    def demand(self, name: str) -> int:
+        """Возвращает количество обращений к набору со всех узлов с момента последнего обновления"""
+        self._flush_demand(name)
+        return self.store.get(f"dataset:{name}:demand") or 0
+
+    def reset_demand(self, name: str):
+        """Обнуляет счетчик обращений после обновления набора"""
+        self.store.set(f"dataset:{name}:demand", 0)
+
+    def load(self, name: str) -> Any:
+        """Загружает набор данных с сайта и публикует его, если загрузка удалась (блокирующий вызов)"""
+        loader, _ = self._loaders[name]
+        data = loader()
+        if data:
+            self.publish(name, data)
+        return data
+
+    async def get_or_load(self, name: str) -> Any:
+        """
+        Возвращает набор данных, загружая его, если в хранилище его еще нет
+
+        Загрузку выполняет только узел, захвативший блокировку load:{name};
+        остальные узлы дожидаются публикации результата.
+        """
+        data = await self.get_async(name)
+        if data:
+            return data
+
+        lock_name = f"lock:load:{name}"
+        deadline = time.monotonic() + self.LOAD_WAIT_TIMEOUT
+        while True:
+            if await self.store.run(self.store.acquire_lock, lock_name, self.node_id, int(self.LOAD_WAIT_TIMEOUT)):
+                try:
+                    # Набор мог появиться, пока ждали блокировку
+                    data = await self._reread(name)
+                    if data:
+                        return data
+                    return await self._load_holding_lock(name) or self._loaders[name][1]()
+                finally:
+                    await self.store.run(self.store.release_lock, lock_name, self.node_id)
+
+            await asyncio.sleep(0.5)
+            data = await self._reread(name)
+            if data or time.monotonic() >= deadline:
+                return data
+
+    async def _reread(self, name: str) -> Any:
+        """Перечитывает набор из хранилища, не дожидаясь интервала сверки"""
+        self._local.pop(name, None)
+        await self._sync(name)
+        return self._read(name)
+
+    async def reload(self, name: str, heartbeat: Optional[Callable[[], Any]] = None) -> Optional[Any]:
+        """
+        Перезагружает набор данных с сайта под той же блокировкой load:{name}, что и get_or_load
+
+        Плановое обновление не идет параллельно с загрузкой по запросу пользователя на этом
+        или другом узле. Если набор в это время уже загружал другой загрузчик и опубликовал
+        новую версию, повторная загрузка не выполняется.
+
+        Args:
+            name: Имя набора
+            heartbeat: Функция, которая вызывается вместе с продлением блокировки, пока идет загрузка
+                       (например, продление лидерства)
+
+        Returns:
+            Загруженные данные или None, если загрузка не удалась или блокировку не удалось получить
+        """
+        lock_name = f"lock:load:{name}"
+        version = await self.store.run(self.version, name)
+        deadline = time.monotonic() + self.LOAD_WAIT_TIMEOUT
+        while not await self.store.run(self.store.acquire_lock, lock_name, self.node_id, int(self.LOAD_WAIT_TIMEOUT)):
+            if time.monotonic() >= deadline:
+                logger.warning(f"Набор данных {name} загружается другим узлом дольше {self.LOAD_WAIT_TIMEOUT} с")
+                return None
+            if heartbeat:
+                await self.store.run(heartbeat)
+            await asyncio.sleep(0.5)
+
+        try:
+            if await self.store.run(self.version, name) != version:
+                # Пока ждали блокировку, набор загрузили и опубликовали по запросу пользователя
+                return await self._reread(name)
+            return await self._load_holding_lock(name, heartbeat)
+        finally:
+            await self.store.run(self.store.release_lock, lock_name, self.node_id)
+
+    async def _load_holding_lock(self, name: str, heartbeat: Optional[Callable[[], Any]] = None) -> Any:
+        """Загружает набор в отдельном потоке, продлевая блокировку load:{name}, пока загрузка не закончится"""
+        lock_name = f"lock:load:{name}"
+        ttl = int(self.LOAD_WAIT_TIMEOUT)
+        load = asyncio.ensure_future(asyncio.to_thread(self.load, name))
+        while True:
+            done, _ = await asyncio.wait({load}, timeout=ttl / 3)
+            if done:
+                return load.result()
+            # Медленная загрузка не должна терять блокировку, иначе набор начнет грузить второй узел
+            try:
+                await self.store.run(self.store.acquire_lock, lock_name, self.node_id, ttl)
+                if heartbeat:
+                    await self.store.run(heartbeat)
+            except Exception as e:
+                logger.error(f"Не удалось продлить блокировку загрузки набора данных {name}: {e}")
+
+    async def get_streaming(self, name: str, needed: Optional[int] = None) -> Tuple[List, bool]:
+        """
+        Возвращает список, дожидаясь только первых needed записей, если его еще нет в хранилище
+
+        Записи поступают из генератора stream в фоновом потоке; когда он закончится,
+        полный список публикуется как обычный набор данных. Если поток для набора
+        не зарегистрирован или загрузку уже ведет другой узел, используется get_or_load.
+
+        Args:
+            name: Имя набора
+            needed: Сколько записей нужно для ответа (None - весь список)
+
+        Returns:
+            Кортеж (записи, загружен ли список полностью); если потоковая загрузка оборвалась,
+            возвращаются полученные записи с признаком неполного списка
+        """
+        data = await self.get_async(name)
+        stream = self._streams.get(name)
+        if data and stream is None:
+            return data, True
+
+        if stream is None:
+            if name not in self._stream_loaders:
+                return await self.get_or_load(name), True
+
+            lock_name = f"lock:load:{name}"
+            if not await self.store.run(self.store.acquire_lock, lock_name, self.node_id, int(self.LOAD_WAIT_TIMEOUT)):
+                return await self.get_or_load(name), True
+
+            loop = asyncio.get_running_loop()
+            stream = _StreamingLoad(loop)
+            self._streams[name] = stream
+            loop.run_in_executor(None, self._consume_stream, name, stream)
+
+        while not stream.done and (needed is None or len(stream.items) < needed):
+            await asyncio.shield(stream.changed)
+
+        # Оборванная загрузка не публикуется, а ее записи не считаются полным списком
+        return stream.items, stream.done and not stream.failed
+
+    def _consume_stream(self, name: str, stream: _StreamingLoad):
+        """
+        Читает генератор записей в фоновом потоке и передает их в цикл событий
+
+        Полностью загруженный список публикуется здесь же, в фоновом потоке, чтобы запись
+        в хранилище не выполнялась в цикле событий. Если генератор завершился ошибкой
+        (например, оборвалось соединение), полученные записи - только часть списка: они
+        не публикуются, и читатели остаются на предыдущей версии.
+
+        Пока записи поступают, блокировка load:{name} продлевается (как в _load_holding_lock),
+        иначе медленная загрузка потеряла бы ее, и список начал бы грузить второй узел.
+        """
+        lock_name = f"lock:load:{name}"
+        ttl = int(self.LOAD_WAIT_TIMEOUT)
+        renewed_at = time.monotonic()
+        items = []
+        failed = False
+        try:
+            for item in self._stream_loaders[name]():
+                items.append(item)
+                stream.loop.call_soon_threadsafe(stream.append, item)
+                if time.monotonic() - renewed_at >= ttl / 3:
+                    renewed_at = time.monotonic()
+                    self._renew_stream_lock(name, lock_name, ttl)
+        except Exception as e:
+            failed = True
+            logger.error(f"Ошибка при потоковой загрузке набора данных {name}: {e}")
+
+        try:
+            if failed:
+                logger.warning(f"Набор данных {name} загружен не полностью ({len(items)} записей) и не публикуется")
+            elif items:
+                self.publish(name, items)
+        except Exception as e:
+            logger.error(f"Ошибка при публикации набора данных {name}: {e}")
+        finally:
+            try:
+                self.store.release_lock(lock_name, self.node_id)
+            except Exception as e:
+                logger.error(f"Не удалось освободить блокировку загрузки набора данных {name}: {e}")
+            stream.loop.call_soon_threadsafe(self._finish_stream, name, stream, failed)
+
+    def _renew_stream_lock(self, name: str, lock_name: str, ttl: int):
+        try:
+            if not self.store.acquire_lock(lock_name, self.node_id, ttl):
+                logger.warning(f"Блокировка загрузки набора данных {name} перешла к другому узлу")
+        except Exception as e:
+            logger.error(f"Не удалось продлить блокировку загрузки набора данных {name}: {e}")
+
+    def _finish_stream(self, name: str, stream: _StreamingLoad, failed: bool = False):
+        """Завершает потоковую загрузку в цикле событий и будит ожидающих"""
+        self._streams.pop(name, None)
+        stream.finish(failed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает текущие версии всех наборов данных"""
+        return {name: self._read(name) for name in self._loaders}
@@ -0,0 +1,306 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+class ApiError(Exception):
+    """Ошибка запроса к API: HTTP-статус и текст для клиента"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class DataApi:
+    """
+    Встроенный HTTP API только для чтения с данными бота в формате JSON
+
+    Отдает наборы данных (модели, учителя, партнеры, выпуски журнала, проекты) и детали моделей
+    из тех же кэшей, что и бот, поэтому другие сервисы (виджет сайта, синхронизация с CRM)
+    не парсят armodels.ru сами. Сервер работает в цикле событий бота на asyncio-потоках
+    (HTTP/1.1 с keep-alive) и поддерживает ETag/If-None-Match, постраничный вывод,
+    выбор полей (?fields=name,url) и сжатие gzip.
+
+    Адреса:
+        GET /api                      - список наборов данных и их версии
+        GET /api/models               - модели (?gender=, ?course_type=)
+        GET /api/models/{idx}         - модель с параметрами и фото (?version= - снимок списка)
+        GET /api/teachers, /api/partners, /api/magazines
+        GET /api/projects             - проекты (?category=)
+    Общие параметры списков: ?page= (с 1), ?per_page= (до MAX_PER_PAGE), ?fields=
+    """
+
+    DATASETS = ('models', 'teachers', 'partners', 'magazines', 'projects')
+    DEFAULT_PER_PAGE = 20
+    MAX_PER_PAGE = 100
+    # Ответы меньше этого размера не сжимаются
+    GZIP_MIN_SIZE = 1024
+    # Сколько готовых ответов хранить (ключ - запрос и версия набора данных)
+    RESPONSE_CACHE_SIZE = 256
+    KEEP_ALIVE_TIMEOUT = 15.0
+    MAX_HEADERS = 100
+    CACHE_MAX_AGE = 60
+
+    REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+    def __init__(self, shared, host: str = '127.0.0.1', port: int = 8080):
+        """
+        Args:
+            shared: Общие ресурсы ботов (SharedResources): наборы данных и кэш деталей моделей
+            host: Адрес, на котором принимаются соединения
+            port: Порт (0 - любой свободный)
+        """
+        self.shared = shared
+        self.host = host
+        self.port = port
+        self._server = None
+        self._connections = set()
+        self._responses = OrderedDict()  # (путь, запрос, версия) -> (тело, сжатое тело, ETag)
+
+    @classmethod
+    def from_env(cls, shared) -> Optional['DataApi']:
+        """Создает API по переменным окружения API_PORT и API_HOST (None, если API_PORT не задан)"""
+        port = os.getenv('API_PORT')
+        if not port:
+            return None
+        return cls(shared, host=os.getenv('API_HOST', '127.0.0.1'), port=int(port))
+
+    async def start(self):
+        """Начинает принимать соединения"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"HTTP API запущен на {self.host}:{self.port}")
+
+    async def stop(self):
+        """Закрывает сервер"""
+        if self._server:
+            self._server.close()
+            # Открытые keep-alive соединения закрываются сразу, не дожидаясь таймаута простоя
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обрабатывает запросы одного соединения, пока клиент держит его открытым"""
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.KEEP_ALIVE_TIMEOUT)
+                    if not request_line.strip():
+                        break
+                    method, target, version = request_line.decode('latin-1').split()
+                    headers = await self._read_headers(reader)
+                except asyncio.TimeoutError:
+                    break
+                except ValueError:
+                    # В том числе строка длиннее буфера потока: readline сообщает об этом через ValueError
+                    writer.write(self._build_response(400, {}, self._json({'error': 'Некорректный запрос'}), False))
+                    await writer.drain()
+                    break
+
+                status, extra_headers, body = await self._dispatch(method, target, headers)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(self._build_response(status, extra_headers, body, keep_alive, send_body=method != 'HEAD'))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _read_headers(self, reader: asyncio.StreamReader) -> Dict[str, str]:
+        headers = {}
+        for _ in range(self.MAX_HEADERS):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            name, separator, value = line.decode('latin-1').partition(':')
+            if not separator:
+                raise ValueError('Некорректный заголовок')
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError('Слишком много заголовков')
+
+    def _build_response(self, status: int, headers: Dict[str, str], body: bytes, keep_alive: bool,
+                        send_body: bool = True) -> bytes:
+        """Собирает ответ; для HEAD (send_body=False) Content-Length остается длиной тела ответа на GET"""
+        lines = [f"HTTP/1.1 {status} {self.REASONS.get(status, '')}"]
+        headers = dict(headers)
+        if status != 304:
+            headers.setdefault('Content-Type', 'application/json; charset=utf-8')
+        headers['Content-Length'] = str(len(body))
+        headers['Date'] = formatdate(usegmt=True)
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        headers['Access-Control-Allow-Origin'] = '*'
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body if send_body else b'')
+
+    @staticmethod
+    def _json(data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Выполняет запрос и возвращает (статус, заголовки, тело) с учетом ETag и gzip"""
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, self._json({'error': 'Поддерживаются только GET и HEAD'})
+
+        parts = urlsplit(target)
+        path = parts.path.rstrip('/') or '/'
+        query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        try:
+            body, compressed, etag = await self._cached_response(path, query)
+        except ApiError as e:
+            return e.status, {}, self._json({'error': e.message})
+        except Exception as e:
+            logger.error(f"Ошибка HTTP API при обработке {target}: {e}")
+            return 500, {}, self._json({'error': 'Внутренняя ошибка'})
+
+        response_headers = {
+            'Cache-Control': f"public, max-age={self.CACHE_MAX_AGE}",
+            'Vary': 'Accept-Encoding',
+        }
+        if compressed is not None and 'gzip' in headers.get('accept-encoding', ''):
+            # Сжатый ответ - другое представление, поэтому у него свой ETag
+            body, etag = compressed, etag[:-1] + '-gz"'
+            response_headers['Content-Encoding'] = 'gzip'
+        response_headers['ETag'] = etag
+        if etag in (value.strip() for value in headers.get('if-none-match', '').split(',')):
+            return 304, response_headers, b''
+        return 200, response_headers, body
+
+    async def _cached_response(self, path: str, query: Dict[str, str]) -> Tuple[bytes, Optional[bytes], str]:
+        """
+        Возвращает готовый ответ (тело, сжатое тело или None, ETag)
+
+        Ответы по спискам кэшируются до выхода новой версии набора данных:
+        повторный запрос не сериализует и не сжимает данные заново.
+        """
+        data, version = await self._resolve(path, query)
+        key = (path, tuple(sorted(query.items())), version)
+        if version is not None:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self._responses.move_to_end(key)
+                return cached
+
+        body = self._json(data)
+        compressed = gzip.compress(body, 6) if len(body) >= self.GZIP_MIN_SIZE else None
+        response = (body, compressed, f'"{hashlib.sha1(body).hexdigest()[:20]}"')
+        if version is not None:
+            self._responses[key] = response
+            while len(self._responses) > self.RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return response
+
+    async def _resolve(self, path: str, query: Dict[str, str]) -> Tuple[Any, Optional[int]]:
+        """Возвращает данные ответа и версию набора, по которой они построены (None - не кэшировать)"""
+        datasets = self.shared.datasets
+        segments = [segment for segment in path.split('/') if segment]
+        if not segments or segments[0] != 'api':
+            raise ApiError(404, 'Адрес не найден')
+
+        if len(segments) == 1:
+            return {
+                'datasets': await datasets.store.run(lambda: {name: datasets.version(name) for name in self.DATASETS}),
+                'endpoints': [f"/api/{name}" for name in self.DATASETS] + ['/api/models/{idx}'],
+            }, None
+
+        name = segments[1]
+        if name not in self.DATASETS or len(segments) > 3 or (len(segments) == 3 and name != 'models'):
+            raise ApiError(404, 'Адрес не найден')
+
+        if len(segments) == 3:
+            return await self._model_detail(segments[2], query), None
+
+        data = await datasets.get_or_load(name)
+        version = datasets.loaded_version(name)
+        if name == 'projects':
+            items = self._project_items(data or {}, query.get('category'))
+        else:
+            items = [dict(record, idx=idx) for idx, record in enumerate(data or [])]
+            if name == 'models':
+                for field in ('gender', 'course_type'):
+                    if query.get(field):
+                        items = [item for item in items if item.get(field) == query[field]]
+        return self._page(name, version, items, query), version
+
+    @staticmethod
+    def _project_items(dataset: Dict, category: Optional[str]) -> List[Dict]:
+        projects = dataset.get('projects', [])
+        indices = range(len(projects)) if not category else dataset.get('categories', {}).get(category)
+        if indices is None:
+            raise ApiError(404, f"Категория {category} не найдена")
+        return [dict(projects[idx], idx=idx) for idx in indices]
+
+    def _page(self, name: str, version: Optional[int], items: List[Dict], query: Dict[str, str]) -> Dict:
+        """Страница списка с выбранными полями"""
+        page = self._int_param(query, 'page', 1, minimum=1)
+        per_page = min(self.MAX_PER_PAGE, self._int_param(query, 'per_page', self.DEFAULT_PER_PAGE, minimum=1))
+        fields = [field for field in query.get('fields', '').split(',') if field]
+
+        selected = items[(page - 1) * per_page:page * per_page]
+        if fields:
+            selected = [{field: item[field] for field in fields if field in item} for item in selected]
+        return {
+            'dataset': name,
+            'version': version,
+            'page': page,
+            'per_page': per_page,
+            'total': len(items),
+            'pages': (len(items) + per_page - 1) // per_page,
+            'items': selected,
+        }
+
+    async def _model_detail(self, idx_param: str, query: Dict[str, str]) -> Dict:
+        """Модель из списка (текущего или снимка ?version=) с параметрами и фото из кэша деталей"""
+        try:
+            idx = int(idx_param)
+        except ValueError:
+            raise ApiError(404, 'Адрес не найден')
+
+        datasets = self.shared.datasets
+        if 'version' in query:
+            models = await datasets.get_version_async('models', self._int_param(query, 'version', 0, minimum=1))
+            if models is None:
+                raise ApiError(404, 'Версия списка моделей больше не хранится')
+        else:
+            models = await datasets.get_or_load('models')
+        if not 0 <= idx < len(models or []):
+            raise ApiError(404, 'Модель не найдена')
+
+        model = dict(models[idx], idx=idx)
+        detail = await self.shared.get_model_detail(model['url'])
+        if not detail:
+            raise ApiError(503, 'Не удалось загрузить данные модели')
+        model['parameters'] = detail.get('parameters', {})
+        model['photos'] = detail.get('photos', [])
+
+        fields = [field for field in query.get('fields', '').split(',') if field]
+        if fields:
+            model = {field: model[field] for field in fields if field in model}
+        return model
+
+    @staticmethod
+    def _int_param(query: Dict[str, str], name: str, default: int, minimum: int) -> int:
+        value = query.get(name)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise ApiError(400, f"Параметр {name} должен быть числом")
+        if number < minimum:
+            raise ApiError(400, f"Параметр {name} должен быть не меньше {minimum}")
+        return number
@@ -0,0 +1,86 @@
+import logging
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from .callbacks import CallbackCodec
+
+logger = logging.getLogger(__name__)
+
+class PagedKeyboards:
+    """
+    Постраничные клавиатуры длинных списков (учителя, партнеры, выпуски журнала, проекты)
+
+    Кнопки списка строятся один раз на версию набора данных и сразу раскладываются по страницам
+    фиксированного размера с кнопками перехода. Размер клавиатуры ограничен независимо от размера
+    каталога, а показ страницы - это выбор готовой клавиатуры без повторного построения кнопок.
+    """
+
+    PAGE_SIZE = 8
+    # Сколько списков (ключ списка и версия данных) хранить в памяти
+    MAX_LISTS = 64
+
+    def __init__(self, codec: CallbackCodec, page_size: int = PAGE_SIZE, max_lists: int = MAX_LISTS):
+        """
+        Args:
+            codec: Кодек callback_data (для кнопки-счетчика страниц)
+            page_size: Количество элементов списка на странице
+            max_lists: Сколько построенных списков хранить в памяти
+        """
+        self.codec = codec
+        self.page_size = page_size
+        self.max_lists = max_lists
+        self._lists = OrderedDict()  # (ключ, версия) -> [клавиатура страницы]
+
+    def page(self, key: Hashable, version: Optional[int], build_rows: Callable[[], List[List[InlineKeyboardButton]]],
+             page: int, page_callback: Callable[[int], str],
+             footer: Sequence[Sequence[InlineKeyboardButton]] = ()) -> Tuple[InlineKeyboardMarkup, int, int]:
+        """
+        Возвращает клавиатуру страницы списка
+
+        Args:
+            key: Ключ списка (например, 'teachers' или 'projects:interview')
+            version: Версия набора данных, по которой строится список (None - список не кэшируется)
+            build_rows: Функция, возвращающая строки кнопок всех элементов списка
+            page: Номер страницы (приводится к допустимому диапазону)
+            page_callback: Функция, возвращающая callback_data перехода на страницу с указанным номером
+            footer: Строки кнопок под навигацией (например, возврат в главное меню)
+
+        Returns:
+            Кортеж (клавиатура, номер показанной страницы, количество страниц)
+        """
+        cache_key = (key, version)
+        pages = self._lists.get(cache_key) if version is not None else None
+        if pages is None:
+            pages = self._build(build_rows(), page_callback, footer)
+            if version is not None:
+                self._lists[cache_key] = pages
+                while len(self._lists) > self.max_lists:
+                    self._lists.popitem(last=False)
+        else:
+            self._lists.move_to_end(cache_key)
+
+        page = max(0, min(len(pages) - 1, page))
+        return pages[page], page, len(pages)
+
+    def _build(self, rows: List[List[InlineKeyboardButton]], page_callback: Callable[[int], str],
+               footer: Sequence[Sequence[InlineKeyboardButton]]) -> List[InlineKeyboardMarkup]:
+        """Раскладывает строки кнопок по страницам и добавляет навигацию"""
+        total_pages = max(1, (len(rows) + self.page_size - 1) // self.page_size)
+        pages = []
+        for page in range(total_pages):
+            keyboard = list(rows[page * self.page_size:(page + 1) * self.page_size])
+
+            if total_pages > 1:
+                nav_row = []
+                if page > 0:
+                    nav_row.append(InlineKeyboardButton("⬅️ Назад", callback_data=page_callback(page - 1)))
+                nav_row.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data=self.codec.encode('noop')))
+                if page < total_pages - 1:
+                    nav_row.append(InlineKeyboardButton("Вперед ➡️", callback_data=page_callback(page + 1)))
+                keyboard.append(nav_row)
+
+            keyboard.extend(list(row) for row in footer)
+            pages.append(InlineKeyboardMarkup(keyboard))
+        return pages
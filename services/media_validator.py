@@ -0,0 +1,137 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from parsers.media import unique_urls
+
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class MediaValidator:
+    """
+    Проверка ссылок на изображения до того, как они попадут в send_photo
+
+    Каждая ссылка проверяется HEAD-запросом (параллельно для всех ссылок записи), результат
+    сохраняется в общем хранилище. Отбрасываются только заведомо битые изображения: ответ 404/410,
+    не-изображение или файл больше лимита Telegram на фото по ссылке. Если сайт не ответил,
+    не поддерживает HEAD или недоступен (разомкнут предохранитель), ссылка сохраняется -
+    из-за временного сбоя фото не пропадают.
+    """
+
+    STATUS_KEY = 'media:status:{url}'
+    # Время хранения результата проверки (секунды): рабочие ссылки перепроверяются реже битых
+    VALID_TTL = 24 * 60 * 60
+    BROKEN_TTL = 6 * 60 * 60
+    # Telegram скачивает фото по ссылке размером до 5 МБ
+    TELEGRAM_PHOTO_LIMIT = 5 * 1024 * 1024
+
+    def __init__(self, store: BaseStore, session=None, breaker=None, max_workers: int = 8,
+                 timeout: float = 5, enabled: bool = True):
+        """
+        Args:
+            store: Общее хранилище для результатов проверки
+            session: HTTP-сессия (по умолчанию общая сессия парсеров)
+            breaker: Предохранитель запросов к сайту
+            max_workers: Количество одновременных проверок
+            timeout: Таймаут проверки одной ссылки в секундах
+            enabled: False - ссылки не проверяются (например, в offline режиме)
+        """
+        self.store = store
+        self._session = session
+        self.breaker = breaker
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.enabled = enabled
+
+    @property
+    def session(self):
+        if self._session is None:
+            from parsers.http_session import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+
+    def check(self, url: str) -> bool:
+        """Возвращает False, если изображение по ссылке заведомо недоступно"""
+        cached = self.store.get(self.STATUS_KEY.format(url=url))
+        if cached is not None:
+            return cached
+
+        valid = self._probe(url)
+        if valid is None:
+            # Результат неизвестен (сбой сети, сайт недоступен) - не кэшируем и не отбрасываем
+            return True
+        self.store.set(self.STATUS_KEY.format(url=url), valid, ttl=self.VALID_TTL if valid else self.BROKEN_TTL)
+        if not valid:
+            logger.warning(f"Изображение недоступно и не будет отправляться: {url}")
+        return valid
+
+    def _probe(self, url: str) -> Optional[bool]:
+        """Проверяет ссылку запросом к сайту: True - рабочая, False - битая, None - неизвестно"""
+        if self.breaker and self.breaker.is_open:
+            return None
+
+        import requests
+
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in (405, 501):
+                # HEAD не поддерживается - читаем только заголовки ответа на GET
+                with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                    return self._verdict(response)
+            return self._verdict(response)
+        except requests.RequestException as e:
+            logger.debug(f"Не удалось проверить изображение {url}: {e}")
+            return None
+
+    def _verdict(self, response) -> Optional[bool]:
+        """Решение по заголовкам ответа"""
+        if response.status_code in (404, 410):
+            return False
+        if response.status_code != 200:
+            return None
+
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and not content_type.startswith('image/'):
+            return False
+        size = int(response.headers.get('Content-Length') or 0)
+        if size > self.TELEGRAM_PHOTO_LIMIT:
+            return False
+        return True
+
+    def filter_valid(self, urls: Iterable[Optional[str]]) -> List[str]:
+        """
+        Убирает из списка повторы и битые ссылки, сохраняя порядок
+
+        Args:
+            urls: Ссылки на изображения
+
+        Returns:
+            Рабочие ссылки без повторов
+        """
+        urls = unique_urls(urls)
+        if not self.enabled or not urls:
+            return urls
+        if len(urls) == 1:
+            return urls if self.check(urls[0]) else []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            results = list(executor.map(self.check, urls))
+        return [url for url, valid in zip(urls, results) if valid]
+
+    def clean(self, records: List[Dict], field: str) -> List[Dict]:
+        """
+        Заменяет битые ссылки на изображение в записях набора данных на None
+
+        Args:
+            records: Записи набора данных (учителя, партнеры, выпуски журнала, проекты)
+            field: Поле записи со ссылкой на изображение
+
+        Returns:
+            Те же записи
+        """
+        valid = set(self.filter_valid(record.get(field) for record in records))
+        for record in records:
+            if record.get(field) and record[field] not in valid:
+                record[field] = None
+        return records
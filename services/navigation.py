@@ -0,0 +1,75 @@
+import logging
+from typing import Optional, Union
+
+from telegram import InlineKeyboardMarkup, InputMediaPhoto, Message
+from telegram.error import BadRequest, TelegramError
+
+logger = logging.getLogger(__name__)
+
+class MessageNavigator:
+    """
+    Переходы между экранами бота редактированием уже показанного сообщения
+
+    Текстовый экран заменяется текстовым через editMessageText, экран с фото - экраном
+    с фото через editMessageMedia: один запрос к Bot API вместо удаления и новой отправки.
+    Telegram не умеет превращать текстовое сообщение в фото и обратно, поэтому при смене
+    типа экрана (или если сообщение уже нельзя редактировать) старое сообщение удаляется
+    и отправляется новое.
+    """
+
+    async def show(self, bot, chat_id: int, current: Optional[Message], text: str,
+                   reply_markup: Optional[InlineKeyboardMarkup] = None,
+                   photo: Optional[Union[str, bytes]] = None) -> Message:
+        """
+        Показывает экран на месте текущего сообщения
+
+        Args:
+            bot: Бот, от имени которого отправляются сообщения
+            chat_id: ID чата
+            current: Сообщение с текущим экраном (None - отправить новое сообщение)
+            text: Текст экрана (для экрана с фото - подпись)
+            reply_markup: Клавиатура экрана
+            photo: URL, file_id или содержимое файла фото (None - текстовый экран)
+
+        Returns:
+            Сообщение с новым экраном
+        """
+        if current is not None:
+            try:
+                if photo is None and not self.is_media(current):
+                    message = await bot.edit_message_text(
+                        chat_id=chat_id,
+                        message_id=current.message_id,
+                        text=text,
+                        parse_mode='HTML',
+                        reply_markup=reply_markup
+                    )
+                    return message if isinstance(message, Message) else current
+                if photo is not None and current.photo:
+                    message = await bot.edit_message_media(
+                        chat_id=chat_id,
+                        message_id=current.message_id,
+                        media=InputMediaPhoto(media=photo, caption=text, parse_mode='HTML'),
+                        reply_markup=reply_markup
+                    )
+                    return message if isinstance(message, Message) else current
+            except BadRequest as e:
+                if 'not modified' in str(e).lower():
+                    return current
+                logger.debug(f"Не удалось отредактировать сообщение {current.message_id}: {e}")
+
+            # Тип экрана меняется или редактирование не удалось - заменяем сообщение новым
+            try:
+                await bot.delete_message(chat_id=chat_id, message_id=current.message_id)
+            except TelegramError as e:
+                logger.debug(f"Не удалось удалить сообщение {current.message_id}: {e}")
+
+        if photo is None:
+            return await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML', reply_markup=reply_markup)
+        return await bot.send_photo(chat_id=chat_id, photo=photo, caption=text, parse_mode='HTML',
+                                    reply_markup=reply_markup)
+
+    @staticmethod
+    def is_media(message: Message) -> bool:
+        """True, если сообщение содержит медиа (фото, документ, видео) и редактируется только через подпись"""
+        return bool(message.photo or message.document or message.video or message.animation)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from parsers.cache_dir import evict_lru
+
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class PdfCache:
+    """Дисковый кэш PDF-файлов журналов с ограничением по размеру и картой file_id Telegram"""
+
+    # Лимит Telegram Bot API на отправку документов
+    TELEGRAM_UPLOAD_LIMIT = 50 * 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
+    INDEX_FILE = 'file_ids.json'
+    STORE_KEY = 'file_ids:pdf'
+
+    def __init__(self, cache_dir: str = 'cache/pdf', max_size_mb: int = 500, session=None,
+                 store: Optional[BaseStore] = None):
+        """
+        Args:
+            cache_dir: Каталог для хранения PDF-файлов
+            max_size_mb: Максимальный суммарный размер кэша в мегабайтах
+            session: HTTP-сессия для скачивания (по умолчанию общая сессия парсеров, создается при первом скачивании)
+            store: Общее хранилище для карты file_id (чтобы ее видели все экземпляры бота)
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 1024 * 1024
+        self._session = session
+        self.store = store
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.file_ids = self._load_file_ids()
+
+    @property
+    def session(self):
+        """HTTP-сессия для скачивания; requests импортируется только при первом скачивании"""
+        if self._session is None:
+            from parsers.http_session import get_shared_session
+            self._session = get_shared_session()
+        return self._session
+
+    def get_path(self, url: str) -> str:
+        """Возвращает путь к файлу в кэше для URL"""
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.pdf")
+
+    def fetch(self, url: str, timeout: int = 30) -> str:
+        """
+        Возвращает путь к локальной копии PDF, скачивая файл при первом обращении
+
+        Файл скачивается потоково во временный файл и атомарно переименовывается,
+        поэтому целиком в памяти он не держится, а недокачанные файлы не попадают в кэш.
+
+        Args:
+            url: URL PDF-файла
+            timeout: Таймаут запроса в секундах
+
+        Returns:
+            Путь к файлу в кэше
+
+        Raises:
+            Exception: При ошибке загрузки или превышении лимита Telegram
+        """
+        path = self.get_path(url)
+        if os.path.exists(path):
+            # Отмечаем использование для вытеснения по давности обращения
+            os.utime(path)
+            return path
+
+        import requests
+
+        tmp_path = f"{path}.{threading.get_ident()}.part"
+        try:
+            with self.session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+
+                declared_size = int(response.headers.get('Content-Length') or 0)
+                if declared_size > self.TELEGRAM_UPLOAD_LIMIT:
+                    raise Exception(f"Файл слишком большой для отправки: {declared_size} байт")
+
+                downloaded = 0
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        downloaded += len(chunk)
+                        if downloaded > self.TELEGRAM_UPLOAD_LIMIT:
+                            raise Exception(f"Файл превышает {self.TELEGRAM_UPLOAD_LIMIT} байт")
+                        f.write(chunk)
+
+            os.replace(tmp_path, path)
+            logger.info(f"PDF сохранен в кэш: {url} ({downloaded} байт)")
+
+        except requests.RequestException as e:
+            logger.error(f"Ошибка при скачивании PDF {url}: {e}")
+            raise Exception(f"Не удалось скачать PDF: {e}")
+
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._evict(keep=path)
+        return path
+
+    def get_file_id(self, url: str, bot_id: str = '') -> Optional[str]:
+        """
+        Возвращает file_id ранее загруженного в Telegram документа
+
+        Args:
+            url: URL PDF-файла
+            bot_id: Идентификатор бота (file_id действителен только для бота, который загрузил файл)
+        """
+        key = self._file_id_key(url, bot_id)
+        file_id = self.file_ids.get(key)
+        if file_id is None and self.store:
+            file_id = self.store.hget(self.STORE_KEY, key)
+            if file_id:
+                self.file_ids[key] = file_id
+        return file_id
+
+    def set_file_id(self, url: str, file_id: str, bot_id: str = ''):
+        """Запоминает file_id документа, чтобы больше не загружать файл в Telegram"""
+        key = self._file_id_key(url, bot_id)
+        with self._lock:
+            self.file_ids[key] = file_id
+            self._save_file_ids()
+        if self.store:
+            self.store.hset(self.STORE_KEY, key, file_id)
+
+    @staticmethod
+    def _file_id_key(url: str, bot_id: str) -> str:
+        return f"{bot_id}:{url}" if bot_id else url
+
+    def _evict(self, keep: str):
+        """Удаляет самые давно использованные файлы, пока кэш не уложится в лимит"""
+        with self._lock:
+            for path in evict_lru(self.cache_dir, '.pdf', self.max_size, keep=keep):
+                logger.info(f"PDF удален из кэша: {path}")
+
+    def _load_file_ids(self) -> Dict[str, str]:
+        """Загружает карту URL -> file_id с диска"""
+        try:
+            with open(os.path.join(self.cache_dir, self.INDEX_FILE), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_file_ids(self):
+        """Сохраняет карту URL -> file_id на диск"""
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = index_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.file_ids, f)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить карту file_id: {e}")
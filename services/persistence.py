@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+logger = logging.getLogger(__name__)
+
+class SQLitePersistence(BasePersistence):
+    """
+    Хранение context.user_data/chat_data/bot_data в SQLite между перезапусками бота
+
+    Изменения не пишутся на диск сразу: они копятся в памяти (для каждого пользователя
+    хранится только последнее состояние) и сбрасываются одной транзакцией после паузы
+    write_delay. База работает в режиме WAL с synchronous=NORMAL, поэтому коммит
+    не вызывает fsync на каждое нажатие кнопки.
+    """
+
+    def __init__(self, filepath: str = 'cache/bot_state.sqlite', update_interval: float = 10,
+                 write_delay: float = 2.0, store_data: Optional[PersistenceInput] = None):
+        """
+        Args:
+            filepath: Путь к файлу базы данных
+            update_interval: Как часто (в секундах) приложение передает изменения в persistence
+            write_delay: Задержка перед записью накопленных изменений на диск
+            store_data: Какие данные сохранять (по умолчанию user_data, chat_data и bot_data)
+        """
+        super().__init__(
+            store_data=store_data or PersistenceInput(callback_data=False),
+            update_interval=update_interval
+        )
+        self.filepath = filepath
+        self.write_delay = write_delay
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        # Отложенные изменения: (таблица, ключ) -> JSON или None для удаления
+        self._pending = {}
+        self._commit_task = None
+        # Будит отложенную запись раньше срока (при остановке бота)
+        self._wakeup = None
+        self._conversations = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.filepath, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            for table in ('user_data', 'chat_data', 'bot_data', 'conversations'):
+                self._conn.execute(f'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, data TEXT NOT NULL)')
+            self._conn.commit()
+        return self._conn
+
+    def _load_table(self, table: str) -> Dict[str, object]:
+        with self._conn_lock:
+            rows = self._connect().execute(f'SELECT key, data FROM {table}').fetchall()
+        return {key: json.loads(data) for key, data in rows}
+
+    def _queue(self, table: str, key, data):
+        """Ставит изменение в очередь и планирует отложенную запись"""
+        self._pending[(table, str(key))] = None if data is None else json.dumps(data, ensure_ascii=False, default=str)
+        if self._commit_task is None or self._commit_task.done():
+            loop = asyncio.get_running_loop()
+            self._wakeup = loop.create_future()
+            self._commit_task = loop.create_task(self._delayed_commit(self._wakeup))
+
+    async def _delayed_commit(self, wakeup: asyncio.Future):
+        await asyncio.wait({wakeup}, timeout=self.write_delay)
+        await self._commit()
+
+    async def _commit(self):
+        """Записывает все накопленные изменения одной транзакцией"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            await asyncio.to_thread(self._write, pending)
+        except Exception as e:
+            logger.error(f"Не удалось сохранить состояние пользователей: {e}")
+            # Возвращаем изменения в очередь, не затирая более свежие
+            for item, value in pending.items():
+                self._pending.setdefault(item, value)
+
+    def _write(self, pending: dict):
+        with self._conn_lock:
+            conn = self._connect()
+            with conn:
+                for (table, key), data in pending.items():
+                    if data is None:
+                        conn.execute(f'DELETE FROM {table} WHERE key = ?', (key,))
+                    else:
+                        conn.execute(f'INSERT OR REPLACE INTO {table} (key, data) VALUES (?, ?)', (key, data))
+        logger.debug(f"Сохранено изменений состояния: {len(pending)}")
+
+    async def get_user_data(self) -> Dict[int, dict]:
+        return {int(key): data for key, data in self._load_table('user_data').items()}
+
+    async def get_chat_data(self) -> Dict[int, dict]:
+        return {int(key): data for key, data in self._load_table('chat_data').items()}
+
+    async def get_bot_data(self) -> dict:
+        return self._load_table('bot_data').get('bot_data', {})
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def get_conversations(self, name: str) -> dict:
+        if self._conversations is None:
+            self._conversations = {
+                conv_name: {tuple(json.loads(key)): state for key, state in states.items()}
+                for conv_name, states in self._load_table('conversations').items()
+            }
+        return self._conversations.setdefault(name, {})
+
+    async def update_conversation(self, name: str, key, new_state):
+        conversations = await self.get_conversations(name)
+        if new_state is None:
+            conversations.pop(tuple(key), None)
+        else:
+            conversations[tuple(key)] = new_state
+        self._queue('conversations', name, {json.dumps(list(k)): v for k, v in conversations.items()})
+
+    async def update_user_data(self, user_id: int, data: dict):
+        self._queue('user_data', user_id, data)
+
+    async def update_chat_data(self, chat_id: int, data: dict):
+        self._queue('chat_data', chat_id, data)
+
+    async def update_bot_data(self, data: dict):
+        self._queue('bot_data', 'bot_data', data)
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_user_data(self, user_id: int):
+        self._queue('user_data', user_id, None)
+
+    async def drop_chat_data(self, chat_id: int):
+        self._queue('chat_data', chat_id, None)
+
+    async def refresh_user_data(self, user_id: int, user_data: dict):
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict):
+        pass
+
+    async def refresh_bot_data(self, bot_data: dict):
+        pass
+
+    async def flush(self):
+        """Записывает все накопленные изменения при остановке бота"""
+        if self._commit_task and not self._commit_task.done():
+            # Отмена не остановила бы запись, уже идущую в отдельном потоке, и та открыла бы соединение
+            # заново после закрытия: отложенная запись выполняется сразу, и ее дожидаемся
+            if self._wakeup and not self._wakeup.done():
+                self._wakeup.set_result(None)
+            await self._commit_task
+        await self._commit()
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+
+from parsers.circuit_breaker import CircuitBreaker
+
+from .datasets import DatasetRepository
+from .store import BaseStore
+
+logger = logging.getLogger(__name__)
+
+class LeaderRefresher:
+    """
+    Периодическое обновление наборов данных только на одном узле (лидере)
+
+    Лидер определяется блокировкой с ограниченным временем жизни в общем хранилище:
+    узел, который ее удерживает, продлевает ее и обновляет данные, остальные только читают.
+    Если лидер пропадает, блокировка истекает и ее подхватывает другой узел.
+
+    У каждого набора свой интервал обновления со случайным разбросом, чтобы обновления
+    не собирались в одну пачку запросов к сайту. Востребованные наборы обновляются первыми,
+    а наборы, к которым никто не обращался, - реже. Пока сайт недоступен (разомкнут
+    предохранитель), обновления откладываются.
+    """
+
+    LEADER_LOCK = 'lock:refresher:leader'
+    NEXT_REFRESH_KEY = 'refresher:next_refresh:{name}'
+    # Наборы, к которым не обращались с прошлого обновления, обновляются во столько раз реже
+    IDLE_FACTOR = 2
+    # Через сколько секунд повторить неудачное обновление
+    RETRY_DELAY = 5 * 60
+
+    def __init__(self, store: BaseStore, datasets: DatasetRepository, node_id: str,
+                 interval: int = 6 * 60 * 60, lock_ttl: int = 60, intervals: Optional[Dict[str, int]] = None,
+                 jitter: float = 0.1, breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            store: Общее хранилище
+            datasets: Репозиторий наборов данных
+            node_id: Идентификатор текущего узла
+            interval: Интервал обновления данных в секундах (для наборов без собственного интервала)
+            lock_ttl: Время жизни блокировки лидера в секундах
+            intervals: Интервалы обновления отдельных наборов {имя: секунды}
+            jitter: Относительный случайный разброс интервала (0.1 - плюс-минус 10%)
+            breaker: Предохранитель запросов к сайту
+        """
+        self.store = store
+        self.datasets = datasets
+        self.node_id = node_id
+        self.interval = interval
+        self.lock_ttl = lock_ttl
+        self.intervals = intervals or {}
+        self.jitter = jitter
+        self.breaker = breaker
+        self._task = None
+
+    @staticmethod
+    def parse_intervals(value: str) -> Dict[str, int]:
+        """
+        Разбирает интервалы обновления из строки вида "models=7200,partners=86400"
+
+        Args:
+            value: Строка с интервалами
+
+        Returns:
+            Словарь {имя набора: интервал в секундах}
+        """
+        intervals = {}
+        for part in value.split(','):
+            name, _, seconds = part.partition('=')
+            if name.strip() and seconds.strip():
+                try:
+                    intervals[name.strip()] = int(seconds)
+                except ValueError:
+                    logger.warning(f"Неверный интервал обновления: {part}")
+        return intervals
+
+    def interval_for(self, name: str) -> int:
+        """Интервал обновления набора в секундах"""
+        return self.intervals.get(name, self.interval)
+
+    def is_leader(self) -> bool:
+        """Захватывает или продлевает лидерство и возвращает True, если узел - лидер"""
+        try:
+            return self.store.acquire_lock(self.LEADER_LOCK, self.node_id, self.lock_ttl)
+        except Exception as e:
+            logger.error(f"Не удалось проверить лидерство: {e}")
+            return False
+
+    def _schedule(self, name: str, delay: float):
+        """Планирует следующее обновление набора через delay секунд с учетом разброса"""
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        # Время хранится в общем хранилище, чтобы новый лидер после смены узла не обновлял данные раньше срока
+        self.store.set(self.NEXT_REFRESH_KEY.format(name=name), time.time() + delay)
+
+    def due_datasets(self) -> List[str]:
+        """Возвращает наборы, которые пора обновить, начиная с самых востребованных"""
+        now = time.time()
+        due = []
+        for name in self.datasets.names:
+            next_refresh = self.store.get(self.NEXT_REFRESH_KEY.format(name=name))
+            if next_refresh is None:
+                if self.datasets.version(name) is None:
+                    # Набор еще ни разу не загружался
+                    due.append((float('inf'), name))
+                else:
+                    self._schedule(name, self.interval_for(name))
+                continue
+
+            demand = self.datasets.demand(name)
+            if not demand:
+                next_refresh += self.interval_for(name) * (self.IDLE_FACTOR - 1)
+            if now >= next_refresh:
+                due.append((demand, name))
+
+        return [name for _, name in sorted(due, key=lambda item: item[0], reverse=True)]
+
+    async def refresh(self, name: str):
+        """Обновляет набор данных с сайта и планирует следующее обновление"""
+        try:
+            # Загрузка идет под блокировкой набора, а лидерство продлевается, пока сайт отвечает медленно
+            data = await self.datasets.reload(name, heartbeat=self.is_leader)
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении набора данных {name}: {e}")
+            data = None
+
+        if data:
+            await self.store.run(self.datasets.reset_demand, name)
+            await self.store.run(self._schedule, name, self.interval_for(name))
+        else:
+            # Пустой результат не публикуется - прежняя версия остается, повторяем позже
+            await self.store.run(self._schedule, name, min(self.RETRY_DELAY, self.interval_for(name)))
+
+    async def refresh_due(self):
+        """Обновляет наборы данных, для которых подошло время"""
+        for name in await self.store.run(self.due_datasets):
+            # Лидерство могло перейти к другому узлу во время долгого обновления
+            if not await self.store.run(self.is_leader):
+                logger.info("Узел потерял лидерство, обновление прервано")
+                return
+            if self.breaker and self.breaker.is_open:
+                logger.info("Сайт недоступен, обновление данных отложено")
+                return
+            logger.info(f"Обновление набора данных {name}")
+            await self.refresh(name)
+
+    async def refresh_all(self):
+        """Обновляет все наборы данных с сайта"""
+        for name in self.datasets.names:
+            if not await self.store.run(self.is_leader):
+                logger.info("Узел потерял лидерство, обновление прервано")
+                return
+            await self.refresh(name)
+
+    async def run(self):
+        """Основной цикл: лидер обновляет наборы по их расписанию, остальные узлы ждут своей очереди"""
+        while True:
+            try:
+                if await self.store.run(self.is_leader):
+                    await self.refresh_due()
+            except Exception as e:
+                logger.error(f"Ошибка в цикле обновления данных: {e}")
+            # Продлеваем блокировку заметно чаще, чем она истекает
+            await asyncio.sleep(self.lock_ttl / 3)
+
+    def start(self):
+        """Запускает цикл обновления в фоне"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Останавливает цикл обновления и освобождает лидерство"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.store.run(self.store.release_lock, self.LEADER_LOCK, self.node_id)
+        except Exception as e:
+            logger.debug(f"Не удалось освободить лидерство: {e}")
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import os
+import socket
+from functools import cached_property
+from typing import Optional
+
+from parsers.circuit_breaker import get_origin_breaker
+from parsers.http_cache import get_default_cache
+
+from .broadcast import BroadcastEngine
+from .collage import CollageRenderer
+from .datasets import DatasetRepository
+from .http_api import DataApi
+from .media_validator import MediaValidator
+from .pdf_cache import PdfCache
+from .refresher import LeaderRefresher
+from .store import BaseStore, create_store
+
+logger = logging.getLogger(__name__)
+
+class SharedResources:
+    """
+    Общие для всех ботов процесса парсеры, хранилище, наборы данных и кэши
+
+    Несколько ботов (например, рабочий, тестовый и партнерский) работают с одними и теми же
+    данными armodels.ru, поэтому сайт парсится и кэшируется один раз на процесс,
+    а у каждого бота остается только собственное состояние пользователей.
+
+    Парсеры (а вместе с ними bs4 и requests) создаются при первом обращении,
+    чтобы не замедлять запуск бота.
+    """
+
+    # Собственные интервалы обновления наборов данных (секунды): модели меняются чаще партнеров,
+    # остальные наборы обновляются раз в REFRESH_INTERVAL
+    REFRESH_INTERVALS = {
+        'models': 2 * 60 * 60,
+        'partners': 24 * 60 * 60,
+    }
+    # Время жизни кэша деталей модели в общем хранилище (секунды)
+    DETAIL_CACHE_TTL = 6 * 60 * 60
+
+    def __init__(self, store: Optional[BaseStore] = None):
+        """
+        Args:
+            store: Общее хранилище (по умолчанию в памяти процесса или Redis из REDIS_URL)
+        """
+        # Общее хранилище: в памяти процесса или Redis (REDIS_URL) для нескольких экземпляров бота
+        self.store = store or create_store(os.getenv('REDIS_URL'))
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Проверка ссылок на изображения: битые фото отбрасываются при загрузке данных, до отправки в Telegram.
+        # В offline режиме запросов к сайту нет, поэтому ссылки не проверяются
+        http_cache = get_default_cache()
+        self.media = MediaValidator(
+            self.store,
+            breaker=get_origin_breaker(),
+            enabled=not (http_cache and http_cache.offline)
+        )
+
+        # Коллажи страниц списка моделей из фото карточек (нужен Pillow, MODEL_COLLAGES=0 - отключить)
+        collages = os.getenv('MODEL_COLLAGES', '1') != '0'
+        if collages and not CollageRenderer.available():
+            logger.info("Pillow не установлен, список моделей показывается без коллажей")
+        self.collages = CollageRenderer(
+            self.store,
+            breaker=get_origin_breaker(),
+            enabled=collages and CollageRenderer.available()
+        )
+
+        # Наборы данных в общем хранилище
+        self.datasets = DatasetRepository(self.store, self.node_id)
+        # Список моделей при первой загрузке читается потоково: первая страница показывается сразу.
+        # Загрузчики обращаются к парсерам только при вызове, чтобы парсеры создавались по требованию
+        self.datasets.register('models', lambda: self.models_parser.parse_list(),
+                               stream=lambda: self.models_parser.iter_list())
+        self.datasets.register('teachers', lambda: self.media.clean(self.teachers_parser.parse_list(), 'photo'))
+        self.datasets.register('partners', lambda: self.media.clean(self.partners_parser.parse_list(), 'logo'))
+        self.datasets.register('magazines', lambda: self.media.clean(self.magazines_parser.parse_list(), 'cover_image'))
+        # {'projects': [...], 'categories': {код: [индексы]}}
+        self.datasets.register('projects', self._load_projects, empty=dict)
+
+        # Подписки и рассылки о новых выпусках журнала и новых моделях: новые записи
+        # определяются сравнением каждой опубликованной версии набора с предыдущей
+        self.broadcasts = BroadcastEngine(self.store)
+        self.datasets.add_listener(self.broadcasts.on_publish)
+
+        # Данные с сайта обновляет только один узел - лидер, у каждого набора свой интервал
+        intervals = dict(self.REFRESH_INTERVALS)
+        intervals.update(LeaderRefresher.parse_intervals(os.getenv('REFRESH_INTERVALS', '')))
+        self.refresher = LeaderRefresher(
+            self.store,
+            self.datasets,
+            self.node_id,
+            interval=int(os.getenv('REFRESH_INTERVAL', str(6 * 60 * 60))),
+            intervals=intervals,
+            breaker=get_origin_breaker()
+        )
+
+        # Локальное зеркало PDF-выпусков журнала; скачивает через общую сессию парсеров
+        self.pdf_cache = PdfCache(
+            cache_dir=os.getenv('PDF_CACHE_DIR', 'cache/pdf'),
+            max_size_mb=int(os.getenv('PDF_CACHE_MAX_MB', '500')),
+            store=self.store
+        )
+        self.pdf_locks = {}
+
+        # HTTP API с данными для других сервисов, включается переменной API_PORT
+        self.api = DataApi.from_env(self)
+
+        self._bots_running = 0
+
+    @cached_property
+    def models_parser(self):
+        from parsers.models_parser import ModelsParser
+        return ModelsParser()
+
+    @cached_property
+    def teachers_parser(self):
+        from parsers.teachers_parser import TeachersParser
+        return TeachersParser()
+
+    @cached_property
+    def partners_parser(self):
+        from parsers.partners_parser import PartnersParser
+        return PartnersParser()
+
+    @cached_property
+    def magazines_parser(self):
+        from parsers.magazines_parser import MagazinesParser
+        return MagazinesParser()
+
+    @cached_property
+    def projects_parser(self):
+        from parsers.projects_parser import ProjectsParser
+        return ProjectsParser()
+
+    def _load_projects(self):
+        """Загружает проекты; пустой результат не публикуется"""
+        dataset = self.projects_parser.parse_partitioned()
+        self.media.clean(dataset['projects'], 'image_url')
+        return dataset if dataset['projects'] else {}
+
+    async def get_model_detail(self, url: str):
+        """Возвращает детали модели из общего кэша, загружая их с сайта при промахе"""
+        cache_key = f"detail:model:{url}"
+        model_info = await self.store.run(self.store.get, cache_key)
+        if model_info is None:
+            model_info = await asyncio.to_thread(self.load_model_detail, url)
+            if model_info:
+                await self.store.run(self.store.set, cache_key, model_info, ttl=self.DETAIL_CACHE_TTL)
+        return model_info
+
+    def load_model_detail(self, url: str):
+        """Загружает детали модели с сайта без повторяющихся и битых фото (выполняется в отдельном потоке)"""
+        model_info = self.models_parser.parse_detail(url)
+        if model_info:
+            model_info['photos'] = self.media.filter_valid(model_info['photos'])
+        return model_info
+
+    def start(self):
+        """Отмечает запуск очередного бота; фоновое обновление запускается вместе с первым"""
+        self._bots_running += 1
+        if self._bots_running == 1:
+            self.refresher.start()
+            if self.api:
+                asyncio.get_running_loop().create_task(self._start_api())
+
+    async def _start_api(self):
+        try:
+            await self.api.start()
+        except OSError as e:
+            logger.error(f"Не удалось запустить HTTP API на {self.api.host}:{self.api.port}: {e}")
+
+    async def stop(self):
+        """Отмечает остановку бота; фоновое обновление останавливается вместе с последним"""
+        self._bots_running = max(0, self._bots_running - 1)
+        if self._bots_running == 0:
+            await self.refresher.stop()
+            if self.api:
+                await self.api.stop()
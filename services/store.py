@@ -0,0 +1,361 @@
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class BaseStore(ABC):
+    """Базовый класс общего хранилища данных бота (наборы данных, кэши деталей, карты file_id)"""
+
+    # True, если операции ходят по сети: из асинхронного кода их нужно выполнять через run
+    blocking = False
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Выполняет функцию, обращающуюся к хранилищу, из асинхронного кода
+
+        Для сетевого хранилища функция выполняется в отдельном потоке, чтобы медленный ответ
+        не останавливал цикл событий (и вместе с ним все чаты); хранилище в памяти процесса
+        отвечает сразу, и функция вызывается напрямую.
+
+        Args:
+            func: Функция (метод хранилища или код, который его вызывает)
+
+        Returns:
+            Результат функции
+        """
+        if self.blocking:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Возвращает значение по ключу или None"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """
+        Сохраняет значение по ключу
+
+        Args:
+            key: Ключ
+            value: Значение (должно сериализоваться в JSON)
+            ttl: Время жизни в секундах (None - бессрочно)
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Удаляет ключ"""
+        pass
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Атомарно увеличивает счетчик на amount и возвращает новое значение"""
+        pass
+
+    @abstractmethod
+    def expire(self, key: str, ttl: int):
+        """Задает время жизни существующего ключа в секундах"""
+        pass
+
+    @abstractmethod
+    def hget(self, name: str, field: str) -> Optional[Any]:
+        """Возвращает поле хэша или None"""
+        pass
+
+    @abstractmethod
+    def hset(self, name: str, field: str, value: Any):
+        """Сохраняет поле хэша"""
+        pass
+
+    @abstractmethod
+    def hdel(self, name: str, field: str):
+        """Удаляет поле хэша"""
+        pass
+
+    @abstractmethod
+    def hgetall(self, name: str) -> Dict[str, Any]:
+        """Возвращает все поля хэша"""
+        pass
+
+    @abstractmethod
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        """
+        Захватывает или продлевает блокировку с ограниченным временем жизни
+
+        Args:
+            name: Имя блокировки
+            owner: Идентификатор владельца (узла)
+            ttl: Время жизни блокировки в секундах
+
+        Returns:
+            True, если блокировка принадлежит owner
+        """
+        pass
+
+    @abstractmethod
+    def release_lock(self, name: str, owner: str):
+        """Освобождает блокировку, если она принадлежит owner"""
+        pass
+
+class MemoryStore(BaseStore):
+    """Хранилище в памяти процесса (по умолчанию, для одного экземпляра бота)"""
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return False
+        return key in self._data
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._data[key] if self._alive(key) else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        with self._lock:
+            self._data[key] = value
+            if ttl:
+                self._expires[key] = time.monotonic() + ttl
+            else:
+                self._expires.pop(key, None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            value = (self._data[key] if self._alive(key) else 0) + amount
+            self._data[key] = value
+            return value
+
+    def expire(self, key: str, ttl: int):
+        with self._lock:
+            if self._alive(key):
+                self._expires[key] = time.monotonic() + ttl
+
+    def hget(self, name: str, field: str) -> Optional[Any]:
+        with self._lock:
+            return self._data[name].get(field) if self._alive(name) else None
+
+    def hset(self, name: str, field: str, value: Any):
+        with self._lock:
+            if not self._alive(name):
+                self._data[name] = {}
+            self._data[name][field] = value
+
+    def hdel(self, name: str, field: str):
+        with self._lock:
+            if self._alive(name):
+                self._data[name].pop(field, None)
+
+    def hgetall(self, name: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._data[name]) if self._alive(name) else {}
+
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        with self._lock:
+            if self._alive(name) and self._data[name] != owner:
+                return False
+            self._data[name] = owner
+            self._expires[name] = time.monotonic() + ttl
+            return True
+
+    def release_lock(self, name: str, owner: str):
+        with self._lock:
+            if self._alive(name) and self._data[name] == owner:
+                self._data.pop(name, None)
+                self._expires.pop(name, None)
+
+class RedisStore(BaseStore):
+    """
+    Хранилище на сервере с протоколом Redis (RESP) для нескольких экземпляров бота
+
+    Значения сериализуются в JSON. Клиент реализован поверх сокета и не требует
+    дополнительных зависимостей, поэтому работает с Redis, KeyDB, Valkey и локальными заглушками.
+    Вызовы блокирующие: асинхронный код выполняет их через run.
+    """
+
+    blocking = True
+
+    # Захват или продление блокировки: KEYS[1] - блокировка, ARGV[1] - владелец, ARGV[2] - время жизни (мс)
+    ACQUIRE_SCRIPT = (
+        "local current = redis.call('GET', KEYS[1]) "
+        "if not current then redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2]) return 1 end "
+        "if current == ARGV[1] then redis.call('PEXPIRE', KEYS[1], ARGV[2]) return 1 end "
+        "return 0"
+    )
+    # Освобождение блокировки, только если она все еще принадлежит владельцу
+    RELEASE_SCRIPT = (
+        "if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end "
+        "return 0"
+    )
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, prefix: str = 'armodels:', timeout: float = 5.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> 'RedisStore':
+        """Создает хранилище по URL вида redis://[:password@]host[:port][/db]"""
+        parsed = urlparse(url)
+        db = parsed.path.lstrip('/')
+        return cls(
+            host=parsed.hostname or 'localhost',
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=parsed.password,
+            **kwargs
+        )
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._reader = self._sock.makefile('rb')
+        if self.password:
+            self._execute('AUTH', self.password)
+        if self.db:
+            self._execute('SELECT', self.db)
+
+    def _close(self):
+        for resource in (self._reader, self._sock):
+            try:
+                if resource:
+                    resource.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def _execute(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        self._sock.sendall(b''.join(parts))
+        return self._read_reply()
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Соединение с хранилищем закрыто")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RuntimeError(payload.decode('utf-8'))
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Неизвестный ответ хранилища: {line!r}")
+
+    def command(self, *args):
+        """Выполняет команду, переподключаясь один раз при обрыве соединения"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._execute(*args)
+                except (OSError, ConnectionError) as e:
+                    self._close()
+                    if attempt:
+                        logger.error(f"Ошибка связи с хранилищем {self.host}:{self.port}: {e}")
+                        raise
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+    @staticmethod
+    def _loads(data: Optional[bytes]) -> Optional[Any]:
+        return json.loads(data) if data is not None else None
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._loads(self.command('GET', self.prefix + key))
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        if ttl:
+            self.command('SET', self.prefix + key, self._dumps(value), 'EX', ttl)
+        else:
+            self.command('SET', self.prefix + key, self._dumps(value))
+
+    def delete(self, key: str):
+        self.command('DEL', self.prefix + key)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        if amount == 1:
+            return self.command('INCR', self.prefix + key)
+        return self.command('INCRBY', self.prefix + key, amount)
+
+    def expire(self, key: str, ttl: int):
+        self.command('EXPIRE', self.prefix + key, ttl)
+
+    def hget(self, name: str, field: str) -> Optional[Any]:
+        return self._loads(self.command('HGET', self.prefix + name, field))
+
+    def hset(self, name: str, field: str, value: Any):
+        self.command('HSET', self.prefix + name, field, self._dumps(value))
+
+    def hdel(self, name: str, field: str):
+        self.command('HDEL', self.prefix + name, field)
+
+    def hgetall(self, name: str) -> Dict[str, Any]:
+        reply = self.command('HGETALL', self.prefix + name) or []
+        return {reply[i].decode('utf-8'): self._loads(reply[i + 1]) for i in range(0, len(reply), 2)}
+
+    def acquire_lock(self, name: str, owner: str, ttl: int) -> bool:
+        # Проверка владельца и продление выполняются на сервере одной командой: иначе между GET
+        # и EXPIRE блокировка может истечь, перейти к другому узлу и быть продлена чужим владельцем
+        return self.command('EVAL', self.ACQUIRE_SCRIPT, 1, self.prefix + name, owner, int(ttl * 1000)) == 1
+
+    def release_lock(self, name: str, owner: str):
+        self.command('EVAL', self.RELEASE_SCRIPT, 1, self.prefix + name, owner)
+
+def create_store(url: Optional[str] = None) -> BaseStore:
+    """
+    Создает хранилище по URL
+
+    Args:
+        url: redis://... для общего хранилища или None/пустая строка для хранилища в памяти
+
+    Returns:
+        Экземпляр хранилища
+    """
+    if url and url.startswith('redis://'):
+        logger.info(f"Используется общее хранилище {urlparse(url).hostname}")
+        return RedisStore.from_url(url)
+    return MemoryStore()
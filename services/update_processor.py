@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Параллельная обработка обновлений с сохранением порядка внутри чата
+
+    Обновления разных чатов обрабатываются одновременно (до max_concurrent_updates), поэтому
+    долгая загрузка карточки модели у одного пользователя не задерживает кнопки других.
+    Обновления одного чата выполняются строго по очереди в порядке поступления: цепочка
+    "удалить сообщение -> отправить новое -> запомнить message_id" не перемешивается
+    с обработкой следующего нажатия того же пользователя.
+    """
+
+    DEFAULT_MAX_CONCURRENT_UPDATES = 64
+    # Сколько обновлений одного чата может обрабатываться и ждать своей очереди; лишние нажатия отбрасываются
+    MAX_PENDING_PER_CHAT = 16
+    DROPPED_CALLBACK_TEXT = 'Подождите, предыдущие действия еще выполняются'
+
+    def __init__(self, max_concurrent_updates: int = DEFAULT_MAX_CONCURRENT_UPDATES,
+                 max_pending_per_chat: int = MAX_PENDING_PER_CHAT):
+        """
+        Args:
+            max_concurrent_updates: Сколько обновлений обрабатывается одновременно
+                                    (обновления, ожидающие своей очереди в чате, не учитываются)
+            max_pending_per_chat: Сколько обновлений одного чата может обрабатываться и ждать своей очереди
+        """
+        super().__init__(max_concurrent_updates)
+        self.max_pending_per_chat = max_pending_per_chat
+        # Блокировки существуют, пока в чате есть обрабатываемые или ожидающие обновления
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_pending: Dict[int, int] = {}
+        self.dropped_updates = 0
+
+    @staticmethod
+    def chat_key(update: object) -> Optional[int]:
+        """Возвращает ID чата (или пользователя), обновления которого обрабатываются по очереди"""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_chat:
+            return update.effective_chat.id
+        if update.effective_user:
+            return update.effective_user.id
+        return None
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """
+        Ставит обновление в очередь его чата и только затем занимает общий слот обработки
+
+        Базовая реализация занимает слот до вызова do_process_update, и обновления, ждущие
+        занятый чат, держали бы слоты: один пользователь, часто нажимающий кнопку во время
+        долгой загрузки, останавливал бы все остальные чаты. Поэтому очередь чата проходится
+        до семафора, а обновления сверх max_pending_per_chat отбрасываются.
+        """
+        key = self.chat_key(update)
+        if key is None:
+            await super().process_update(update, coroutine)
+            return
+
+        if self._chat_pending.get(key, 0) >= self.max_pending_per_chat:
+            await self._drop(key, update, coroutine)
+            return
+
+        lock = self._chat_locks.get(key)
+        if lock is None:
+            lock = self._chat_locks[key] = asyncio.Lock()
+        self._chat_pending[key] = self._chat_pending.get(key, 0) + 1
+        try:
+            # asyncio.Lock пропускает ожидающих в порядке очереди
+            async with lock:
+                await super().process_update(update, coroutine)
+        finally:
+            self._chat_pending[key] -= 1
+            if not self._chat_pending[key]:
+                del self._chat_pending[key]
+                del self._chat_locks[key]
+
+    async def _drop(self, key: int, update: Update, coroutine: Awaitable[Any]):
+        """Отбрасывает обновление; на нажатие кнопки отвечает, чтобы у пользователя не осталось часиков"""
+        self.dropped_updates += 1
+        logger.warning(f"В чате {key} слишком много необработанных обновлений, обновление пропущено")
+        if asyncio.iscoroutine(coroutine):
+            coroutine.close()
+        if update.callback_query:
+            try:
+                await update.callback_query.answer(self.DROPPED_CALLBACK_TEXT)
+            except Exception as e:
+                logger.warning(f"Не удалось ответить на пропущенное нажатие кнопки в чате {key}: {e}")
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -0,0 +1,125 @@
+import socketserver
+import threading
+import time
+
+from services.store import RedisStore
+
+class FakeRedisServer:
+    """
+    Сервер с протоколом Redis (RESP) в памяти для тестов RedisStore
+
+    Поддерживает команды, которыми пользуется RedisStore; скрипты EVAL выполняются
+    по их тексту (известны только скрипты блокировок RedisStore) под общей блокировкой,
+    то есть атомарно, как на настоящем сервере.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.commands = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    args = []
+                    for _ in range(int(line[1:-2])):
+                        length = int(self.rfile.readline()[1:-2])
+                        args.append(self.rfile.read(length + 2)[:-2])
+                    self.wfile.write(server.execute(args))
+
+        class Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def expire_now(self, key: bytes):
+        """Имитирует истечение времени жизни ключа"""
+        with self.lock:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+
+    def _get(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def _set(self, key, value, ttl_ms=None):
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if ttl_ms is not None:
+            self.expires[key] = time.monotonic() + ttl_ms / 1000
+
+    @staticmethod
+    def _bulk(value):
+        return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def execute(self, args):
+        command = args[0].upper().decode()
+        with self.lock:
+            self.commands.append(command)
+            if command == 'GET':
+                return self._bulk(self._get(args[1]))
+            if command == 'SET':
+                options = [arg.upper() for arg in args[3:]]
+                if b'NX' in options and self._get(args[1]) is not None:
+                    return b'$-1\r\n'
+                ttl_ms = None
+                if b'EX' in options:
+                    ttl_ms = int(args[3 + options.index(b'EX') + 1]) * 1000
+                self._set(args[1], args[2], ttl_ms)
+                return b'+OK\r\n'
+            if command == 'DEL':
+                existed = self._get(args[1]) is not None
+                self.data.pop(args[1], None)
+                return b':%d\r\n' % existed
+            if command in ('INCR', 'INCRBY'):
+                value = int(self._get(args[1]) or b'0') + (int(args[2]) if command == 'INCRBY' else 1)
+                self.data[args[1]] = str(value).encode()
+                return b':%d\r\n' % value
+            if command == 'EXPIRE':
+                if self._get(args[1]) is None:
+                    return b':0\r\n'
+                self.expires[args[1]] = time.monotonic() + int(args[2])
+                return b':1\r\n'
+            if command == 'HGET':
+                return self._bulk((self._get(args[1]) or {}).get(args[2]))
+            if command == 'HSET':
+                self.data.setdefault(args[1], {})[args[2]] = args[3]
+                return b':1\r\n'
+            if command == 'HDEL':
+                return b':%d\r\n' % ((self._get(args[1]) or {}).pop(args[2], None) is not None)
+            if command == 'HGETALL':
+                fields = self._get(args[1]) or {}
+                return b'*%d\r\n' % (2 * len(fields)) + b''.join(
+                    self._bulk(field) + self._bulk(value) for field, value in fields.items())
+            if command == 'EVAL':
+                return b':%d\r\n' % self._eval(args[1].decode(), args[3:3 + int(args[2])], args[3 + int(args[2]):])
+            return b'-ERR unknown command\r\n'
+
+    def _eval(self, script, keys, argv):
+        current = self._get(keys[0])
+        if script == RedisStore.ACQUIRE_SCRIPT:
+            if current is None or current == argv[0]:
+                self._set(keys[0], argv[0], int(argv[1]))
+                return 1
+            return 0
+        if script == RedisStore.RELEASE_SCRIPT:
+            if current == argv[0]:
+                self.data.pop(keys[0], None)
+                return 1
+            return 0
+        raise ValueError(f"Неизвестный скрипт: {script}")
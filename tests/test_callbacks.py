@@ -0,0 +1,55 @@
+import unittest
+
+from armodels_bot import ModelsTelegramBot
+from services.callbacks import CallbackCodec, TokenTable
+from services.store import MemoryStore
+
+def create_codec(store):
+    codec = CallbackCodec(store, ModelsTelegramBot.CALLBACK_TOKENS)
+    codec.register('models_page', 8, (('page', 'H'), ('filter_type', 'token')))
+    codec.register('category', 16, (('category', 'token'),))
+    return codec
+
+class CallbackCodecTest(unittest.TestCase):
+    def test_round_trip(self):
+        codec = create_codec(MemoryStore())
+        data = codec.encode('models_page', page=3, filter_type='female')
+        self.assertEqual(codec.decode(data), ('models_page', {'page': 3, 'filter_type': 'female'}))
+
+    def test_button_survives_restart(self):
+        # До перезапуска первым использовано другое значение, после - таблица пустая
+        before = create_codec(MemoryStore())
+        before.encode('category', category='interview')
+        data = before.encode('models_page', page=0, filter_type='all')
+
+        after = create_codec(MemoryStore())
+        after.encode('models_page', page=1, filter_type='male')
+        self.assertEqual(after.decode(data), ('models_page', {'page': 0, 'filter_type': 'all'}))
+
+    def test_dynamic_tokens_do_not_collide_with_static(self):
+        store = MemoryStore()
+        codec = create_codec(store)
+        data = codec.encode('category', category='new-category')
+        token = codec.tokens.token('new-category')
+        self.assertGreaterEqual(token, TokenTable.DYNAMIC_BASE)
+        # Другой экземпляр бота с тем же хранилищем разбирает кнопку
+        self.assertEqual(create_codec(store).decode(data), ('category', {'category': 'new-category'}))
+
+    def test_unknown_token(self):
+        codec = create_codec(MemoryStore())
+        data = create_codec(MemoryStore()).encode('category', category='new-category')
+        self.assertIsNone(codec.decode(data))
+
+    def test_legacy_photo_buttons(self):
+        codec = create_codec(MemoryStore())
+        codec.register('noop', 7)
+        codec.register('photo', 10, (('idx', 'H'),))
+        # Старые кнопки несли номер показанного фото
+        self.assertEqual(codec.decode('photo_next_2'), ('photo', {'idx': 3}))
+        self.assertEqual(codec.decode('photo_prev_2'), ('photo', {'idx': 1}))
+        self.assertEqual(codec.decode('photo_prev_0'), ('photo', {'idx': 0}))
+        self.assertEqual(codec.decode('photo_counter'), ('noop', {}))
+        self.assertEqual(codec.decode('page_counter'), ('noop', {}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+
+from parsers.base_parser import BaseParser
+from parsers.circuit_breaker import CircuitBreaker
+from parsers.http_cache import HttpCache
+
+class FailingFetcher:
+    """Загрузчик, который падает не сетевой ошибкой (например, ошибкой декодирования)"""
+
+    def get(self, url, **kwargs):
+        raise ValueError('неожиданная ошибка')
+
+class StubParser(BaseParser):
+    def parse_list(self) -> list:
+        return []
+
+    def parse_detail(self, url: str) -> dict:
+        return {}
+
+class ProbeTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        # Цепь разомкнута, и время до пробного запроса уже прошло
+        self.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        self.breaker.record_failure()
+        self.parser = StubParser(http_cache=HttpCache(self.cache_dir.name), breaker=self.breaker)
+        self.parser.fetcher = FailingFetcher()
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_unknown_error_during_probe(self):
+        with self.assertRaises(ValueError):
+            self.parser.fetch_text('/models')
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        # Пробный запрос завершен - следующий снова пропускается
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_unknown_error_during_streaming_probe(self):
+        with self.assertRaises(ValueError):
+            list(self.parser.iter_page_chunks('/models'))
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(self.breaker.allow_request())
+
+if __name__ == '__main__':
+    unittest.main()
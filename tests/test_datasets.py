@@ -0,0 +1,58 @@
+import time
+import unittest
+
+from services.datasets import DatasetRepository
+from services.store import MemoryStore
+
+def create_repository(store, node_id):
+    repository = DatasetRepository(store, node_id)
+    repository.VERSION_CHECK_INTERVAL = 0
+    repository.register('models', lambda: [])
+    return repository
+
+class DatasetRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+        self.writer = create_repository(self.store, 'a')
+        self.reader = create_repository(self.store, 'b')
+
+    def test_publish_and_switch_version(self):
+        self.assertEqual(self.reader.get('models'), [])
+        self.writer.publish('models', [{'name': 'Анна'}])
+        self.assertEqual(self.reader.get('models'), [{'name': 'Анна'}])
+        self.assertEqual(self.reader.loaded_version('models'), 1)
+
+        self.writer.publish('models', [{'name': 'Анна'}, {'name': 'Вера'}])
+        self.assertEqual(len(self.reader.get('models')), 2)
+        self.assertEqual(self.reader.loaded_version('models'), 2)
+
+    def test_previous_snapshot_is_retained(self):
+        self.writer.publish('models', [{'name': 'Анна'}])
+        self.writer.publish('models', [{'name': 'Вера'}])
+
+        # Кнопки старого снимка открывают те же записи, пока не истек срок хранения
+        self.assertEqual(self.reader.get_version('models', 1), [{'name': 'Анна'}])
+        expires_in = self.store._expires['dataset:models:1'] - time.monotonic()
+        self.assertAlmostEqual(expires_in, DatasetRepository.SNAPSHOT_RETENTION, delta=5)
+        self.assertNotIn('dataset:models:2', self.store._expires)
+
+        self.store._expires['dataset:models:1'] = time.monotonic()
+        self.assertIsNone(create_repository(self.store, 'c').get_version('models', 1))
+
+    def test_local_snapshots_are_bounded(self):
+        for version in range(DatasetRepository.LOCAL_SNAPSHOTS + 2):
+            self.writer.publish('models', [{'version': version}])
+        self.assertEqual(len(self.writer._snapshots['models']), DatasetRepository.LOCAL_SNAPSHOTS)
+
+    def test_demand_is_counted_across_nodes(self):
+        self.writer.publish('models', [{'name': 'Анна'}])
+        for _ in range(3):
+            self.reader.get('models')
+        self.writer.get('models')
+        self.assertEqual(self.writer.demand('models'), 4)
+
+        self.writer.reset_demand('models')
+        self.assertEqual(self.reader.demand('models'), 0)
+
+if __name__ == '__main__':
+    unittest.main()
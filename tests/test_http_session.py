@@ -0,0 +1,46 @@
+import http.server
+import threading
+import time
+import unittest
+
+from parsers.http_session import create_session, dns_cache
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+class DnsCacheTest(unittest.TestCase):
+    HOST = 'origin.test'
+
+    def setUp(self):
+        # Сервер слушает только 127.0.0.1: подключение к 127.0.0.2 на тот же порт отклоняется
+        self.server = http.server.HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://{self.HOST}:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        dns_cache.forget(self.HOST)
+
+    def test_falls_back_to_next_address(self):
+        dns_cache._entries[self.HOST] = (['127.0.0.2', '127.0.0.1'], time.monotonic() + 60)
+        response = create_session().get(self.url, timeout=5)
+        self.assertEqual(response.text, 'ok')
+        # Следующие соединения сразу идут по рабочему адресу
+        self.assertEqual(dns_cache.resolve(self.HOST), ['127.0.0.1', '127.0.0.2'])
+
+    def test_forgets_host_when_no_address_works(self):
+        dns_cache._entries[self.HOST] = (['127.0.0.2'], time.monotonic() + 60)
+        with self.assertRaises(Exception):
+            create_session().get(self.url, timeout=5)
+        self.assertNotIn(self.HOST, dns_cache._entries)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from services.persistence import SQLitePersistence
+
+class SQLitePersistenceTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, 'state.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_flush_writes_debounced_changes(self):
+        persistence = SQLitePersistence(self.filepath, write_delay=60)
+        await persistence.update_user_data(1, {'page': 1})
+        await persistence.update_user_data(1, {'page': 2})
+        await persistence.update_chat_data(5, {'message_id': 7})
+        await persistence.flush()
+        self.assertIsNone(persistence._conn)
+
+        restored = SQLitePersistence(self.filepath)
+        self.assertEqual(await restored.get_user_data(), {1: {'page': 2}})
+        self.assertEqual(await restored.get_chat_data(), {5: {'message_id': 7}})
+        await restored.flush()
+
+    async def test_flush_waits_for_write_in_progress(self):
+        persistence = SQLitePersistence(self.filepath, write_delay=0)
+        started = threading.Event()
+        write = persistence._write
+
+        def slow_write(pending):
+            started.set()
+            time.sleep(0.1)
+            write(pending)
+
+        persistence._write = slow_write
+        await persistence.update_user_data(1, {'page': 1})
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        await persistence.flush()
+        # Запись из потока завершилась до закрытия и не открыла соединение заново
+        self.assertIsNone(persistence._conn)
+        restored = SQLitePersistence(self.filepath)
+        self.assertEqual(await restored.get_user_data(), {1: {'page': 1}})
+        await restored.flush()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+
+from parsers.circuit_breaker import CircuitBreaker
+from parsers.fixtures import create_fixture_session
+from parsers.magazines_parser import MagazinesParser
+from parsers.models_parser import ModelsParser, _ModelsListScanner
+from parsers.partners_parser import PartnersParser
+from parsers.projects_parser import ProjectsParser
+from parsers.sections import PageSection
+from parsers.teachers_parser import TeachersParser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def read_fixture(filename: str) -> str:
+    with open(os.path.join(ROOT_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+def create_parser(cls):
+    # Страницы читаются из сохраненных файлов, без HTTP-кэша и кэша разбора
+    parser = cls(session=create_fixture_session(ROOT_DIR), breaker=CircuitBreaker())
+    parser.http_cache = None
+    parser.parse_memo = None
+    return parser
+
+class PageSectionTest(unittest.TestCase):
+    # Парсер, сохраненная страница и функция извлечения списка
+    LISTS = (
+        (TeachersParser, 'main_page.html', '_extract_list'),
+        (PartnersParser, 'main_page.html', '_extract_list'),
+        (MagazinesParser, 'main_page.html', '_extract_list'),
+        (ProjectsParser, 'projects_page.html', '_extract_partitioned'),
+        (ModelsParser, 'page.html', '_extract_list'),
+    )
+
+    def test_section_parse_matches_full_tree(self):
+        for cls, filename, extract in self.LISTS:
+            with self.subTest(parser=cls.__name__):
+                parser = create_parser(cls)
+                html = read_fixture(filename)
+                section = cls.LIST_SECTION
+                if section.marker:
+                    self.assertIsNotNone(section.cut(html), 'участок не выделен по маркеру')
+
+                full = getattr(parser, extract)(BeautifulSoup(html, 'html.parser'))
+                scoped = getattr(parser, extract)(parser._make_soup(html, section, filename))
+                self.assertTrue(full)
+                self.assertEqual(scoped, full)
+
+    def test_cut_skips_comments_and_scripts(self):
+        section = PageSection('div', marker='id="x"', id='x')
+        html = '<div><div id="x"><!-- </div> --><script>"</div>"</script><div>a</div></div></div>'
+        self.assertEqual(section.cut(html), html[5:-6])
+
+    def test_cut_gives_up_on_ambiguous_html(self):
+        section = PageSection('div', marker='id="x"', id='x')
+        # Элемент не закрыт
+        self.assertIsNone(section.cut('<div id="x"><div>'))
+        # Маркер вне открывающего тега
+        self.assertIsNone(section.cut('<p>id="x"</p>'))
+        self.assertIsNone(section.cut('<div>нет маркера</div>'))
+
+class ModelsStreamingTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = create_parser(ModelsParser)
+        self.html = read_fixture('page.html')
+        self.expected = self.parser._extract_list(BeautifulSoup(self.html, 'html.parser'))
+
+    def test_streamed_list_matches_full_tree(self):
+        self.assertTrue(self.expected)
+        self.assertEqual(list(self.parser.iter_list()), self.expected)
+
+    def test_scanner_handles_any_chunk_boundaries(self):
+        for size in (1, 7, 100, 4096):
+            with self.subTest(chunk_size=size):
+                scanner = _ModelsListScanner()
+                models = []
+                for start in range(0, len(self.html), size):
+                    scanner.feed(self.html[start:start + size])
+                    while scanner.entries:
+                        model = self.parser._build_model(*scanner.entries.popleft())
+                        if model:
+                            models.append(model)
+                scanner.close()
+                self.assertEqual(models, self.expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import time
+import unittest
+
+from services.store import MemoryStore, RedisStore
+
+from fake_redis import FakeRedisServer
+
+class LockTests:
+    """Проверки блокировок, общие для всех хранилищ"""
+
+    def expire(self, name):
+        raise NotImplementedError
+
+    def test_acquire_and_renew(self):
+        self.assertTrue(self.store.acquire_lock('lock:test', 'a', 60))
+        self.assertTrue(self.store.acquire_lock('lock:test', 'a', 60))
+        self.assertFalse(self.store.acquire_lock('lock:test', 'b', 60))
+
+    def test_release_only_by_owner(self):
+        self.store.acquire_lock('lock:test', 'a', 60)
+        self.store.release_lock('lock:test', 'b')
+        self.assertFalse(self.store.acquire_lock('lock:test', 'b', 60))
+        self.store.release_lock('lock:test', 'a')
+        self.assertTrue(self.store.acquire_lock('lock:test', 'b', 60))
+
+    def test_takeover_after_expiry(self):
+        self.store.acquire_lock('lock:test', 'a', 60)
+        self.expire('lock:test')
+        self.assertTrue(self.store.acquire_lock('lock:test', 'b', 60))
+        # Прежний владелец не продлевает и не освобождает чужую блокировку
+        self.assertFalse(self.store.acquire_lock('lock:test', 'a', 60))
+        self.store.release_lock('lock:test', 'a')
+        self.assertFalse(self.store.acquire_lock('lock:test', 'c', 60))
+        self.assertTrue(self.store.acquire_lock('lock:test', 'b', 60))
+
+class MemoryStoreLockTest(LockTests, unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+
+    def expire(self, name):
+        self.store._expires[name] = time.monotonic()
+
+class RedisStoreLockTest(LockTests, unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRedisServer()
+        self.store = RedisStore(port=self.server.port, prefix='test:')
+
+    def tearDown(self):
+        self.store._close()
+        self.server.close()
+
+    def expire(self, name):
+        self.server.expire_now(('test:' + name).encode())
+
+    def test_lock_operations_are_single_commands(self):
+        self.store.acquire_lock('lock:test', 'a', 60)
+        self.store.acquire_lock('lock:test', 'a', 60)
+        self.store.release_lock('lock:test', 'a')
+        self.assertEqual(self.server.commands, ['EVAL', 'EVAL', 'EVAL'])
+
+    def test_values_round_trip(self):
+        self.store.set('detail', {'name': 'Анна', 'photos': [1, 2]}, ttl=60)
+        self.assertEqual(self.store.get('detail'), {'name': 'Анна', 'photos': [1, 2]})
+        self.assertEqual(self.store.incr('seq'), 1)
+        self.assertEqual(self.store.incr('seq', 5), 6)
+        self.store.hset('file_ids', 'url', 'id-1')
+        self.assertEqual(self.store.hget('file_ids', 'url'), 'id-1')
+        self.assertEqual(self.store.hgetall('file_ids'), {'url': 'id-1'})
+        self.store.hdel('file_ids', 'url')
+        self.assertIsNone(self.store.hget('file_ids', 'url'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+from datetime import datetime
+
+from telegram import CallbackQuery, Chat, Message, Update, User
+
+from services.update_processor import ChatOrderedUpdateProcessor
+
+class FakeBot:
+    def __init__(self):
+        self.answers = []
+
+    async def answer_callback_query(self, callback_query_id, text=None, **kwargs):
+        self.answers.append((callback_query_id, text))
+        return True
+
+def message_update(update_id: int, chat_id: int) -> Update:
+    message = Message(message_id=update_id, date=datetime.now(), chat=Chat(id=chat_id, type=Chat.PRIVATE))
+    return Update(update_id=update_id, message=message)
+
+def callback_update(update_id: int, chat_id: int, bot: FakeBot) -> Update:
+    message = Message(message_id=update_id, date=datetime.now(), chat=Chat(id=chat_id, type=Chat.PRIVATE))
+    query = CallbackQuery(id=str(update_id), from_user=User(id=chat_id, first_name='u', is_bot=False),
+                          chat_instance='1', message=message)
+    query.set_bot(bot)
+    return Update(update_id=update_id, callback_query=query)
+
+class ChatOrderedUpdateProcessorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_updates_of_one_chat_run_in_order(self):
+        processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4)
+        order = []
+
+        async def handle(name, delay):
+            order.append(f"{name}:start")
+            await asyncio.sleep(delay)
+            order.append(f"{name}:end")
+
+        # Первое обновление дольше второго, но второе начинается только после него
+        await asyncio.gather(
+            processor.process_update(message_update(1, 10), handle('a', 0.05)),
+            processor.process_update(message_update(2, 10), handle('b', 0)),
+        )
+        self.assertEqual(order, ['a:start', 'a:end', 'b:start', 'b:end'])
+
+    async def test_other_chats_do_not_wait(self):
+        processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4)
+        release = asyncio.Event()
+        done = []
+
+        async def blocked():
+            await release.wait()
+
+        async def quick():
+            done.append('quick')
+
+        slow = asyncio.ensure_future(processor.process_update(message_update(1, 10), blocked()))
+        await processor.process_update(message_update(2, 20), quick())
+        self.assertEqual(done, ['quick'])
+        release.set()
+        await slow
+
+    async def test_drop_limit(self):
+        processor = ChatOrderedUpdateProcessor(max_concurrent_updates=4, max_pending_per_chat=2)
+        bot = FakeBot()
+        release = asyncio.Event()
+        handled = []
+
+        async def handle(update_id):
+            await release.wait()
+            handled.append(update_id)
+
+        tasks = [asyncio.ensure_future(processor.process_update(message_update(i, 10), handle(i))) for i in (1, 2)]
+        await asyncio.sleep(0)
+        # Очередь чата заполнена: третье нажатие отбрасывается, и на него сразу приходит ответ
+        await processor.process_update(callback_update(3, 10, bot), handle(3))
+        self.assertEqual(processor.dropped_updates, 1)
+        self.assertEqual(bot.answers, [('3', ChatOrderedUpdateProcessor.DROPPED_CALLBACK_TEXT)])
+
+        release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(handled, [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()